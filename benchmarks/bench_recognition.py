@@ -0,0 +1,283 @@
+# benchmarks/bench_recognition.py
+"""Recognition benchmark: speed, CPU, memory, latency and accuracy per model and setting.
+
+    python -m benchmarks.bench_recognition [--corpus DIR] [--models PATH ...] [--baseline FILE]
+
+Every WAV file of the corpus is replayed (scribe/replay.py) through each installed model
+of the corpus language, for every combination of --blocksize and --partial-interval. Each
+configuration runs in a fresh worker process so CPU time and peak memory belong to it
+alone; the model load is timed separately and not counted in CPU time. Per configuration
+the report has:
+
+    rtf                  processing seconds / audio seconds
+    cpu_per_audio_s      CPU seconds (all threads) per second of audio
+    peak_rss_mb          peak resident memory of the worker, model included
+    load_seconds         vosk.Model construction
+    first_partial_s      median audio position at which the first partial was typed
+    final_latency_ms     captured block -> first keystroke of a final (p50, p95)
+    typing_s_per_audio_s time the keyboard / clipboard inserter would spend typing
+    wer                  word error rate against <recording>.ref.txt, where present
+
+The report is written as JSON (--output). With --baseline, every metric is compared with
+the same configuration in the baseline report and the exit code is 1 if one got worse by
+more than --tolerance; --save-baseline stores the current report as the new baseline.
+Baselines are only comparable on the same machine.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(BENCHMARKS_DIR, 'corpus')
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+DEFAULT_BLOCKSIZES = (2000, 4000, 8000)  # 4000 is the SettingsManager default
+DEFAULT_PARTIAL_INTERVALS = (0.25, 0.5, 1.0)
+INSERTER_TYPES = ('keyboard', 'clipboard')
+
+# Lower is better for every metric; a change counts as a regression only if it is larger
+# than both the relative tolerance and this absolute amount (noise on small values)
+COMPARED_METRICS = {
+    'rtf': 0.01,
+    'cpu_per_audio_s': 0.01,
+    'peak_rss_mb': 10.0,
+    'first_partial_s': 0.05,
+    'final_latency_p95_ms': 5.0,
+    'wer': 0.005,
+}
+
+
+# --- word error rate ---
+
+def normalize_words(text):
+    """Lower-cased words without punctuation, so only recognition differences count."""
+    return re.sub(r"[^\w\s']", ' ', text.lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance (substitutions + insertions + deletions) between two texts."""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1], len(ref)
+
+
+def reference_path(path):
+    """<recording>.ref.txt: the correct transcript of a corpus recording."""
+    return os.path.splitext(path)[0] + '.ref.txt'
+
+
+# --- worker: one configuration in its own process ---
+
+def run_configuration(config):
+    """Replays config['files'] with one model and one setting; returns the result dict."""
+    from scribe import process_stats
+    from scribe.decoder import StaticSettings
+    from scribe.replay import replay_file
+    from scribe.startup import load_vosk_model
+
+    settings = StaticSettings.load(config['settings']) if config.get('settings') else StaticSettings()
+    started = time.perf_counter()
+    model = load_vosk_model(config['model_path'])
+    load_seconds = time.perf_counter() - started
+
+    cpu_started = process_stats.cpu_seconds()
+    files, audio, processing, errors, ref_words = [], 0.0, 0.0, 0, 0
+    first_partials, latency_p50, latency_p95 = [], [], []
+    typing = dict.fromkeys(INSERTER_TYPES, 0.0)
+    for path in config['files']:
+        report = replay_file(path, model, config['sample_rate'], config['model_path'], settings,
+                             blocksize=config['blocksize'], partial_interval=config['partial_interval'])
+        audio += report['audio_seconds']
+        processing += report['processing_seconds']
+        for kind in INSERTER_TYPES:
+            typing[kind] += report['typing_seconds'][kind]
+        if report['first_partial_at'] is not None:
+            first_partials.append(report['first_partial_at'])
+        final_latency = report['latency'].get('e2e_final')
+        if final_latency:
+            latency_p50.append(final_latency['p50_ms'])
+            latency_p95.append(final_latency['p95_ms'])
+        file_result = {'path': path, 'rtf': report['rtf'], 'text': report['text'].strip()}
+        try:
+            with open(reference_path(path), 'r', encoding='utf-8') as f:
+                file_errors, file_words = word_errors(f.read(), report['text'])
+            errors += file_errors
+            ref_words += file_words
+            file_result['wer'] = round(file_errors / file_words, 4) if file_words else None
+        except OSError:
+            pass
+        files.append(file_result)
+    cpu = process_stats.cpu_seconds() - cpu_started
+
+    return {
+        'audio_seconds': round(audio, 3),
+        'load_seconds': round(load_seconds, 3),
+        'rtf': round(processing / audio, 4) if audio else None,
+        'cpu_per_audio_s': round(cpu / audio, 4) if audio else None,
+        'peak_rss_mb': process_stats.snapshot()['peak_rss_mb'],
+        'first_partial_s': round(statistics.median(first_partials), 3) if first_partials else None,
+        'final_latency_p50_ms': round(statistics.median(latency_p50), 2) if latency_p50 else None,
+        'final_latency_p95_ms': max(latency_p95) if latency_p95 else None,
+        'typing_s_per_audio_s': {kind: round(seconds / audio, 4) if audio else None for kind, seconds in typing.items()},
+        'wer': round(errors / ref_words, 4) if ref_words else None,
+        'files': files,
+    }
+
+
+def run_worker(config):
+    """Runs one configuration in a new interpreter and returns its result dict."""
+    command = [sys.executable, '-m', 'benchmarks.bench_recognition', '--worker']
+    process = subprocess.run(command, input=json.dumps(config), capture_output=True, text=True,
+                             cwd=os.path.dirname(BENCHMARKS_DIR))
+    if process.returncode != 0:
+        raise RuntimeError(f"Worker failed for {config['name']}:\n{process.stderr.strip()}")
+    return json.loads(process.stdout)
+
+
+# --- configurations, report and baseline ---
+
+def corpus_files(corpus, language=None):
+    """WAV files of the corpus: <corpus>/<language>/ if it exists, otherwise all of <corpus>."""
+    folder = os.path.join(corpus, language) if language and os.path.isdir(os.path.join(corpus, language)) else corpus
+    return sorted(glob.glob(os.path.join(folder, '**', '*.wav'), recursive=True), key=os.path.normcase)
+
+
+def model_targets(args):
+    """Returns [(name, model_path, sample_rate, files)] for --models or the installed models."""
+    from scribe.model_registry import get_model_registry
+
+    registry = get_model_registry()
+    if args.models:
+        files = corpus_files(args.corpus)
+        return [(os.path.basename(os.path.normpath(path)), path, registry.get_sample_rate(path), files) for path in args.models]
+    targets = []
+    for entry in sorted(registry.models(), key=lambda m: (m['language'], m['name'])):
+        files = corpus_files(args.corpus, entry['language'])
+        if files:
+            path = registry.get_model_path(entry['language'], entry['name'])
+            targets.append((f"{entry['language']}/{entry['name']}", path, entry['sample_rate'], files))
+    return targets
+
+
+def configuration_key(result):
+    return f"{result['model']} blocksize={result['blocksize']} partial_interval={result['partial_interval']}"
+
+
+def compare(report, baseline, tolerance):
+    """Returns {configuration: {metric: {baseline, current, change, regression}}} for shared configurations."""
+    previous = {configuration_key(r): r for r in baseline.get('results', [])}
+    comparison = {}
+    for result in report['results']:
+        key = configuration_key(result)
+        old = previous.get(key)
+        if old is None:
+            continue
+        metrics = {}
+        for metric, min_change in COMPARED_METRICS.items():
+            if old.get(metric) is None or result.get(metric) is None:
+                continue
+            change = result[metric] - old[metric]
+            metrics[metric] = {
+                'baseline': old[metric],
+                'current': result[metric],
+                'change': round(change, 4),
+                'regression': change > min_change and change > abs(old[metric]) * tolerance,
+            }
+        comparison[key] = metrics
+    return comparison
+
+
+def print_summary(report):
+    columns = ('rtf', 'cpu_per_audio_s', 'peak_rss_mb', 'first_partial_s', 'final_latency_p95_ms', 'wer')
+    print(f"{'configuration':<60} " + ' '.join(f"{c:>20}" for c in columns), file=sys.stderr)
+    for result in report['results']:
+        regressions = report.get('comparison', {}).get(configuration_key(result), {})
+        cells = []
+        for column in columns:
+            value = result.get(column)
+            mark = ' !' if regressions.get(column, {}).get('regression') else ''
+            cells.append(f"{'-' if value is None else value}{mark}".rjust(20))
+        print(f"{configuration_key(result):<60} " + ' '.join(cells), file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_recognition', description="Scribe recognition benchmark.")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="folder of WAV files, optionally in <language>/ subfolders (default: %(default)s)")
+    parser.add_argument('--models', nargs='+', help="model folders to benchmark (default: every installed model of a corpus language)")
+    parser.add_argument('--blocksize', type=int, nargs='+', default=list(DEFAULT_BLOCKSIZES), help="audio frames per block (default: %(default)s)")
+    parser.add_argument('--partial-interval', type=float, nargs='+', default=list(DEFAULT_PARTIAL_INTERVALS),
+                        help="seconds between typed partials (default: %(default)s)")
+    parser.add_argument('--settings', help="settings.json with replacements and inserter delays (default: built-in defaults)")
+    parser.add_argument('--output', default='benchmark-report.json', help="report file (default: %(default)s)")
+    parser.add_argument('--baseline', help=f"compare with this report; exit 1 on a regression (e.g. {os.path.relpath(DEFAULT_BASELINE)})")
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, help="also write the report as a baseline (default: %(const)s)")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="relative worsening that counts as a regression (default: %(default)s)")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    if args.worker:
+        json.dump(run_configuration(json.load(sys.stdin)), sys.stdout)
+        return 0
+
+    targets = model_targets(args)
+    if not targets:
+        raise SystemExit(f"Nothing to benchmark: no WAV files in {args.corpus} for the installed models")
+    results = []
+    for name, model_path, sample_rate, files in targets:
+        for blocksize in args.blocksize:
+            for partial_interval in args.partial_interval:
+                config = {
+                    'name': f"{name} blocksize={blocksize} partial_interval={partial_interval}",
+                    'model_path': model_path,
+                    'sample_rate': sample_rate,
+                    'files': files,
+                    'blocksize': blocksize,
+                    'partial_interval': partial_interval,
+                    'settings': args.settings,
+                }
+                print(f"Running {config['name']} ({len(files)} files)", file=sys.stderr)
+                result = run_worker(config)
+                results.append(dict(model=name, blocksize=blocksize, partial_interval=partial_interval, **result))
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+        },
+        'results': results,
+    }
+    failed = False
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['comparison'] = compare(report, json.load(f), args.tolerance)
+        failed = any(m['regression'] for metrics in report['comparison'].values() for m in metrics.values())
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print_summary(report)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,283 @@
+# benchmarks/soak.py
+"""Soak test: hours of replayed audio through the live pipeline, watching for leaks.
+
+    python -m benchmarks.soak [--model PATH] [--corpus DIR] [--hours 2] [--reload-every 300]
+
+The WAV files of the corpus are joined into one recording that is replayed again and
+again (scribe/replay.py's WavStream, as fast as the recognizer takes it unless --speed is
+given) through a VoiceTyperController: one start/stop session per pass, typed into an
+in-memory document. Every --reload-every seconds the controller is replaced the way a
+model reload in the application replaces it (dispose(), then a new controller on a
+freshly loaded model unless --keep-model). The model of the settings is used unless
+--model is given; --transcribe-to-file also writes the transcription files (to the
+records folder) so their handles are covered.
+
+Every --sample-every seconds, between sessions, the report gets a sample of:
+
+    rss_mb, handles, threads  process_stats.snapshot() (handles: file descriptors on
+                              POSIX, kernel handles on Windows)
+    thread_names              live threads by name (digits replaced with N)
+    queues                    audio blocks queued and not yet marked done, pending
+                              two-pass utterances
+    objects                   gc-tracked objects by type (containers and instances;
+                              not str/int), the largest types only in the report
+
+After the first --warmup samples, a series counts as growing if its mean over the last
+third of the samples exceeds the first third by more than its limit (GROWTH_LIMITS, or
+OBJECT_GROWTH objects and 10 % for object types) and its trend is still upward. Growing
+series are reported under 'leaks' and make the exit code 1.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(BENCHMARKS_DIR, 'corpus')
+GROWTH_LIMITS = {'rss_mb': 32.0, 'handles': 2, 'threads': 1, 'thread': 1, 'queue': 1}
+OBJECT_GROWTH = 1000  # And 10 % of the first third
+REPORTED_OBJECT_TYPES = 30  # Largest types kept per sample in the report
+
+
+class SoakSettings:
+    """In-memory settings for the soak controllers: get()/set()/all() of SettingsManager."""
+
+    def __init__(self, data):
+        self._settings = dict(data)
+
+    def get(self, key, default=None):
+        return self._settings.get(key, default)
+
+    def set(self, key, value):
+        self._settings[key] = value
+
+    def all(self):
+        return self._settings
+
+
+# --- samples and growth detection ---
+
+def object_counts():
+    counts = Counter()
+    for obj in gc.get_objects():
+        cls = type(obj)
+        counts[f"{cls.__module__}.{cls.__qualname__}"] += 1
+    return counts
+
+
+def thread_names():
+    return dict(Counter(re.sub(r'\d+', 'N', thread.name) for thread in threading.enumerate()))
+
+
+def take_sample(started, controller, progress):
+    from scribe import process_stats
+
+    gc.collect()
+    recognizer = controller.recognizer
+    sample = dict(progress, elapsed_s=round(time.monotonic() - started, 1))
+    stats = process_stats.snapshot()
+    sample.update(rss_mb=stats['rss_mb'], handles=stats['handles'], threads=stats['threads'])
+    sample['thread_names'] = thread_names()
+    sample['queues'] = {
+        'audio_unfinished': recognizer.audio_queue.unfinished_tasks,
+        'pending_finals': len(recognizer._pending_finals),
+    }
+    return sample, object_counts()
+
+
+def trend(times, values):
+    """Least-squares slope of values over times (per second); 0 if undefined."""
+    if len(values) < 2 or len(set(times)) < 2:
+        return 0.0
+    mean_t, mean_v = statistics.fmean(times), statistics.fmean(values)
+    den = sum((t - mean_t) ** 2 for t in times)
+    return sum((t - mean_t) * (values[i] - mean_v) for i, t in enumerate(times)) / den
+
+
+def growth(times, values, limit):
+    """Returns a growth record if values grow by more than limit and still trend upward, else None."""
+    third = max(1, len(values) // 3)
+    head, tail = statistics.fmean(values[:third]), statistics.fmean(values[-third:])
+    slope = trend(times, values)
+    if tail - head <= limit or slope <= 0:
+        return None
+    return {'first': values[0], 'last': values[-1], 'growth': round(tail - head, 2), 'per_hour': round(slope * 3600, 2)}
+
+
+def find_leaks(samples, counts, warmup):
+    """Returns {series: growth record} for the series that keep growing after the warm-up."""
+    samples, counts = samples[warmup:], counts[warmup:]
+    if len(samples) < 3:
+        return {}
+    times = [s['elapsed_s'] for s in samples]
+    series = {name: ([s[name] for s in samples], GROWTH_LIMITS[name]) for name in ('rss_mb', 'handles', 'threads')}
+    for name in set().union(*(s['thread_names'] for s in samples)):
+        series[f"thread:{name}"] = ([s['thread_names'].get(name, 0) for s in samples], GROWTH_LIMITS['thread'])
+    for name in samples[0]['queues']:
+        series[f"queue:{name}"] = ([s['queues'][name] for s in samples], GROWTH_LIMITS['queue'])
+    for name in set().union(*counts):
+        values = [c.get(name, 0) for c in counts]
+        head = statistics.fmean(values[:max(1, len(values) // 3)])
+        series[f"objects:{name}"] = (values, max(OBJECT_GROWTH, head * 0.1))
+    leaks = {}
+    for name, (values, limit) in sorted(series.items()):
+        if any(v is None for v in values):
+            continue
+        record = growth(times, values, limit)
+        if record is not None:
+            leaks[name] = record
+    return leaks
+
+
+# --- the soak run ---
+
+def load_audio(files, sample_rate):
+    from scribe.audio_utils import AudioUtils
+
+    pcm = b''.join(b''.join(AudioUtils.iter_wav_blocks(path, sample_rate, 1.0)) for path in files)
+    if not pcm:
+        raise SystemExit("The corpus recordings are empty")
+    return pcm
+
+
+def new_controller(model_path, model, sample_rate, settings, stream_factory):
+    from scribe.voice_typer_controller import VoiceTyperController
+
+    controller = VoiceTyperController(model_path, model=model, inserter_type='recording', sample_rate=sample_rate,
+                                      blocksize=settings.get('blocksize', 4000), settings_manager=settings)
+    controller.recognizer.stream_factory = stream_factory
+    return controller
+
+
+def run(args):
+    from PyQt5.QtCore import QCoreApplication
+
+    from scribe.cli import resolve_model
+    from scribe.decoder import StaticSettings
+    from scribe.inserters.recording_text_inserter import RecordingTextInserter
+    from scribe.replay import WavStream
+    from scribe.startup import load_vosk_model
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    data = dict(StaticSettings.load(args.settings).all()) if args.settings else {}
+    # No microphone lookup, no auto-stop in the middle of a pass
+    data.update(selected_microphone='soak', auto_stop_timeout=0, transcribe_to_file=args.transcribe_to_file,
+                archive_transcripts=False)
+    settings = SoakSettings(data)
+    model_path, sample_rate = resolve_model(args, settings)
+    files = args.files
+    if not files:
+        from benchmarks.bench_recognition import corpus_files
+        files = corpus_files(args.corpus)
+    if not files:
+        raise SystemExit(f"Nothing to replay: no WAV files in {args.corpus}")
+    pcm = load_audio(files, sample_rate)
+    streams = []
+
+    def stream_factory(**kwargs):
+        stream = WavStream(pcm, speed=args.speed, lockstep=controller.recognizer.wait_until_processed, **kwargs)
+        streams.append(stream)
+        return stream
+
+    model = load_vosk_model(model_path)
+    controller = new_controller(model_path, model, sample_rate, settings, stream_factory)
+    started = time.monotonic()
+    deadline = started + args.hours * 3600
+    last_reload = last_sample = started
+    progress = {'sessions': 0, 'reloads': 0, 'audio_seconds': 0.0}
+    samples, counts = [], []
+    print(f"Soaking {model_path} with {len(pcm) / 2 / sample_rate:.1f} s of audio per session for {args.hours} h", file=sys.stderr)
+    while True:
+        recognizer = controller.recognizer
+        recognizer.inserter = RecordingTextInserter(settings)  # A fresh document per session
+        streams.clear()
+        controller.start()
+        if not streams:
+            raise SystemExit("The replay stream was not opened")
+        streams[0].finished.wait()
+        thread = recognizer.recognition_thread
+        controller.stop()
+        if thread is not None:
+            thread.join()
+        app.processEvents()
+        progress['sessions'] += 1
+        progress['audio_seconds'] = round(progress['audio_seconds'] + streams[0].audio_seconds, 1)
+
+        now = time.monotonic()
+        done = now >= deadline
+        if done or not samples or now - last_sample >= args.sample_every:
+            sample, sample_counts = take_sample(started, controller, progress)
+            samples.append(sample)
+            counts.append(sample_counts)
+            last_sample = now
+            print(f"[{sample['elapsed_s']:>8.0f} s] sessions={progress['sessions']} reloads={progress['reloads']} "
+                  f"rss={sample['rss_mb']} MB handles={sample['handles']} threads={sample['threads']}", file=sys.stderr)
+        if done:
+            break
+        if args.reload_every and now - last_reload >= args.reload_every:
+            controller.dispose()
+            del controller, recognizer
+            gc.collect()
+            if not args.keep_model:
+                del model
+                gc.collect()
+                model = load_vosk_model(model_path)
+            controller = new_controller(model_path, model, sample_rate, settings, stream_factory)
+            progress['reloads'] += 1
+            last_reload = time.monotonic()
+    controller.dispose()
+
+    for index, sample in enumerate(samples):
+        sample['objects'] = dict(counts[index].most_common(REPORTED_OBJECT_TYPES))
+    leaks = find_leaks(samples, counts, args.warmup)
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'model_path': model_path,
+        'files': files,
+        'options': {key: value for key, value in vars(args).items() if key != 'files'},
+        'samples': samples,
+        'leaks': leaks,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.soak', description="Scribe long-session soak test.")
+    parser.add_argument('files', nargs='*', help="WAV files to replay (default: every WAV file of --corpus)")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="folder of WAV files (default: %(default)s)")
+    parser.add_argument('--model', help="model folder (default: the model selected in the settings)")
+    parser.add_argument('--settings', help="settings.json with the language, model and replacements (default: built-in defaults)")
+    parser.add_argument('--hours', type=float, default=1.0, help="wall-clock duration (default: %(default)s)")
+    parser.add_argument('--speed', type=float, default=0.0, help="replay speed, 1.0 = real time, 0 = as fast as possible (default: %(default)s)")
+    parser.add_argument('--reload-every', type=float, default=300.0, help="seconds between controller reloads, 0 = never (default: %(default)s)")
+    parser.add_argument('--keep-model', action='store_true', help="reuse the loaded model on reloads instead of loading it again")
+    parser.add_argument('--transcribe-to-file', action='store_true', help="also write transcription files to the records folder")
+    parser.add_argument('--sample-every', type=float, default=60.0, help="seconds between samples (default: %(default)s)")
+    parser.add_argument('--warmup', type=int, default=2, help="first samples left out of the growth check (default: %(default)s)")
+    parser.add_argument('--output', default='soak-report.json', help="report file (default: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    report = run(args)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    for name, record in report['leaks'].items():
+        print(f"GROWING {name}: {record['first']} -> {record['last']} ({record['per_hour']:+} per hour)", file=sys.stderr)
+    if not report['leaks']:
+        print(f"No growth found over {len(report['samples'])} samples", file=sys.stderr)
+    return 1 if report['leaks'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
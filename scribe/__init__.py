@@ -1 +1,5 @@
 # Package scribe
+from scribe.import_audit import install_from_env
+
+# SCRIBE_IMPORT_AUDIT=1 times every import from here on (modules imported earlier are not listed)
+install_from_env()
@@ -5,8 +5,9 @@ import sys
 
 from PyQt5.QtWidgets import QDialog, QMessageBox
 
-from scribe.model_manager import LanguageSelectDialog, ModelDownloadDialog, ModelManager
+from scribe.model_registry import get_model_registry
 from scribe.settings_manager import SettingsManager
+from scribe.startup import start_preload, timeline
 from scribe.utils import get_specific_model_path
 
 # Key for storing the current model
@@ -23,6 +24,13 @@ def initialize_app(settings_path, models_dir, lang=None):
     SettingsManager.create_default_settings_if_needed(settings_path, supported_languages)
     settings_manager = SettingsManager()
     settings = settings_manager.all()
+    # Start loading the configured model right away; it runs while translations, dialogs and the tray are built
+    with timeline.phase('preload_start'):
+        start_preload(
+            get_specific_model_path(settings.get('language', ''), settings.get(CURRENT_MODEL_KEY)),
+            settings.get('selected_microphone'),
+            warmup=settings.get('model_warmup', True)
+        )
     sys_lang = None
     try:
         import locale
@@ -41,10 +49,13 @@ def initialize_app(settings_path, models_dir, lang=None):
     except Exception:
         texts = {}
 
-    model_manager = ModelManager(models_dir)
+    # The model manager (dialogs, catalog and download code) is imported only when a model must be chosen
+    model_registry = get_model_registry(models_dir)
     chosen_rec_lang = settings.get('language', '')
 
-    if not model_manager.has_models() or not chosen_rec_lang:
+    if not model_registry.has_models() or not chosen_rec_lang:
+        from scribe.model_manager import LanguageSelectDialog, ModelDownloadDialog, ModelManager
+        model_manager = ModelManager(models_dir)
         sys_lang = model_manager.get_system_language()
         try:
             models_json = model_manager.fetch_models_json()
@@ -65,15 +76,9 @@ def initialize_app(settings_path, models_dir, lang=None):
         if dlg.exec_() != QDialog.Accepted:
             sys.exit(0)
         # After downloading and extracting the model — find the name of the new model and save it in settings
-        lang_dir = os.path.join(models_dir, chosen_rec_lang)
-        model_name = None
-        if os.path.exists(lang_dir):
-            subdirs = [d for d in os.listdir(lang_dir) if os.path.isdir(os.path.join(lang_dir, d))]
-            subdirs = [d for d in subdirs if os.path.exists(os.path.join(lang_dir, d, 'am', 'final.mdl'))]
-            if subdirs:
-                subdirs.sort(key=lambda d: os.path.getmtime(os.path.join(lang_dir, d)), reverse=True)
-                model_name = subdirs[0]
-                settings_manager.set(CURRENT_MODEL_KEY, model_name)
+        model_name = model_manager.get_newest_model(chosen_rec_lang)
+        if model_name:
+            settings_manager.set(CURRENT_MODEL_KEY, model_name)
 
     recognition_language = settings_manager.get('language', chosen_rec_lang)
     model_name = settings_manager.get(CURRENT_MODEL_KEY, None)
@@ -83,6 +88,8 @@ def initialize_app(settings_path, models_dir, lang=None):
 
     # If no valid model path is found, repeat the selection/download process.
     if not model_path:
+        from scribe.model_manager import LanguageSelectDialog, ModelDownloadDialog, ModelManager
+        model_manager = ModelManager(models_dir)
         sys_lang = model_manager.get_system_language()
         try:
             models_json = model_manager.fetch_models_json()
@@ -103,19 +110,13 @@ def initialize_app(settings_path, models_dir, lang=None):
         if dlg.exec_() != QDialog.Accepted:
             sys.exit(0)
 
-        lang_dir = os.path.join(models_dir, chosen_rec_lang)
-        model_name = None
-        if os.path.exists(lang_dir):
-            subdirs = [d for d in os.listdir(lang_dir) if os.path.isdir(os.path.join(lang_dir, d))]
-            subdirs = [d for d in subdirs if os.path.exists(os.path.join(lang_dir, d, 'am', 'final.mdl'))]
-            if subdirs:
-                subdirs.sort(key=lambda d: os.path.getmtime(os.path.join(lang_dir, d)), reverse=True)
-                model_name = subdirs[0]
-                settings_manager.set(CURRENT_MODEL_KEY, model_name)
+        model_name = model_manager.get_newest_model(chosen_rec_lang)
+        if model_name:
+            settings_manager.set(CURRENT_MODEL_KEY, model_name)
 
-                # Get the path again with the newly downloaded model
-                recognition_language = chosen_rec_lang
-                model_path = get_specific_model_path(recognition_language, model_name)
+            # Get the path again with the newly downloaded model
+            recognition_language = chosen_rec_lang
+            model_path = get_specific_model_path(recognition_language, model_name)
 
     if not model_path:
         QMessageBox.critical(
@@ -3,22 +3,28 @@ import gc
 import logging
 import os
 import sys
+import threading
 
 from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtWidgets import QApplication, QMessageBox
 
-from scribe.controller_loader import ControllerLoader
-from scribe.hotkey_manager import HotkeyManager
-from scribe.model_manager import ModelManager
+from scribe.controller_loader import ModelLoadScheduler
+from scribe.startup import timeline
 from scribe.tray_app import TrayApp
 from scribe.ui.busy_dialog import BusyDialog
-from scribe.ui.main_voice_window import MainVoiceWindow
-from scribe.ui.settings_window import SettingsWindow
-from scribe.utils import get_specific_model_path
+from scribe.utils import get_final_model_path, get_specific_model_path
 
 logger = logging.getLogger(__name__)
 
 
+def _prefetch_model_catalog(models_dir):
+    # Runs on a worker thread, so requests and the catalog code are imported off the UI thread
+    from scribe.model_catalog import CATALOG_MIRROR_FILE, get_catalog_cache
+    catalog_cache = get_catalog_cache()
+    catalog_cache.add_mirror_path(os.path.join(models_dir, CATALOG_MIRROR_FILE))
+    catalog_cache.prefetch_async()
+
+
 class Application(QObject):
     """The main application class that orchestrates all components.
 
@@ -26,6 +32,7 @@ class Application(QObject):
     """
 
     controller_reloaded = pyqtSignal(object)
+    input_format_changed = pyqtSignal(bool, int)  # need_resample, input_sample_rate
 
     def __init__(self, settings_manager, settings, ui_lang, texts, recognition_language, model_path):
         super().__init__()
@@ -41,14 +48,16 @@ class Application(QObject):
         self.model_path = model_path
 
         self.settings_manager.settings_changed.connect(self.on_settings_changed)
+        self.input_format_changed.connect(self._on_input_format_changed)
 
         self.settings_window = None
         self._main_voice_window = None
         self.controller = None
         self.hotkey_manager = None
-        self._controller_loader_version = 0
-        self._controller_loader = None
         self._busy_dialog = None
+        self._batch_dialog = None
+        self.recognition_server = None
+        self.metrics_server = None
         self.initial_load_complete = False
         self.main_window_was_visible_before_reload = False
         self.settings_window_was_visible_before_reload = False
@@ -56,16 +65,37 @@ class Application(QObject):
 
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         models_dir = os.path.join(base_dir, "models")
-        self.model_manager = ModelManager(models_dir)
+        self.models_dir = models_dir
+        self._model_manager = None
+        # Keep the model catalog warm so the download dialogs open without waiting for the network
+        threading.Thread(target=_prefetch_model_catalog, args=(models_dir,), name='scribe-catalog-prefetch', daemon=True).start()
         self.inserter_type = self.settings.get('inserter_type', self.settings_manager.DEFAULTS['inserter_type'])
 
         # The TrayApp is now a component owned by the Application
-        self.tray_app = TrayApp(self)
-        self.tray_app.update_tray_ui()
+        with timeline.phase('tray'):
+            self.tray_app = TrayApp(self)
+            self.tray_app.update_tray_ui()
+
+        # Controllers are built on the scheduler's worker thread; only the latest request is delivered
+        self.model_load_scheduler = ModelLoadScheduler(self.settings_manager, self)
+        self.model_load_scheduler.stage_changed.connect(self._on_model_load_stage)
+        self.model_load_scheduler.finished.connect(self._on_model_load_finished)
+
+        self._update_metrics_server()
+        self._update_flight_recorder()
+        self._update_watchdog()
 
         # Load the controller asynchronously
         self.load_controller_async(self.model_path, self.inserter_type)
 
+    @property
+    def model_manager(self):
+        # Created on first use: it pulls in the download and installation code
+        if self._model_manager is None:
+            from scribe.model_manager import ModelManager
+            self._model_manager = ModelManager(self.models_dir)
+        return self._model_manager
+
     def _on_about_to_quit(self):
         logger.debug("Application is about to quit. Performing cleanup.")
         if hasattr(self, '_main_voice_window') and self._main_voice_window is not None:
@@ -76,8 +106,25 @@ class Application(QObject):
                 self.settings_manager.set('main_window', main_window_settings)
                 logger.info(f"Saved main window position on exit: {pos.x()}, {pos.y()}")
 
+        self.model_load_scheduler.shutdown()
+
+        if self.recognition_server:
+            self.recognition_server.stop()
+
+        if self.metrics_server:
+            self.metrics_server.stop()
+
+        from scribe.watchdog import watchdog
+        watchdog.stop()
+
+        if self._batch_dialog is not None:
+            self._batch_dialog.shutdown()
+
+        if self.settings_window is not None:
+            self.settings_window.shutdown()
+
         if self.controller:
-            self.controller.stop()
+            self.controller.shutdown()
 
         if self.tray_app:
             self.tray_app.hide()
@@ -95,41 +142,37 @@ class Application(QObject):
 
         if self.settings_window is not None:
             self.settings_window.close()
+            self.settings_window.shutdown()
             self.settings_window = None
             self.show_settings()
 
     def load_controller_async(self, model_path, inserter_type):
-        if self._controller_loader and self._controller_loader.isRunning():
-            logger.debug('Waiting for previous ControllerLoader to finish...')
-            self._controller_loader.quit()
-            self._controller_loader.wait(2000)
-            logger.debug('Previous ControllerLoader finished')
-
-        self._controller_loader_version += 1
-        current_version = self._controller_loader_version
+        self.model_load_scheduler.request(model_path, inserter_type)
 
-        self._busy_dialog = BusyDialog(texts=self.texts)
-        self._busy_dialog.show()
+        # A reload requested while another one is running reuses the open busy dialog
+        if self._busy_dialog is None:
+            self._busy_dialog = BusyDialog(texts=self.texts)
+            self._busy_dialog.show()
         self.tray_app.set_menu_enabled(False)
         self.is_loading_model = True
         self.tray_app.update_tray_ui()
 
-        loader = ControllerLoader(model_path, inserter_type, self.settings_manager, self)
-
-        def on_loaded(controller, error):
-            if current_version != self._controller_loader_version:
-                logger.debug('Ignoring outdated ControllerLoader result.')
-                return
-            self._on_controller_loaded(controller, error)
+    def _on_model_load_stage(self, generation, stage):
+        if generation != self.model_load_scheduler.latest_generation or self._busy_dialog is None:
+            return
+        self._busy_dialog.set_stage(self.texts.get(f'busy_stage_{stage}', ''))
 
-        loader.finished.connect(on_loaded)
-        self._controller_loader = loader
-        loader.start()
+    def _on_model_load_finished(self, generation, controller, error):
+        if generation != self.model_load_scheduler.latest_generation:
+            logger.debug('Ignoring outdated model load result.')
+            return
+        self._on_controller_loaded(controller, error)
 
     def _on_controller_loaded(self, controller, error):
         logger.info(f"Controller loading finished. Error: {error}")
         if self._busy_dialog:
             self._busy_dialog.close()
+            self._busy_dialog = None
         self.tray_app.set_menu_enabled(True)
         self.is_loading_model = False
 
@@ -142,7 +185,6 @@ class Application(QObject):
         if self.controller:
             logger.info("Old controller exists. Starting cleanup to prevent issues on Windows 7.")
             was_running = self.controller.running
-            self.controller.stop()
 
             # 1. Destroy the HotkeyManager first, as it holds a strong reference to the controller.
             if self.hotkey_manager:
@@ -151,13 +193,10 @@ class Application(QObject):
                 self.hotkey_manager.deleteLater()
                 self.hotkey_manager = None
 
-            # 2. Explicitly disconnect all signals from the old controller.
-            logger.debug("Disconnecting all signals from old controller.")
-            try:
-                self.controller.microphone_changed.disconnect()
-                self.controller.state_changed.disconnect()
-            except (TypeError, RuntimeError) as e:
-                logger.warning(f"Could not disconnect all signals from old controller: {e}")
+            # 2. Stop it (microphone and transcription file included) and disconnect all its signals.
+            # benchmarks/soak.py reloads controllers the same way.
+            logger.debug("Disposing of old controller.")
+            self.controller.dispose()
 
             # 3. Remove the reference and suggest garbage collection.
             logger.debug("Deleting old controller instance.")
@@ -170,9 +209,11 @@ class Application(QObject):
         self.controller.microphone_changed.connect(self.tray_app.update_tray_ui)
         self.controller.state_changed.connect(self.tray_app.update_tray_ui)
 
+        from scribe.hotkey_manager import HotkeyManager
         self.hotkey_manager = HotkeyManager(self.settings_manager, self.controller)
         self.model_path = self.settings.get('model_path', self.model_path)
         self.recognition_language = self.settings.get('language', self.recognition_language)
+        self.controller.update_pre_roll()
 
         if was_running:
             self.controller.start()
@@ -180,13 +221,24 @@ class Application(QObject):
 
         self.tray_app.update_tray_ui()
         self.controller_reloaded.emit(self.controller)
+        self._update_recognition_server()
 
         # Logic for showing the main window after loading
         if not self.initial_load_complete:
             # This was the initial startup load
             self.initial_load_complete = True
             if self.settings.get('main_window', {}).get('show_on_startup', True):
-                self.show_main_window()
+                with timeline.phase('main_window'):
+                    self.show_main_window()
+            if timeline.mark_ready():
+                timeline.log_summary()
+            # Startup used the warm-start cache; check it against the real devices now
+            threading.Thread(
+                target=self._validate_warm_state,
+                args=(self.controller.sample_rate, self.controller.device_name, self.controller.need_resample, self.controller.input_sample_rate),
+                name='scribe-warm-validation',
+                daemon=True
+            ).start()
         else:
             # This was a subsequent model change
             if self.main_window_was_visible_before_reload:
@@ -198,6 +250,27 @@ class Application(QObject):
         self.main_window_was_visible_before_reload = False
         self.settings_window_was_visible_before_reload = False
 
+    def _validate_warm_state(self, sample_rate, mic_name, need_resample, input_sample_rate):
+        """Runs on a worker thread: refreshes the cached device table and microphone format."""
+        from scribe.audio_devices import AudioDevices
+        from scribe.startup import probe_input_device
+        from scribe.warm_cache import get_warm_cache
+        try:
+            if AudioDevices.refresh_device_cache():
+                logger.info("Audio devices changed since the last run, updating the menus.")
+                self.tray_app.update_tray_ui()
+            fresh = probe_input_device(sample_rate, mic_name, use_cache=False)
+            if fresh != (need_resample, input_sample_rate):
+                self.input_format_changed.emit(*fresh)
+        except Exception as e:
+            logger.warning(f"Warm-start validation failed: {e}")
+        finally:
+            get_warm_cache().save()
+
+    def _on_input_format_changed(self, need_resample, input_sample_rate):
+        if self.controller:
+            self.controller.update_input_format(need_resample, input_sample_rate)
+
     def on_settings_changed(self, new_settings):
         self.settings = new_settings
         self.tray_app.update_tray_ui()
@@ -221,6 +294,12 @@ class Application(QObject):
         if new_language != self.recognition_language:
             reload_model = True
 
+        # Or if another model was chosen for final results (two-pass decoding)
+        if self.controller and not reload_model:
+            new_final_path = get_final_model_path(self.settings, new_language, new_model_path)
+            if new_final_path != self.controller.final_model_path:
+                reload_model = True
+
         if reload_model and new_model_path:
             logger.info("Reloading controller due to model/language change.")
             # Check and hide main window
@@ -244,6 +323,14 @@ class Application(QObject):
         if self.hotkey_manager:
             self.hotkey_manager.on_settings_changed(new_settings)
 
+        self._update_recognition_server()
+        self._update_metrics_server()
+        self._update_flight_recorder()
+        self._update_watchdog()
+
+        if self.controller and not self.is_loading_model:
+            self.controller.update_pre_roll()
+
         if self.controller and hasattr(self.controller.recognizer, '_load_replacements'):
             self.controller.recognizer._load_replacements()
 
@@ -255,6 +342,7 @@ class Application(QObject):
 
     def show_main_window(self):
         if not hasattr(self, '_main_voice_window') or self._main_voice_window is None:
+            from scribe.ui.main_voice_window import MainVoiceWindow
             self._main_voice_window = MainVoiceWindow(self, self.controller, self.texts, self.settings_manager)
             self.controller_reloaded.connect(self._main_voice_window._on_controller_reloaded)
 
@@ -272,12 +360,15 @@ class Application(QObject):
     def show_settings(self):
         old_lang = self.settings.get('ui_language', 'en')
         if self.settings_window is None:
+            from scribe.ui.settings_window import SettingsWindow
             self.settings_window = SettingsWindow(self, self.texts, self.settings_manager, parent=None)
 
             def on_settings_window_closed():
                 new_lang = self.settings_manager.all().get('ui_language', 'en')
                 if new_lang != old_lang:
                     self.reload_ui_language()
+                if self.settings_window is not None:
+                    self.settings_window.shutdown()
                 self.settings_window = None
 
             self.settings_window.finished.connect(on_settings_window_closed)
@@ -286,6 +377,86 @@ class Application(QObject):
         self.settings_window.activateWindow()
         self.settings_window.raise_()
 
+    def _update_recognition_server(self):
+        """Starts, reconfigures or stops the local recognition server to match the settings."""
+        config = self.settings_manager.get('recognition_server', {}) or {}
+        server = self.recognition_server
+        if not config.get('enabled') or self.controller is None:
+            if server:
+                server.stop()
+                self.recognition_server = None
+            return
+        port = int(config.get('port', 2700))
+        max_sessions = int(config.get('max_sessions', 4))
+        if server and (server.port != port or server.max_sessions != max_sessions):
+            server.stop()
+            server = self.recognition_server = None
+        if server is None:
+            from scribe.recognition_server import RecognitionServer
+            server = RecognitionServer(settings=self.settings_manager, port=port, max_sessions=max_sessions)
+            try:
+                server.start()
+            except OSError as e:
+                logger.error(f"Could not start the recognition server on port {port}: {e}")
+                return
+            self.recognition_server = server
+        if server.model is not self.controller.model:
+            # Serves the model the controller already holds; no second copy is loaded
+            server.set_model(self.controller.model, self.controller.sample_rate, self.controller.model_path)
+
+    def _update_metrics_server(self):
+        """Starts, moves or stops the metrics endpoint to match the settings."""
+        config = self.settings_manager.get('metrics', {}) or {}
+        server = self.metrics_server
+        port = int(config.get('port', 9464))
+        if server and (not config.get('enabled') or server.port != port):
+            server.stop()
+            server = self.metrics_server = None
+        if config.get('enabled') and server is None:
+            from scribe.metrics import MetricsServer
+            server = MetricsServer(port=port)
+            try:
+                server.start()
+            except OSError as e:
+                logger.error(f"Could not start the metrics endpoint on port {port}: {e}")
+                return
+            self.metrics_server = server
+
+    def _update_flight_recorder(self):
+        from scribe.flight_recorder import recorder
+        config = self.settings_manager.get('flight_recorder', {}) or {}
+        recorder.configure(seconds=config.get('seconds', 30), enabled=config.get('enabled', True))
+
+    def _update_watchdog(self):
+        from scribe.watchdog import watchdog
+        config = self.settings_manager.get('watchdog', {}) or {}
+        watchdog.configure(enabled=config.get('enabled', True), thresholds={
+            'audio': config.get('audio_stall_seconds', 3),
+            'decoder': config.get('decoder_stall_seconds', 5),
+            'inserter': config.get('inserter_stall_seconds', 30),
+        })
+        # Follows the controller across model reloads
+        watchdog.start(lambda: self.controller)
+
+    def show_batch_transcribe(self):
+        if self._batch_dialog is None:
+            from scribe.ui.batch_transcribe_dialog import BatchTranscribeDialog
+            self._batch_dialog = BatchTranscribeDialog(self.model_path, self.settings_manager, self.texts)
+
+            def release_batch_dialog(*_args):
+                # Kept while a cancelled run is still stopping: its thread must not be destroyed running
+                dialog = self._batch_dialog
+                if dialog is not None and not dialog.isVisible() and not dialog.is_running():
+                    self._batch_dialog = None
+
+            self._batch_dialog.finished.connect(release_batch_dialog)
+            self._batch_dialog.idle.connect(release_batch_dialog)
+        # Uses the model that is loaded when the dialog is opened
+        self._batch_dialog.model_path = self.model_path
+        self._batch_dialog.show()
+        self._batch_dialog.activateWindow()
+        self._batch_dialog.raise_()
+
     def exit_app(self):
         logger.debug("Exit requested. Calling app.quit().")
         self.app.quit()
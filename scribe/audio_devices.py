@@ -2,8 +2,6 @@
 # audio_devices.py
 import logging
 
-import sounddevice as sd
-
 logger = logging.getLogger(__name__)
 
 class AudioDevices:
@@ -15,6 +13,7 @@ class AudioDevices:
         Returns True/False.
         """
         try:
+            import sounddevice as sd
             if device:
                 # Find all devices with the given name
                 matching_devices = [d for d in sd.query_devices() if d['name'] == device and d['max_input_channels'] > 0]
@@ -51,6 +50,7 @@ class AudioDevices:
     @staticmethod
     def get_wasapi_index():
         try:
+            import sounddevice as sd
             for i, api in enumerate(sd.query_hostapis()):
                 if api['name'] == 'Windows WASAPI':
                     return i
@@ -63,6 +63,7 @@ class AudioDevices:
         wasapi_index = AudioDevices.get_wasapi_index() if wasapi_only else -1
         devices = []
         try:
+            import sounddevice as sd
             all_devices = sd.query_devices()
             for d in all_devices:
                 if d['max_input_channels'] <= 0:
@@ -80,10 +81,40 @@ class AudioDevices:
     @staticmethod
     def get_default_input_name():
         try:
+            import sounddevice as sd
             default_input = sd.query_devices(kind='input')
             return default_input['name']
         except Exception as e:
             logger.error(f"Failed to determine default microphone: {e}")
             return None
 
+    @staticmethod
+    def get_cached_input_devices(wasapi_only=True):
+        """Returns the last-known microphone list from the warm-start cache.
+
+        Queries the devices only if nothing is cached; the cached table is refreshed in the
+        background on startup (see Application._validate_warm_state).
+        """
+        from scribe.warm_cache import get_warm_cache
+        cache = get_warm_cache()
+        devices = cache.get('devices', f'input_wasapi_{wasapi_only}')
+        if devices is None:
+            devices = AudioDevices.get_input_devices(wasapi_only=wasapi_only)
+            cache.set('devices', f'input_wasapi_{wasapi_only}', devices)
+            cache.save()
+        return devices
+
+    @staticmethod
+    def refresh_device_cache():
+        """Queries the devices and updates the warm-start cache. Returns True if anything changed."""
+        from scribe.warm_cache import get_warm_cache
+        cache = get_warm_cache()
+        changed = False
+        for wasapi_only in (True, False):
+            changed |= cache.set('devices', f'input_wasapi_{wasapi_only}', AudioDevices.get_input_devices(wasapi_only=wasapi_only))
+        if changed:
+            # Format checks were made against the old device table
+            cache.clear('mic_formats')
+        return changed
+
     # In the future: methods for saving/loading the selected device
@@ -1,7 +1,6 @@
 # audio_utils.py
 import os
-
-import numpy as np
+import wave
 
 
 class AudioUtils:
@@ -12,6 +11,8 @@ class AudioUtils:
         data: bytes or np.array (int16), mono
         Returns bytes.
         """
+        import numpy as np
+
         if isinstance(data, bytes):
             data = np.frombuffer(data, dtype=np.int16)
         input_length = len(data)
@@ -21,6 +22,37 @@ class AudioUtils:
         resampled = np.interp(output_times, input_times, data).astype(np.int16)
         return resampled.tobytes()
 
+    @staticmethod
+    def to_mono(data, channels):
+        """Averages interleaved 16-bit PCM of several channels into mono bytes."""
+        if channels == 1:
+            return data
+        import numpy as np
+
+        frames = np.frombuffer(data, dtype=np.int16).reshape(-1, channels)
+        return frames.mean(axis=1).astype(np.int16).tobytes()
+
+    @staticmethod
+    def iter_wav_blocks(path, target_rate, block_seconds):
+        """Yields 16-bit mono PCM blocks of a WAV file at target_rate, block_seconds of audio each.
+
+        Raises ValueError for WAV files that are not 16-bit PCM.
+        """
+        with wave.open(path, 'rb') as wav:
+            if wav.getsampwidth() != 2 or wav.getcomptype() != 'NONE':
+                raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+            channels = wav.getnchannels()
+            input_rate = wav.getframerate()
+            block_frames = max(1, int(input_rate * block_seconds))
+            while True:
+                data = wav.readframes(block_frames)
+                if not data:
+                    break
+                data = AudioUtils.to_mono(data, channels)
+                if input_rate != target_rate:
+                    data = AudioUtils.resample_audio(data, input_rate, target_rate)
+                yield data
+
     @staticmethod
     def detect_sample_rate(model_path):
         """Determines the sample_rate for a Vosk model by reading mfcc.conf.
@@ -0,0 +1,321 @@
+# batch_transcriber.py
+"""Batch transcription of recordings on a process pool.
+
+Long files are split at silences (find_segments), and the segments of all files are
+decoded in parallel by worker processes. Each worker loads the model once, in the pool
+initializer, and reuses it for every segment it gets. Segment results are put back in file
+order and go through the configured replacements (decoder.TextProcessor), one utterance
+per line, like live transcripts.
+
+WAV files are read with the standard library; FLAC needs the optional soundfile package.
+"""
+import logging
+import multiprocessing
+import os
+import time
+import wave
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from scribe.audio_utils import AudioUtils
+from scribe.decoder import StaticSettings, StreamDecoder, TextProcessor
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = ('.wav', '.flac')
+TARGET_SEGMENT_SECONDS = 30.0  # Preferred segment length; the split goes to the best silence near it
+MAX_SEGMENT_SECONDS = 60.0  # Hard limit; without a silence the file is cut at its quietest point
+MIN_SILENCE_SECONDS = 0.3
+ENERGY_FRAME_SECONDS = 0.02
+DECODE_BLOCK_SECONDS = 0.25
+
+
+class AudioFile:
+    """Random access to the frames of a WAV or FLAC file as 16-bit mono PCM."""
+
+    def __init__(self, path):
+        self.path = path
+        if path.lower().endswith('.flac'):
+            try:
+                import soundfile
+            except ImportError as e:
+                raise ValueError(f"{path}: FLAC files need the 'soundfile' package") from e
+            self._sf = soundfile.SoundFile(path)
+            self._wav = None
+            self.rate, self.channels, self.frames = self._sf.samplerate, self._sf.channels, self._sf.frames
+        else:
+            self._sf = None
+            self._wav = wave.open(path, 'rb')
+            if self._wav.getsampwidth() != 2 or self._wav.getcomptype() != 'NONE':
+                self._wav.close()
+                raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+            self.rate, self.channels, self.frames = self._wav.getframerate(), self._wav.getnchannels(), self._wav.getnframes()
+
+    @property
+    def duration(self):
+        return self.frames / self.rate if self.rate else 0.0
+
+    def read(self, start, count):
+        """Returns count frames from frame start as 16-bit mono PCM bytes at the file's rate."""
+        if self._sf is not None:
+            self._sf.seek(start)
+            data = self._sf.buffer_read(count, dtype='int16')
+        else:
+            self._wav.setpos(start)
+            data = self._wav.readframes(count)
+        return AudioUtils.to_mono(bytes(data), self.channels)
+
+    def close(self):
+        if self._sf is not None:
+            self._sf.close()
+        if self._wav is not None:
+            self._wav.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def find_audio_files(paths):
+    """Expands files and directories (recursively) into a sorted list of WAV/FLAC files."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, files in os.walk(path):
+                found.extend(os.path.join(root, name) for name in files if name.lower().endswith(AUDIO_EXTENSIONS))
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            logger.warning(f"Skipping {path}: not a file or directory")
+    unique = {os.path.abspath(p): p for p in found}
+    return sorted(unique.values(), key=os.path.normcase)
+
+
+def frame_energies(audio, frame_seconds=ENERGY_FRAME_SECONDS, chunk_seconds=10.0, is_cancelled=None):
+    """Returns the energy (dBFS) of consecutive frames of audio, read in chunks.
+
+    is_cancelled() is polled between chunks; InterruptedError is raised when it returns True.
+    """
+    import numpy as np
+
+    frame = max(1, int(audio.rate * frame_seconds))
+    chunk = frame * max(1, int(chunk_seconds / frame_seconds))
+    energies = []
+    for start in range(0, audio.frames, chunk):
+        if is_cancelled is not None and is_cancelled():
+            raise InterruptedError("Batch transcription cancelled")
+        samples = np.frombuffer(audio.read(start, min(chunk, audio.frames - start)), dtype=np.int16).astype(np.float32)
+        usable = len(samples) // frame * frame
+        if usable:
+            power = np.mean(samples[:usable].reshape(-1, frame) ** 2, axis=1)
+            energies.append(10 * np.log10(power / (32768.0 ** 2) + 1e-10))
+    return np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)
+
+
+def find_segments(audio, target_seconds=TARGET_SEGMENT_SECONDS, max_seconds=MAX_SEGMENT_SECONDS, min_silence_seconds=MIN_SILENCE_SECONDS,
+                  is_cancelled=None):
+    """Splits audio into (start_frame, frame_count) segments of at most max_seconds.
+
+    A split goes to the middle of the longest silence (at least min_silence_seconds long)
+    that ends a segment between half of and the full target_seconds. If there is none, the
+    whole range up to max_seconds is searched, and as a last resort the quietest frame is used.
+    Silence is judged relative to the recording: frames within 10 dB of its noise floor.
+    is_cancelled is passed on to frame_energies.
+    """
+    import numpy as np
+
+    if audio.duration <= max_seconds:
+        return [(0, audio.frames)]
+    energies = frame_energies(audio, is_cancelled=is_cancelled)
+    frame = max(1, int(audio.rate * ENERGY_FRAME_SECONDS))
+    floor, loud = np.percentile(energies, 10), np.percentile(energies, 90)
+    silent = energies < min(floor + 10.0, loud)
+    # Runs of silent frames as (start, end) frame indices
+    runs, run_start = [], None
+    for i, is_silent in enumerate(np.append(silent, False)):
+        if is_silent and run_start is None:
+            run_start = i
+        elif not is_silent and run_start is not None:
+            if (i - run_start) * ENERGY_FRAME_SECONDS >= min_silence_seconds:
+                runs.append((run_start, i))
+            run_start = None
+
+    def frames_for(seconds):
+        return int(seconds / ENERGY_FRAME_SECONDS)
+
+    splits, start, total = [], 0, len(energies)
+    while total - start > frames_for(max_seconds):
+        best = None
+        for low, high in ((frames_for(target_seconds / 2), frames_for(target_seconds)), (1, frames_for(max_seconds))):
+            candidates = [(b - a, (a + b) // 2) for a, b in runs if start + low <= (a + b) // 2 <= start + high]
+            if candidates:
+                best = max(candidates)[1]
+                break
+        if best is None:
+            window = energies[start + frames_for(target_seconds):start + frames_for(max_seconds)]
+            best = start + frames_for(target_seconds) + int(np.argmin(window))
+        splits.append(best)
+        start = best
+    bounds = [0] + [s * frame for s in splits] + [audio.frames]
+    return [(bounds[i], bounds[i + 1] - bounds[i]) for i in range(len(bounds) - 1) if bounds[i + 1] > bounds[i]]
+
+
+# --- worker process ---
+
+_worker_model = None
+_worker_sample_rate = None
+
+
+def _init_worker(model_path, sample_rate):
+    global _worker_model, _worker_sample_rate
+    from scribe.startup import load_vosk_model
+    _worker_model = load_vosk_model(model_path)
+    _worker_sample_rate = sample_rate
+
+
+def _decode_segment(path, start, count):
+    """Decodes one segment in a worker; returns (raw utterance texts, decode seconds)."""
+    started = time.perf_counter()
+    decoder = StreamDecoder(_worker_model, _worker_sample_rate)
+    texts = []
+    with AudioFile(path) as audio:
+        block = max(1, int(audio.rate * DECODE_BLOCK_SECONDS))
+        for offset in range(start, start + count, block):
+            data = audio.read(offset, min(block, start + count - offset))
+            if audio.rate != _worker_sample_rate:
+                data = AudioUtils.resample_audio(data, audio.rate, _worker_sample_rate)
+            kind, text = decoder.accept(data)
+            if kind == 'final' and text:
+                texts.append(text)
+    text = decoder.finish()
+    if text:
+        texts.append(text)
+    return texts, time.perf_counter() - started
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+class BatchTranscriber:
+    """Transcribes files in parallel with a pool of worker processes.
+
+    progress_callback(done_segments, total_segments) and file_callback(result) are called
+    from the thread running run(); is_cancelled() is polled between files and long-file
+    chunks while planning and between segments while decoding.
+    """
+
+    def __init__(self, model_path, sample_rate=None, settings=None, workers=None,
+                 progress_callback=None, file_callback=None, is_cancelled=None):
+        if sample_rate is None:
+            from scribe.model_registry import get_model_registry
+            sample_rate = get_model_registry().get_sample_rate(model_path)
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.settings = settings if settings is not None else StaticSettings()
+        self.workers = workers or default_workers()
+        self.progress_callback = progress_callback
+        self.file_callback = file_callback
+        self.is_cancelled = is_cancelled or (lambda: False)
+
+    def _plan(self, files):
+        """Returns {path: result dict} with the segments of every readable file."""
+        plan = {}
+        for path in files:
+            if self.is_cancelled():
+                raise InterruptedError("Batch transcription cancelled")
+            result = {'path': path, 'text': '', 'utterances': [], 'segments': 0, 'audio_seconds': 0.0, 'decode_seconds': 0.0, 'error': None}
+            try:
+                with AudioFile(path) as audio:
+                    result['audio_seconds'] = round(audio.duration, 3)
+                    result['_segments'] = find_segments(audio, is_cancelled=self.is_cancelled)
+            except InterruptedError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cannot read {path}: {e}")
+                result['error'] = str(e)
+                result['_segments'] = []
+            result['segments'] = len(result['_segments'])
+            plan[path] = result
+        return plan
+
+    def _finish_file(self, result, parts, processor):
+        utterances = []
+        for index in range(result['segments']):
+            for raw in parts.get(index, []):
+                text, _actions = processor.final(raw)
+                if text.strip():
+                    utterances.append(text.strip())
+        result['utterances'] = utterances
+        result['text'] = '\n'.join(utterances)
+        result['decode_seconds'] = round(result['decode_seconds'], 3)
+        result.pop('_segments', None)
+        if self.file_callback:
+            self.file_callback(result)
+
+    def run(self, files):
+        """Transcribes files; returns one result dict per file, in the order of files."""
+        plan = self._plan(files)
+        processor = TextProcessor.from_settings(self.settings)
+        jobs = [(path, index, start, count) for path, result in plan.items() for index, (start, count) in enumerate(result['_segments'])]
+        parts = {path: {} for path in plan}
+        remaining = {path: result['segments'] for path, result in plan.items()}
+        for path, count in remaining.items():
+            if count == 0:
+                self._finish_file(plan[path], {}, processor)
+        total, done = len(jobs), 0
+        if self.progress_callback:
+            self.progress_callback(0, total)
+        if not jobs:
+            return list(plan.values())
+
+        logger.info(f"Batch transcription: {len(plan)} files, {total} segments, {self.workers} workers")
+        # 'spawn' everywhere: forking a process that runs Qt and audio threads is not safe
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.workers, total),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.model_path, self.sample_rate)
+        )
+        futures = {}
+        try:
+            futures = {executor.submit(_decode_segment, path, start, count): (path, index) for path, index, start, count in jobs}
+            pending = set(futures)
+            while pending:
+                if self.is_cancelled():
+                    raise InterruptedError("Batch transcription cancelled")
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    path, index = futures[future]
+                    result = plan[path]
+                    try:
+                        texts, seconds = future.result()
+                        parts[path][index] = texts
+                        result['decode_seconds'] += seconds
+                    except Exception as e:
+                        logger.error(f"Failed to decode segment {index} of {path}: {e}")
+                        result['error'] = str(e)
+                    done += 1
+                    remaining[path] -= 1
+                    if remaining[path] == 0:
+                        self._finish_file(result, parts[path], processor)
+                    if self.progress_callback:
+                        self.progress_callback(done, total)
+        finally:
+            for future in futures:
+                future.cancel()
+            # After a cancel, workers finish their current segment in the background
+            executor.shutdown(wait=not self.is_cancelled())
+        return list(plan.values())
+
+
+def write_transcript(result, output_dir=None):
+    """Writes result['text'] to <recording name>.txt (next to the recording by default); returns the path."""
+    base = os.path.splitext(os.path.basename(result['path']))[0] + '.txt'
+    target_dir = output_dir or os.path.dirname(os.path.abspath(result['path']))
+    os.makedirs(target_dir, exist_ok=True)
+    path = os.path.join(target_dir, base)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(result['text'] + '\n' if result['text'] else '')
+    return path
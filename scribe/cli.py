@@ -0,0 +1,306 @@
+# cli.py
+"""Headless entry point: python -m scribe.cli <command> ...
+
+Runs Scribe's recognition pipeline (decoding, replacements and command matching, see
+decoder.py) without Qt, keyboard hooks or text inserters, and writes JSON lines to stdout:
+
+    {"type": "partial", "text": "...", "time": 1.25}
+    {"type": "final", "text": "...", "raw": "...", "time": 2.5}
+    {"type": "end", "audio_seconds": 2.5, "decode_seconds": 0.4, "rtf": 0.16}
+
+The batch command writes one {"type": "file", ...} event per recording instead, and the
+replay command one {"type": "replay", ...} report per recording (see replay.py).
+
+Logs go to stderr.
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import time
+
+from scribe.audio_utils import AudioUtils
+from scribe.decoder import SETTINGS_FILE, HeadlessSession, StaticSettings
+from scribe.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SECONDS = 0.25  # Audio fed to the decoder per step, as in the tray app (blocksize 4000 at 16 kHz)
+
+
+class JsonlWriter:
+    """Writes one JSON object per line and flushes, so consumers see events immediately."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, event):
+        self.stream.write(json.dumps(event, ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+
+def resolve_model(args, settings):
+    """Returns (model_path, sample_rate) from --model or the model selected in the settings."""
+    from scribe.model_registry import get_model_registry
+    from scribe.utils import get_specific_model_path
+
+    model_path = args.model or get_specific_model_path(settings.get('language', ''), settings.get('current_model'))
+    if not model_path:
+        raise SystemExit("No model: pass --model or select a model in Scribe first")
+    return model_path, get_model_registry().get_sample_rate(model_path)
+
+
+def load_model(model_path):
+    from scribe.startup import load_vosk_model
+
+    started = time.perf_counter()
+    model = load_vosk_model(model_path)
+    logger.info(f"Model loaded in {time.perf_counter() - started:.1f} s: {model_path}")
+    return model
+
+
+def stdin_blocks(sample_rate, input_rate, block_seconds):
+    """Yields 16-bit mono PCM blocks of raw stdin PCM recorded at input_rate, resampled to sample_rate."""
+    stream = sys.stdin.buffer
+    block_bytes = max(1, int(input_rate * block_seconds)) * 2
+    while True:
+        data = stream.read(block_bytes)
+        if not data:
+            break
+        data = data[:len(data) // 2 * 2]
+        if input_rate != sample_rate:
+            data = AudioUtils.resample_audio(data, input_rate, sample_rate)
+        yield data
+
+
+def device_blocks(sample_rate, device, block_frames, duration=None):
+    """Yields 16-bit mono PCM blocks captured from a sound device until interrupted or duration runs out."""
+    import sounddevice as sd
+
+    if device is not None and device.isdigit():
+        device = int(device)
+    blocks = queue.Queue()
+    stream = sd.RawInputStream(
+        samplerate=sample_rate,
+        blocksize=block_frames,
+        dtype='int16',
+        channels=1,
+        callback=lambda indata, frames, time_info, status: blocks.put(bytes(indata)),
+        device=device or None
+    )
+    deadline = time.monotonic() + duration if duration else None
+    with stream:
+        logger.info(f"Listening on {device or 'the default input device'}; press Ctrl+C to stop")
+        while deadline is None or time.monotonic() < deadline:
+            try:
+                yield blocks.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+
+def run_session(session, blocks, writer):
+    """Feeds blocks to session, writes its events and a closing 'end' event; returns the end event."""
+    decode_seconds = 0.0
+    try:
+        for data in blocks:
+            started = time.perf_counter()
+            events = session.feed(data)
+            decode_seconds += time.perf_counter() - started
+            for event in events:
+                writer.write(event)
+    except KeyboardInterrupt:
+        pass
+    started = time.perf_counter()
+    for event in session.finish():
+        writer.write(event)
+    decode_seconds += time.perf_counter() - started
+    audio_seconds = session.position
+    end = {
+        'type': 'end',
+        'audio_seconds': round(audio_seconds, 3),
+        'decode_seconds': round(decode_seconds, 3),
+        'rtf': round(decode_seconds / audio_seconds, 4) if audio_seconds else None,
+    }
+    writer.write(end)
+    return end
+
+
+def cmd_transcribe(args):
+    settings = StaticSettings.load(args.settings)
+    model_path, sample_rate = resolve_model(args, settings)
+    model = load_model(model_path)
+    session = HeadlessSession(model, sample_rate, settings, mode=args.mode, partials=not args.no_partials)
+    if args.device is not None:
+        blocks = device_blocks(sample_rate, args.device, int(sample_rate * args.block_seconds), args.duration)
+    elif args.source == '-':
+        blocks = stdin_blocks(sample_rate, args.rate or sample_rate, args.block_seconds)
+    else:
+        blocks = AudioUtils.iter_wav_blocks(args.source, sample_rate, args.block_seconds)
+    run_session(session, blocks, JsonlWriter(sys.stdout))
+    return 0
+
+
+def cmd_batch(args):
+    from scribe.batch_transcriber import BatchTranscriber, find_audio_files, write_transcript
+
+    settings = StaticSettings.load(args.settings)
+    model_path, sample_rate = resolve_model(args, settings)
+    files = find_audio_files(args.paths)
+    if not files:
+        raise SystemExit("No WAV/FLAC files found")
+    writer = JsonlWriter(sys.stdout)
+
+    def on_file(result):
+        event = dict(type='file', **result)
+        if (args.output_dir or args.write) and not result['error']:
+            event['transcript'] = write_transcript(result, args.output_dir)
+        writer.write(event)
+
+    def on_progress(done, total):
+        logger.info(f"Segments decoded: {done}/{total}")
+
+    started = time.perf_counter()
+    transcriber = BatchTranscriber(model_path, sample_rate, settings, workers=args.workers,
+                                   progress_callback=on_progress, file_callback=on_file)
+    results = transcriber.run(files)
+    wall_seconds = time.perf_counter() - started
+    audio_seconds = sum(r['audio_seconds'] for r in results)
+    writer.write({
+        'type': 'end',
+        'files': len(results),
+        'failed': sum(1 for r in results if r['error']),
+        'workers': transcriber.workers,
+        'audio_seconds': round(audio_seconds, 3),
+        'decode_seconds': round(sum(r['decode_seconds'] for r in results), 3),
+        'wall_seconds': round(wall_seconds, 3),
+        'speed': round(audio_seconds / wall_seconds, 2) if wall_seconds else None,
+    })
+    return 1 if any(r['error'] for r in results) else 0
+
+
+def expected_text_path(path):
+    """<recording>.expected.txt: the document a replay of path must produce with --check."""
+    return os.path.splitext(path)[0] + '.expected.txt'
+
+
+def cmd_replay(args):
+    from scribe.flight_recorder import read_bundle
+    from scribe.model_registry import get_model_registry
+    from scribe.replay import replay_file
+
+    # Flight recording bundles replay audio.wav with the settings they were recorded with
+    bundles = {path: read_bundle(path) for path in args.paths}
+    if not args.model:
+        recorded = [b[1].get('model_path') for b in bundles.values() if b and b[1].get('model_path')]
+        if recorded and os.path.isdir(recorded[0]):
+            args.model = recorded[0]
+    settings = StaticSettings.load(args.settings)
+    model_path, sample_rate = resolve_model(args, settings)
+    model = load_model(model_path)
+    final_model, final_sample_rate = None, None
+    if args.final_model:
+        final_model = load_model(args.final_model)
+        final_sample_rate = get_model_registry().get_sample_rate(args.final_model)
+    writer = JsonlWriter(sys.stdout)
+    failed = False
+    for path in args.paths:
+        source, recorded = bundles[path] or (path, {})
+        report = replay_file(source, model, sample_rate, model_path, settings,
+                             blocksize=args.blocksize or recorded.get('blocksize', 4000),
+                             partial_interval=args.partial_interval or recorded.get('partial_interval', 0.5),
+                             speed=args.speed, mode=args.mode or recorded.get('mode', 'transcribe'),
+                             final_model=final_model, final_sample_rate=final_sample_rate)
+        if args.check:
+            try:
+                with open(expected_text_path(path), 'r', encoding='utf-8') as f:
+                    expected = f.read()
+                report['matches_expected'] = report['text'].strip() == expected.strip()
+            except OSError:
+                report['matches_expected'] = None
+            failed = failed or report['matches_expected'] is False
+        if args.write_expected:
+            with open(expected_text_path(path), 'w', encoding='utf-8') as f:
+                f.write(report['text'].strip() + '\n')
+        if args.max_rtf is not None and report['rtf'] is not None and report['rtf'] > args.max_rtf:
+            report['rtf_exceeded'] = True
+            failed = True
+        writer.write(dict(type='replay', **report))
+    return 1 if failed else 0
+
+
+def cmd_serve(args):
+    from scribe.recognition_server import RecognitionServer
+
+    settings = StaticSettings.load(args.settings)
+    model_path, sample_rate = resolve_model(args, settings)
+    model = load_model(model_path)
+    server = RecognitionServer(model, sample_rate, model_path, settings, host=args.host, port=args.port, max_sessions=args.max_sessions)
+    server.serve_forever()
+    return 0
+
+
+def add_common_arguments(parser):
+    parser.add_argument('--model', help="path to a Vosk model (default: the model selected in Scribe)")
+    parser.add_argument('--settings', default=SETTINGS_FILE, help="settings.json with replacements and commands (default: %(default)s)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m scribe.cli', description="Headless Scribe speech recognition.")
+    parser.add_argument('--log-level', default='WARNING', help="log level for messages on stderr (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    transcribe = commands.add_parser('transcribe', help="stream recognition events for stdin, a WAV file or a sound device")
+    transcribe.add_argument('source', nargs='?', default='-', help="16-bit PCM WAV file, or '-' for raw 16-bit mono PCM on stdin (default)")
+    transcribe.add_argument('--device', nargs='?', const='', help="capture from a sound device (name or index; default device if empty)")
+    transcribe.add_argument('--duration', type=float, help="stop capturing from --device after this many seconds")
+    transcribe.add_argument('--rate', type=int, help="sample rate of stdin PCM (default: the model's sample rate)")
+    transcribe.add_argument('--block-seconds', type=float, default=BLOCK_SECONDS, help="audio per decoder step (default: %(default)s)")
+    transcribe.add_argument('--no-partials', action='store_true', help="emit final events only")
+    transcribe.add_argument('--mode', choices=('transcribe', 'command'), default='transcribe',
+                            help="'command' adds the matched voice command to final events (it is not executed)")
+    add_common_arguments(transcribe)
+    transcribe.set_defaults(func=cmd_transcribe)
+
+    batch = commands.add_parser('batch', help="transcribe WAV/FLAC files or directories in parallel processes")
+    batch.add_argument('paths', nargs='+', help="files and/or directories (searched recursively)")
+    batch.add_argument('--workers', type=int, help="worker processes, each with its own copy of the model (default: CPU count - 1)")
+    batch.add_argument('--output-dir', help="write <recording>.txt transcripts to this folder")
+    batch.add_argument('--write', action='store_true', help="write <recording>.txt next to each recording")
+    add_common_arguments(batch)
+    batch.set_defaults(func=cmd_batch)
+
+    replay = commands.add_parser('replay', help="replay WAV files through the tray app's recognizer into a virtual document")
+    replay.add_argument('paths', nargs='+', help="16-bit PCM WAV files or flight recording folders (see flight_recorder.py)")
+    replay.add_argument('--speed', type=float, default=0.0, help="1 = real time, 2 = twice as fast, 0 = as fast as possible (default)")
+    replay.add_argument('--blocksize', type=int, help="audio frames per block, as in the settings (default: 4000, or as recorded)")
+    replay.add_argument('--partial-interval', type=float, help="seconds of audio between typed partials (default: 0.5, or as recorded)")
+    replay.add_argument('--mode', choices=('transcribe', 'command'),
+                        help="'command' reports the matched voice commands instead of typing (default: transcribe, or as recorded)")
+    replay.add_argument('--final-model', help="path to a larger model for two-pass decoding")
+    replay.add_argument('--check', action='store_true', help="compare each document with <recording>.expected.txt; exit 1 on a mismatch")
+    replay.add_argument('--write-expected', action='store_true', help="write each document to <recording>.expected.txt")
+    replay.add_argument('--max-rtf', type=float, help="exit 1 if a replay's real-time factor is higher")
+    add_common_arguments(replay)
+    replay.set_defaults(func=cmd_replay)
+
+    serve = commands.add_parser('serve', help="serve recognition over HTTP with one shared model (see recognition_server.py)")
+    serve.add_argument('--host', default='127.0.0.1', help="address to bind (default: %(default)s)")
+    serve.add_argument('--port', type=int, default=2700, help="port to bind, 0 for any free port (default: %(default)s)")
+    serve.add_argument('--max-sessions', type=int, default=4, help="streams decoded at the same time (default: %(default)s)")
+    add_common_arguments(serve)
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    setup_logging(log_level=args.log_level)
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
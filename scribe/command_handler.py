@@ -2,13 +2,116 @@
 import logging
 import os
 import subprocess
+import time
 
-import keyboard
-
+from scribe.metrics import registry
 from scribe.text_utils import fuzzy_match, normalize_text
 
 logger = logging.getLogger(__name__)
 
+COMMAND_DISPATCH = registry.histogram('scribe_command_dispatch_seconds', "Final text in command mode -> command matched and executed")
+COMMANDS_UNMATCHED = registry.counter('scribe_commands_total', "Final texts handled in command mode", type='none')
+
+
+def match_command(text, settings, lang=None):
+    """Finds the voice command that text triggers, without executing it.
+
+    settings — dict or settings object with all()
+    lang — command language (defaults to current from settings).
+    Returns a dict: {'type': 'hotkey', 'trigger', 'hotkey'} or
+    {'type': 'openfile', 'trigger', 'path', 'args', 'is_uwp'}, or None if nothing matches.
+    Hotkey commands are checked first; only the first match is returned.
+    """
+    if hasattr(settings, 'all'):
+        settings = settings.all()
+    settings = settings or {}
+    lang_code = lang or settings.get('language', 'en')
+    text_norm = normalize_text(text)
+    # 1. Check commands_hotkey
+    fuzzy_threshold_hotkey = float(settings.get('fuzzy_match_hotkey', 90)) / 100.0
+    hotkey_cmds = settings.get('commands_hotkey', {}).get(lang_code, [])
+    for cmd in hotkey_cmds:
+        trigger = normalize_text(cmd.get('trigger', ''))
+        logger.debug(f"[COMMAND] Checking hotkey trigger: '{trigger}' ~ '{text_norm}'")
+        # First exact match, then fuzzy_match
+        if trigger and (trigger == text_norm or fuzzy_match(trigger, text_norm, threshold=fuzzy_threshold_hotkey)):
+            return {'type': 'hotkey', 'trigger': trigger, 'hotkey': cmd.get('hotkey', '').strip()}
+    # 2. Check commands_openfile
+    fuzzy_threshold_openfile = float(
+        settings.get('fuzzy_match_openfile', 90)) / 100.0
+    openfile_cmds = settings.get('commands_openfile', {}).get(lang_code, [])
+    for cmd in openfile_cmds:
+        trigger = normalize_text(cmd.get('trigger', ''))
+        logger.debug(
+            f"[COMMAND] Checking openfile trigger: '{trigger}' ~ '{text_norm}'")
+        # First exact match, then fuzzy_match
+        if trigger and (trigger == text_norm or fuzzy_match(trigger, text_norm, threshold=fuzzy_threshold_openfile)):
+            return {
+                'type': 'openfile',
+                'trigger': trigger,
+                'path': cmd.get('path', '').strip(),
+                'args': cmd.get('args', '').strip(),
+                # Check for the 'is_uwp' flag, defaulting to False if not present
+                'is_uwp': str(cmd.get('is_uwp', 'false')).lower() == 'true',
+            }
+    return None
+
+
+def execute_command(command):
+    """Performs a command returned by match_command: sends the hotkey or launches the file."""
+    if command['type'] == 'hotkey':
+        hotkey = command['hotkey']
+        if hotkey:
+            logger.info(f"[COMMAND] Simulating hotkey: {hotkey}")
+            try:
+                # Imported here so command matching works without keyboard hooks (headless use)
+                import keyboard
+                keyboard.send(hotkey)
+            except Exception as e:
+                logger.error(f"[COMMAND][ERROR] Failed to send hotkey: {e}")
+        return
+    trigger, path, args = command['trigger'], command['path'], command['args']
+    # The launch logic now depends on whether it's a UWP app or a regular file.
+    if command['is_uwp']:
+        # For UWP/Shell apps, the 'args' field contains the shell URI.
+        if args:
+            logger.info(f"[COMMAND] Launching UWP/Shell app: {args}")
+            try:
+                # The launch method differs between Windows versions.
+                if os.name == 'nt':
+                    import sys
+                    win_ver = sys.getwindowsversion()
+
+                    # For Win 10 (major version 10) and 11, explorer.exe is reliable.
+                    if win_ver.major >= 10:
+                        logger.debug("Using 'explorer.exe' method for Windows 10/11.")
+                        subprocess.Popen(['explorer.exe', args])
+                    # For Win 8.0 (6.2), os.startfile was confirmed to work.
+                    else:
+                        logger.debug("Using 'os.startfile' method for Windows 8.0.")
+                        os.startfile(args)
+                else:
+                    logger.warning("[COMMAND][WARN] UWP launch attempted on non-Windows OS.")
+            except Exception as e:
+                logger.error(
+                    f"[COMMAND][ERROR] Failed to launch UWP/Shell app: {e}")
+        else:
+            logger.warning(
+                f"[COMMAND][WARN] UWP app has no launch arguments: {trigger}")
+    elif path:
+        # This is the original logic for standard executables.
+        logger.info(f"[COMMAND] Launching file: {path} {args}")
+        try:
+            # If it's on Windows and no arguments — use os.startfile
+            if os.name == 'nt' and not args:
+                os.startfile(path)
+            else:
+                # For cross-platform or with-args, use Popen.
+                subprocess.Popen([path] + args.split())
+        except Exception as e:
+            logger.error(
+                f"[COMMAND][ERROR] Failed to launch file: {e}")
+
 
 def command_mode(settings_manager, lang=None):
     """Returns a handler for command mode.
@@ -17,80 +120,13 @@ def command_mode(settings_manager, lang=None):
     lang — command language (defaults to current from settings).
     """
     def handler(text):
-        settings = settings_manager.all() if hasattr(settings_manager, 'all') else {}
-        lang_code = lang or settings.get('language', 'en')
-        text_norm = normalize_text(text)
-        logger.info(f"[COMMAND] Recognized text: '{text_norm}'")
-        # 1. Check commands_hotkey
-        fuzzy_threshold_hotkey = float(settings.get('fuzzy_match_hotkey', 90)) / 100.0
-        hotkey_cmds = settings.get('commands_hotkey', {}).get(lang_code, [])
-        for cmd in hotkey_cmds:
-            trigger = normalize_text(cmd.get('trigger', ''))
-            hotkey = cmd.get('hotkey', '').strip()
-            logger.debug(f"[COMMAND] Checking hotkey trigger: '{trigger}' ~ '{text_norm}'")
-            # First exact match, then fuzzy_match
-            if trigger and (trigger == text_norm or fuzzy_match(trigger, text_norm, threshold=fuzzy_threshold_hotkey)):
-                if hotkey:
-                    logger.info(f"[COMMAND] Simulating hotkey: {hotkey}")
-                    try:
-                        keyboard.send(hotkey)
-                    except Exception as e:
-                        logger.error(f"[COMMAND][ERROR] Failed to send hotkey: {e}")
-                return  # Only execute the first match
-        # 2. Check commands_openfile
-        fuzzy_threshold_openfile = float(
-            settings.get('fuzzy_match_openfile', 90)) / 100.0
-        openfile_cmds = settings.get('commands_openfile', {}).get(lang_code, [])
-        for cmd in openfile_cmds:
-            trigger = normalize_text(cmd.get('trigger', ''))
-            path = cmd.get('path', '').strip()
-            args = cmd.get('args', '').strip()
-            # Check for the 'is_uwp' flag, defaulting to False if not present
-            is_uwp = str(cmd.get('is_uwp', 'false')).lower() == 'true'
-
-            logger.debug(
-                f"[COMMAND] Checking openfile trigger: '{trigger}' ~ '{text_norm}'")
-            # First exact match, then fuzzy_match
-            if trigger and (trigger == text_norm or fuzzy_match(trigger, text_norm, threshold=fuzzy_threshold_openfile)):
-                # The launch logic now depends on whether it's a UWP app or a regular file.
-                if is_uwp:
-                    # For UWP/Shell apps, the 'args' field contains the shell URI.
-                    if args:
-                        logger.info(f"[COMMAND] Launching UWP/Shell app: {args}")
-                        try:
-                            # The launch method differs between Windows versions.
-                            if os.name == 'nt':
-                                import sys
-                                win_ver = sys.getwindowsversion()
-
-                                # For Win 10 (major version 10) and 11, explorer.exe is reliable.
-                                if win_ver.major >= 10:
-                                    logger.debug("Using 'explorer.exe' method for Windows 10/11.")
-                                    subprocess.Popen(['explorer.exe', args])
-                                # For Win 8.0 (6.2), os.startfile was confirmed to work.
-                                else:
-                                    logger.debug("Using 'os.startfile' method for Windows 8.0.")
-                                    os.startfile(args)
-                            else:
-                                logger.warning("[COMMAND][WARN] UWP launch attempted on non-Windows OS.")
-                        except Exception as e:
-                            logger.error(
-                                f"[COMMAND][ERROR] Failed to launch UWP/Shell app: {e}")
-                    else:
-                        logger.warning(
-                            f"[COMMAND][WARN] UWP app has no launch arguments: {trigger}")
-                elif path:
-                    # This is the original logic for standard executables.
-                    logger.info(f"[COMMAND] Launching file: {path} {args}")
-                    try:
-                        # If it's on Windows and no arguments — use os.startfile
-                        if os.name == 'nt' and not args:
-                            os.startfile(path)
-                        else:
-                            # For cross-platform or with-args, use Popen.
-                            subprocess.Popen([path] + args.split())
-                    except Exception as e:
-                        logger.error(
-                            f"[COMMAND][ERROR] Failed to launch file: {e}")
-                return  # Execute only the first match
+        started = time.perf_counter()
+        logger.info(f"[COMMAND] Recognized text: '{normalize_text(text)}'")
+        command = match_command(text, settings_manager, lang)
+        if command is not None:
+            execute_command(command)  # Only execute the first match
+            registry.counter('scribe_commands_total', type=command['type']).inc()
+        else:
+            COMMANDS_UNMATCHED.inc()
+        COMMAND_DISPATCH.observe(time.perf_counter() - started)
     return handler
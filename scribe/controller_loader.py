@@ -1,62 +1,221 @@
 # controller_loader.py
+"""Model-load scheduler: builds VoiceTyperController instances on one dedicated worker thread.
+
+Load requests are coalesced: while a load is running, newer requests only replace the
+pending target, so switching models several times in a row loads just the last one. Each
+request gets a generation number; a load whose generation is no longer the latest stops
+at the next stage boundary and its result is dropped instead of being handed to the UI.
+
+Stages are reported through stage_changed so the busy dialog can show progress:
+resolve (sample rate, microphone) -> read (model files into the page cache) ->
+construct (vosk.Model) -> warm (synthetic clip) -> final (the larger model for two-pass
+decoding, if one is chosen) -> controller.
+"""
 import logging
+import threading
+import time
 
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import QCoreApplication, QObject, QThread, pyqtSignal
 
-from scribe.audio_utils import AudioUtils
-from scribe.voice_typer_controller import VoiceTyperController
+from scribe.metrics import registry
+from scribe.model_registry import get_model_registry
+from scribe.startup import load_vosk_model, probe_input_device, take_preload, timeline
+from scribe.utils import get_final_model_path
 
 logger = logging.getLogger(__name__)
 
-class ControllerLoader(QThread):
-    finished = pyqtSignal(object, object)  # (controller, error)
-    def __init__(self, model_path, inserter_type, settings_manager, application):
+STAGES = ('resolve', 'read', 'construct', 'warm', 'final', 'controller')
+
+LOAD_SECONDS = registry.histogram('scribe_model_load_seconds', "Model load requests from start to a ready controller")
+LOADS_PENDING = registry.gauge('scribe_model_loads_pending', "1 while a model load is running or waiting")
+
+
+class _StaleLoadError(Exception):
+    """Raised inside the worker when a newer request superseded the running one."""
+
+
+class _LoadWorker(QThread):
+    def __init__(self, scheduler):
+        super().__init__()
+        self.setObjectName('scribe-model-load')
+        self._scheduler = scheduler
+
+    def run(self):
+        self._scheduler._worker_loop()
+
+
+class ModelLoadScheduler(QObject):
+    stage_changed = pyqtSignal(int, str)  # (generation, stage)
+    finished = pyqtSignal(int, object, object)  # (generation, controller, error)
+
+    def __init__(self, settings_manager, application):
         super().__init__()
-        self.model_path = model_path
-        self.inserter_type = inserter_type
         self.settings_manager = settings_manager
         self.application = application
-    def run(self):
-        try:
-            # 1. Determine sample_rate for the model
-            sample_rate = AudioUtils.detect_sample_rate(self.model_path)
-            logger.info(f"sample_rate from model {sample_rate} Hz")
-            mic_name = self.settings_manager.all().get('selected_microphone')
-
-            # 2. Check if the microphone supports the required sample rate (for warning)
-            from scribe.audio_devices import AudioDevices
-            if not AudioDevices.check_microphone_sample_rate(sample_rate, device=mic_name):
-                logger.warning(f"Microphone {mic_name or '[default]'} does not support {sample_rate} Hz. Resampling or errors possible!")
-                # 3. Get the actual microphone sample rate only if resampling is needed
-                input_sample_rate = sample_rate
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._pending = None  # (generation, model_path, inserter_type)
+        self._stopping = False
+        self._worker = _LoadWorker(self)
+        self._worker.start()
+
+    @property
+    def latest_generation(self):
+        with self._cond:
+            return self._generation
+
+    def is_stale(self, generation):
+        with self._cond:
+            return generation != self._generation or self._stopping
+
+    def request(self, model_path, inserter_type):
+        """Schedules a load of model_path and returns its generation.
+
+        A pending request that has not started yet is replaced; a running one is abandoned
+        at its next stage boundary.
+        """
+        with self._cond:
+            self._generation += 1
+            if self._pending is not None:
+                logger.debug(f"Coalescing model load request for {self._pending[1]} into {model_path}")
+            self._pending = (self._generation, model_path, inserter_type)
+            self._cond.notify()
+            return self._generation
+
+    def shutdown(self, timeout=5000):
+        """Stops the worker; a load in progress is abandoned at its next stage boundary."""
+        with self._cond:
+            self._stopping = True
+            self._pending = None
+            self._cond.notify()
+        if not self._worker.wait(timeout):
+            logger.warning("Model load worker did not stop in time")
+
+    # --- worker thread ---
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                generation, model_path, inserter_type = self._pending
+                self._pending = None
+            LOADS_PENDING.set(1)
+            started = time.perf_counter()
+            try:
+                controller = self._load(generation, model_path, inserter_type)
+            except _StaleLoadError:
+                logger.info(f"Model load for {model_path} superseded by a newer request")
+                self._count_load('superseded')
+                continue
+            except Exception as e:
+                self._count_load('failed')
+                if not self.is_stale(generation):
+                    self.finished.emit(generation, None, e)
+                continue
+            if self.is_stale(generation):
+                logger.info(f"Discarding stale controller for {model_path}")
+                self._count_load('superseded')
+                del controller
+                continue
+            LOAD_SECONDS.observe(time.perf_counter() - started)
+            self._count_load('ok')
+            self.finished.emit(generation, controller, None)
+
+    def _count_load(self, result):
+        registry.counter('scribe_model_loads_total', "Model load requests by result", result=result).inc()
+        with self._cond:
+            if self._pending is None:
+                LOADS_PENDING.set(0)
+
+    def _stage(self, generation, stage):
+        if self.is_stale(generation):
+            raise _StaleLoadError()
+        logger.debug(f"Model load {generation}: {stage}")
+        self.stage_changed.emit(generation, stage)
+
+    def _load(self, generation, model_path, inserter_type):
+        # Imported here so vosk and sounddevice load on this thread, not while the UI starts
+        from scribe.model_warmup import decode_warmup_clip, log_warmup, prefetch_model_files, warm_up_model
+        from scribe.voice_typer_controller import VoiceTyperController
+
+        self._stage(generation, 'resolve')
+        mic_name = self.settings_manager.all().get('selected_microphone')
+        warmup = self.settings_manager.get('model_warmup', True)
+        preload = take_preload(model_path, mic_name)
+        if preload is not None:
+            # Started at startup, in parallel with building the UI (warm-up included)
+            sample_rate = preload.sample_rate
+            need_resample, input_sample_rate = preload.device_future.result()
+            self._stage(generation, 'construct')
+            model = preload.model_future.result()
+        else:
+            sample_rate = get_model_registry().get_sample_rate(model_path)
+            # Check if the microphone supports the required sample rate (for warning)
+            need_resample, input_sample_rate = probe_input_device(sample_rate, mic_name)
+            prefetched, prefetch_seconds = 0, 0.0
+            if warmup:
+                self._stage(generation, 'read')
+                with timeline.phase('model_prefetch'):
+                    started = time.perf_counter()
+                    prefetched = prefetch_model_files(model_path)
+                    prefetch_seconds = time.perf_counter() - started
+            self._stage(generation, 'construct')
+            with timeline.phase('model_load'):
+                model = load_vosk_model(model_path)
+            # Paid here, before the controller is reported ready, instead of on the first utterance
+            if warmup:
+                self._stage(generation, 'warm')
                 try:
-                    import sounddevice as sd
-                    if mic_name:
-                        for dev in sd.query_devices():
-                            if dev['name'] == mic_name and dev['max_input_channels'] > 0:
-                                input_sample_rate = int(dev['default_samplerate'])
-                                break
-                        else:
-                            input_sample_rate = int(sd.query_devices(kind='input')['default_samplerate'])
-                    else:
-                        input_sample_rate = int(sd.query_devices(kind='input')['default_samplerate'])
-                except Exception:
-                    pass
-                need_resample = True
-            else:
-                input_sample_rate = sample_rate
-                need_resample = False
+                    with timeline.phase('model_warmup'):
+                        started = time.perf_counter()
+                        decode_warmup_clip(model, sample_rate)
+                    log_warmup(model_path, prefetched, prefetch_seconds, time.perf_counter() - started)
+                except Exception as e:
+                    logger.warning(f"Model warm-up failed: {e}")
+        logger.info(f"sample_rate from model {sample_rate} Hz")
+
+        final_model, final_sample_rate = None, None
+        final_model_path = get_final_model_path(self.settings_manager, self.settings_manager.get('language'), model_path)
+        if final_model_path:
+            self._stage(generation, 'final')
+            try:
+                with timeline.phase('final_model_load'):
+                    final_sample_rate = get_model_registry().get_sample_rate(final_model_path)
+                    final_model = load_vosk_model(final_model_path)
+                if warmup:
+                    try:
+                        warm_up_model(final_model, final_model_path, final_sample_rate)
+                    except Exception as e:
+                        logger.warning(f"Warm-up of the model for final results failed: {e}")
+                logger.info(f"Two-pass decoding: final results from {final_model_path} ({final_sample_rate} Hz)")
+            except Exception as e:
+                # The current model alone still works; final_model_path stays so the same
+                # choice is not reloaded on every settings change
+                logger.error(f"Failed to load the model for final results, using single pass: {e}")
+                final_model = None
 
+        self._stage(generation, 'controller')
+        with timeline.phase('controller'):
             controller = VoiceTyperController(
-                model_path=self.model_path,
-                inserter_type=self.inserter_type,
+                model_path=model_path,
+                model=model,
+                inserter_type=inserter_type,
                 sample_rate=sample_rate,
                 settings_manager=self.settings_manager,
                 need_resample=need_resample,
                 input_sample_rate=input_sample_rate,
                 blocksize=self.settings_manager.all().get('blocksize', 4000),
-                application=self.application
+                application=self.application,
+                final_model=final_model,
+                final_model_path=final_model_path,
+                final_sample_rate=final_sample_rate
             )
-            self.finished.emit(controller, None)
-        except Exception as e:
-            self.finished.emit(None, e)
+        # Created on this thread; hand the objects over to the UI thread that will own them
+        ui_thread = QCoreApplication.instance().thread()
+        controller.moveToThread(ui_thread)
+        if controller.recognizer is not None:
+            controller.recognizer.moveToThread(ui_thread)
+        return controller
@@ -0,0 +1,242 @@
+# decoder.py
+"""Qt-free recognition pipeline shared by the tray app and the headless entry points.
+
+StreamDecoder turns PCM blocks into partial/final texts with a KaldiRecognizer,
+TextProcessor applies the user's replacements the same way the tray app inserts them, and
+HeadlessSession ties both to command matching and produces plain event dicts.
+FinalPassDecoder re-decodes whole utterances with a second model for two-pass decoding.
+Nothing in this module imports Qt, keyboard hooks or text inserters.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+
+from scribe.audio_utils import AudioUtils
+from scribe.replacements import apply_replacements_actions, load_replacements, parse_replace_string
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_FILE = 'settings.json'  # Same default location as SettingsManager
+
+
+class StaticSettings:
+    """Read-only settings with the get()/all() interface of SettingsManager."""
+
+    def __init__(self, data=None):
+        self._settings = dict(data or {})
+
+    @classmethod
+    def load(cls, path=SETTINGS_FILE):
+        """Reads a settings.json; a missing or broken file gives empty settings."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Settings not loaded from {path}: {e}")
+            return cls()
+
+    def get(self, key, default=None):
+        return self._settings.get(key, default)
+
+    def all(self):
+        return self._settings
+
+
+class StreamDecoder:
+    """Feeds PCM blocks to a KaldiRecognizer.
+
+    accept() returns ('final', text) when an utterance ended and ('partial', text) otherwise;
+    texts may be empty and partials repeat until the hypothesis changes. The time the last
+    accept() spent in the recognizer and on its JSON is kept for latency tracing.
+    """
+
+    def __init__(self, model, sample_rate, recognizer=None):
+        self.sample_rate = sample_rate
+        if recognizer is None:
+            import vosk
+            recognizer = vosk.KaldiRecognizer(model, sample_rate)
+        self._recognizer = recognizer
+        self.last_decode_seconds = 0.0
+        self.last_parse_seconds = 0.0
+
+    def accept(self, data):
+        started = time.perf_counter()
+        final = self._recognizer.AcceptWaveform(data)
+        decoded = time.perf_counter()
+        if final:
+            kind, text = 'final', self._result_text(self._recognizer.Result(), 'text')
+        else:
+            kind, text = 'partial', self._result_text(self._recognizer.PartialResult(), 'partial')
+        self.last_decode_seconds = decoded - started
+        self.last_parse_seconds = time.perf_counter() - decoded
+        return kind, text
+
+    def finish(self):
+        """Flushes the decoder at the end of a stream; returns the last final text ('' if none)."""
+        return self._result_text(self._recognizer.FinalResult(), 'text')
+
+    @staticmethod
+    def _result_text(result, key):
+        try:
+            return json.loads(result).get(key, '').strip()
+        except Exception:
+            return ''
+
+
+class FinalPassDecoder:
+    """Decodes whole utterances with a second, usually larger, model on its own thread.
+
+    Two-pass decoding: a small model gives live partials and ends utterances, and each
+    utterance's audio (16-bit mono PCM at input_rate) is submitted here. Vosk releases the
+    GIL while decoding, so this thread runs on another core next to the live decoder.
+    Results come back as (utterance_id, text, decode_seconds) in submission order; text is
+    None if decoding failed.
+    """
+
+    BLOCK_SECONDS = 0.5
+
+    def __init__(self, model, sample_rate, input_rate=None):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.input_rate = input_rate or sample_rate
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='scribe-final-pass', daemon=True)
+        self._thread.start()
+
+    def submit(self, utterance_id, data):
+        self._jobs.put((utterance_id, data))
+
+    def poll(self):
+        """Returns the results that are ready, without waiting."""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def wait(self, timeout):
+        """Returns the next result, or None if none is ready within timeout seconds."""
+        try:
+            return self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        """Lets the thread exit after the submitted utterances."""
+        self._jobs.put(None)
+
+    def _run(self):
+        decoder = None
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            utterance_id, data = job
+            started = time.perf_counter()
+            try:
+                if decoder is None:
+                    decoder = StreamDecoder(self.model, self.sample_rate)
+                if self.input_rate != self.sample_rate:
+                    data = AudioUtils.resample_audio(data, self.input_rate, self.sample_rate)
+                block = max(2, int(self.sample_rate * self.BLOCK_SECONDS) * 2)
+                texts = []
+                for offset in range(0, len(data), block):
+                    kind, text = decoder.accept(data[offset:offset + block])
+                    if kind == 'final' and text:
+                        texts.append(text)
+                # FinalResult also resets the recognizer for the next utterance
+                text = decoder.finish()
+                if text:
+                    texts.append(text)
+                text = ' '.join(texts)
+            except Exception as e:
+                logger.error(f"Final pass failed for utterance {utterance_id}: {e}")
+                text = None
+            self._results.put((utterance_id, text, time.perf_counter() - started))
+
+
+class TextProcessor:
+    """Applies replacements to partial and final texts (see replacements.py)."""
+
+    def __init__(self, replacements=(), enabled=True, partial_enabled=True, lang='en'):
+        self.replacements = list(replacements)
+        self.enabled = enabled
+        self.partial_enabled = partial_enabled
+        self.lang = lang
+
+    @classmethod
+    def from_settings(cls, settings_manager, lang=None):
+        replacements, enabled, partial_enabled, lang = load_replacements(settings_manager, lang)
+        return cls(replacements, enabled, partial_enabled, lang)
+
+    def partial(self, text):
+        """Returns the partial as it is shown and inserted: special commands are never included."""
+        actions = parse_replace_string(text)
+        clean = ''.join(act['value'] for act in actions if act['type'] == 'text')
+        if not self.partial_enabled:
+            return clean
+        # Text replaced by a special command is not inserted in a partial
+        return ''.join(act['value'] for act in apply_replacements_actions(clean, self.replacements) if act['type'] == 'text')
+
+    def final(self, text):
+        """Returns (plain text, actions); actions is None when replacements are disabled."""
+        if not self.enabled:
+            return text, None
+        actions = apply_replacements_actions(text, self.replacements)
+        return ''.join(act['value'] for act in actions if act['type'] == 'text'), actions
+
+
+class HeadlessSession:
+    """One recognition stream: PCM in, event dicts out.
+
+    Events are {'type': 'partial'|'final', 'text', 'time'} where time is the stream position
+    in seconds. Finals carry the raw recognizer text and, when a replacement produced special
+    keys, the action list. A pooled recognizer and a TextProcessor with other replacements
+    can be passed in. In 'command' mode finals also carry the matched voice command
+    (command_handler.match_command) without executing it.
+    """
+
+    def __init__(self, model, sample_rate, settings=None, mode='transcribe', partials=True, recognizer=None, processor=None):
+        self.settings = settings if settings is not None else StaticSettings()
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.partials = partials
+        self.decoder = StreamDecoder(model, sample_rate, recognizer)
+        self.processor = processor or TextProcessor.from_settings(self.settings)
+        self._samples = 0
+        self._last_partial = ''
+
+    @property
+    def position(self):
+        return self._samples / self.sample_rate
+
+    def feed(self, data):
+        """Decodes a block of 16-bit mono PCM; returns the resulting events (possibly none)."""
+        self._samples += len(data) // 2
+        kind, text = self.decoder.accept(data)
+        if kind == 'final':
+            self._last_partial = ''
+            return [self._final_event(text)] if text else []
+        if not self.partials or text == self._last_partial:
+            return []
+        self._last_partial = text
+        return [{'type': 'partial', 'text': self.processor.partial(text), 'time': round(self.position, 3)}]
+
+    def finish(self):
+        self._last_partial = ''
+        text = self.decoder.finish()
+        return [self._final_event(text)] if text else []
+
+    def _final_event(self, raw):
+        text, actions = self.processor.final(raw)
+        event = {'type': 'final', 'text': text.strip(), 'raw': raw, 'time': round(self.position, 3)}
+        if actions and any(act['type'] == 'key' for act in actions):
+            event['actions'] = actions
+        if self.mode == 'command':
+            from scribe.command_handler import match_command
+            event['command'] = match_command(text, self.settings, self.processor.lang)
+        return event
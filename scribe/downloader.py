@@ -0,0 +1,411 @@
+# downloader.py
+"""Resumable HTTP download engine used for model archives.
+
+Data is written to '<dest>.part' together with a small '<dest>.part.json' state file,
+so an interrupted download continues where it stopped. Servers that accept Range requests
+can be fetched in several parallel segments over one shared connection pool.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+logger = logging.getLogger(__name__)
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+TARGET_CHUNK_SECONDS = 0.25  # Adaptive chunk size aims at one read per this interval
+STATE_SAVE_INTERVAL = 1.0
+CANCEL_POLL_INTERVAL = 0.2  # Retry backoff checks for cancellation this often
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024  # Smaller files are not worth splitting
+
+
+class DownloadError(Exception):
+    pass
+
+
+class DownloadCancelledError(DownloadError):
+    pass
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Returns the process-wide requests.Session so all downloads reuse pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+
+class _Segment:
+    __slots__ = ('start', 'end', 'done')
+
+    def __init__(self, start, end, done=0):
+        self.start = start  # first byte (inclusive)
+        self.end = end      # last byte (inclusive)
+        self.done = done    # bytes already written from start
+
+    @property
+    def size(self):
+        return self.end - self.start + 1
+
+    @property
+    def complete(self):
+        return self.done >= self.size
+
+
+class Downloader:
+    """Downloads url to dest_path with resume, retries, optional segments and hashing.
+
+    progress_callback(downloaded, total) is called from worker threads.
+    expected_hashes: optional {'sha256': hex, 'md5': hex} verified after download.
+    tail_bytes: if the server accepts ranges, the last tail_bytes of the file are fetched
+    first (e.g. a zip central directory), so consumers can start reading early.
+    """
+
+    def __init__(
+        self,
+        url,
+        dest_path,
+        session=None,
+        segments=1,
+        expected_hashes=None,
+        retries=5,
+        timeout=(15, 60),
+        progress_callback=None,
+        is_cancelled=None,
+        tail_bytes=0
+    ):
+        self.url = url
+        self.dest_path = dest_path
+        self.part_path = dest_path + '.part'
+        self.state_path = dest_path + '.part.json'
+        self.session = session or get_http_session()
+        self.segments = max(1, int(segments))
+        self.expected_hashes = {k.lower(): v.lower() for k, v in (expected_hashes or {}).items() if v}
+        self.retries = retries
+        self.timeout = timeout
+        self.progress_callback = progress_callback
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.tail_bytes = tail_bytes
+        self.total = 0
+        self.ready = threading.Event()  # Set once the size and segment layout are known
+        self.hashes = {}
+        self._hashers = {name: hashlib.new(name) for name in (set(self.expected_hashes) | {'sha256'})}
+        self._hashed_upto = 0
+        self._segments = []
+        self._validator = ''
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._last_state_save = 0.0
+
+    # --- public API ---
+
+    def run(self):
+        """Performs the download and returns dest_path. Raises DownloadError on failure."""
+        self.download()
+        self.finalize()
+        return self.dest_path
+
+    def download(self):
+        """Transfers all data into the .part file without verifying or renaming it."""
+        total, accepts_ranges, validator = self._probe()
+        self.total = total
+        self._load_or_init_state(total, accepts_ranges, validator)
+        logger.info(
+            f"Downloading {self.url}: {total or 'unknown'} bytes, {len(self._segments)} segment(s), "
+            f"resuming from {self._downloaded()} bytes"
+        )
+        self.ready.set()
+        if len(self._segments) > 1:
+            self._run_segmented()
+        else:
+            self._run_single(accepts_ranges)
+
+    @property
+    def is_segmented(self):
+        """True if the .part file is preallocated and filled out of order."""
+        return len(self._segments) > 1
+
+    def is_range_available(self, start, end):
+        """Returns True if bytes start..end (inclusive) are already written to the .part file."""
+        with self._lock:
+            for seg in self._segments:
+                if seg.end < start or seg.start > end:
+                    continue
+                if seg.end < seg.start:
+                    # Open-ended segment of unknown size
+                    return end < seg.start + seg.done
+                if min(end, seg.end) >= seg.start + seg.done:
+                    return False
+            return bool(self._segments)
+
+    # --- setup ---
+
+    def _probe(self):
+        """Returns (total_size, accepts_ranges, validator) using a HEAD request."""
+        try:
+            resp = self.session.head(self.url, allow_redirects=True, timeout=self.timeout)
+            resp.raise_for_status()
+            total = int(resp.headers.get('Content-Length', 0) or 0)
+            accepts_ranges = resp.headers.get('Accept-Ranges', '').lower() == 'bytes'
+            validator = resp.headers.get('ETag') or resp.headers.get('Last-Modified') or ''
+            return total, accepts_ranges, validator
+        except requests.RequestException as e:
+            logger.warning(f"HEAD request failed, falling back to a plain download: {e}")
+            return 0, False, ''
+
+    def _load_or_init_state(self, total, accepts_ranges, validator):
+        state = None
+        if os.path.exists(self.state_path) and os.path.exists(self.part_path):
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except Exception:
+                state = None
+        if (
+            state
+            and accepts_ranges
+            and state.get('url') == self.url
+            and state.get('total') == total
+            and state.get('validator') == validator
+        ):
+            self._segments = [_Segment(*seg) for seg in state['segments']]
+            self._validator = validator
+            return
+        # Fresh start: split the file into segments if the server allows it
+        self._validator = validator
+        self._remove_partial()
+        count = self.segments if (accepts_ranges and total) else 1
+        count = max(1, min(count, total // MIN_SEGMENT_SIZE)) if total else 1
+        use_tail = bool(self.tail_bytes and accepts_ranges and total > self.tail_bytes * 2)
+        body_size = total - self.tail_bytes if use_tail else total
+        if total:
+            step = body_size // count
+            bounds = [i * step for i in range(count)] + [body_size]
+            self._segments = [_Segment(bounds[i], bounds[i + 1] - 1) for i in range(count)]
+            if use_tail:
+                self._segments.append(_Segment(body_size, total - 1))
+        else:
+            self._segments = [_Segment(0, -2)]  # Unknown size: a single open-ended segment
+        with open(self.part_path, 'wb') as f:
+            if len(self._segments) > 1:
+                f.truncate(total)
+        self._save_state(force=True)
+
+    def _remove_partial(self):
+        for path in (self.part_path, self.state_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _save_state(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_state_save < STATE_SAVE_INTERVAL:
+            return
+        self._last_state_save = now
+        with self._lock:
+            state = {
+                'url': self.url,
+                'total': self.total,
+                'validator': self._validator,
+                'segments': [[s.start, s.end, s.done] for s in self._segments],
+            }
+        with self._state_lock:
+            tmp_path = self.state_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+
+    # --- transfer ---
+
+    def _downloaded(self):
+        return sum(s.done for s in self._segments)
+
+    def _report_progress(self):
+        if self.progress_callback:
+            self.progress_callback(self._downloaded(), self.total)
+
+    def _check_cancelled(self):
+        if self.is_cancelled():
+            raise DownloadCancelledError('Download cancelled')
+
+    def _sleep(self, seconds):
+        """Sleeps for seconds, raising DownloadCancelledError as soon as the download is cancelled."""
+        deadline = time.monotonic() + seconds
+        while True:
+            self._check_cancelled()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(CANCEL_POLL_INTERVAL, remaining))
+
+    def _run_single(self, accepts_ranges):
+        seg = self._segments[0]
+        if seg.done and not accepts_ranges:
+            seg.done = 0
+        self._fetch_segment(seg, open_ended=(seg.end < seg.start), on_chunk=self._hash_sequential)
+
+    def _run_segmented(self):
+        errors = []
+        if self.tail_bytes and not self._segments[-1].complete:
+            self._fetch_segment(self._segments[-1])
+            self._report_progress()
+        with ThreadPoolExecutor(max_workers=len(self._segments), thread_name_prefix='scribe-download') as pool:
+            futures = [pool.submit(self._fetch_segment, seg) for seg in self._segments if not seg.complete]
+            while any(not f.done() for f in futures):
+                time.sleep(0.2)
+                # Hash the contiguous prefix that is already on disk while the rest is still downloading
+                self._hash_contiguous_prefix()
+                self._save_state()
+            for f in futures:
+                if f.exception():
+                    errors.append(f.exception())
+        self._save_state(force=True)
+        if errors:
+            raise errors[0]
+        self._hash_contiguous_prefix()
+
+    def _fetch_segment(self, seg, open_ended=False, on_chunk=None):
+        attempt = 0
+        while True:
+            self._check_cancelled()
+            if not open_ended and seg.complete:
+                return
+            headers = {'Accept-Encoding': 'identity'}
+            offset = seg.start + seg.done
+            if seg.done or len(self._segments) > 1:
+                headers['Range'] = f'bytes={offset}-' if open_ended else f'bytes={offset}-{seg.end}'
+            try:
+                with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as resp:
+                    resp.raise_for_status()
+                    if 'Range' in headers and resp.status_code != 206:
+                        if len(self._segments) > 1:
+                            raise DownloadError('Server ignored the Range request')
+                        # Server sent the whole file again: start this download over
+                        logger.warning('Server does not support resume, restarting download from zero')
+                        seg.done = 0
+                        self._reset_hashers()
+                    if open_ended and not self.total:
+                        self.total = int(resp.headers.get('Content-Length', 0) or 0)
+                    self._stream_to_file(resp, seg, on_chunk)
+                if open_ended or seg.complete:
+                    return
+                raise DownloadError('Connection closed before the segment was complete')
+            except DownloadCancelledError:
+                # Keep what was fetched so far: a resume truncates the .part file to the saved state
+                self._save_state(force=True)
+                raise
+            except (requests.RequestException, Urllib3Error, DownloadError, OSError) as e:
+                attempt += 1
+                self._save_state(force=True)
+                if attempt > self.retries:
+                    raise DownloadError(f'Download failed after {self.retries} retries: {e}') from e
+                delay = min(30, 2 ** attempt)
+                logger.warning(f"Download error ({e}), retry {attempt}/{self.retries} in {delay}s")
+                self._sleep(delay)
+
+    def _stream_to_file(self, resp, seg, on_chunk):
+        chunk_size = MIN_CHUNK_SIZE
+        with open(self.part_path, 'r+b', buffering=0) as f:
+            f.seek(seg.start + seg.done)
+            if len(self._segments) == 1:
+                # Drop bytes written after the last saved state; they are fetched again
+                f.truncate()
+            while True:
+                self._check_cancelled()
+                remaining = seg.size - seg.done if seg.end >= seg.start else chunk_size
+                if remaining <= 0:
+                    break
+                t0 = time.monotonic()
+                chunk = resp.raw.read(min(chunk_size, remaining), decode_content=True)
+                elapsed = time.monotonic() - t0
+                if not chunk:
+                    break
+                f.write(chunk)
+                if on_chunk:
+                    on_chunk(chunk)
+                with self._lock:
+                    seg.done += len(chunk)
+                # Adapt the read size to the connection speed
+                if elapsed < TARGET_CHUNK_SECONDS / 2:
+                    chunk_size = min(MAX_CHUNK_SIZE, chunk_size * 2)
+                elif elapsed > TARGET_CHUNK_SECONDS * 2:
+                    chunk_size = max(MIN_CHUNK_SIZE, chunk_size // 2)
+                self._report_progress()
+                if len(self._segments) == 1:
+                    self._save_state()
+
+    # --- hashing ---
+
+    def _reset_hashers(self):
+        self._hashers = {name: hashlib.new(name) for name in self._hashers}
+        self._hashed_upto = 0
+
+    def _hash_sequential(self, chunk):
+        if self._hashed_upto == 0 and self._segments[0].done:
+            # Resumed download: hash the part that was fetched during the previous run first
+            self._hash_file_range(0, self._segments[0].done)
+        for hasher in self._hashers.values():
+            hasher.update(chunk)
+        self._hashed_upto += len(chunk)
+
+    def _hash_contiguous_prefix(self):
+        with self._lock:
+            prefix = 0
+            for seg in self._segments:
+                prefix = seg.start + seg.done
+                if not seg.complete:
+                    break
+        if prefix > self._hashed_upto:
+            self._hash_file_range(self._hashed_upto, prefix)
+
+    def _hash_file_range(self, start, end):
+        with open(self.part_path, 'rb') as f:
+            f.seek(start)
+            pos = start
+            while pos < end:
+                block = f.read(min(MAX_CHUNK_SIZE, end - pos))
+                if not block:
+                    break
+                for hasher in self._hashers.values():
+                    hasher.update(block)
+                pos += len(block)
+        self._hashed_upto = pos
+
+    # --- completion ---
+
+    def finalize(self):
+        """Verifies size and hashes of the downloaded data and moves it to dest_path."""
+        size = os.path.getsize(self.part_path)
+        if self._hashed_upto < size:
+            self._hash_file_range(self._hashed_upto, size)
+        if self.total and size != self.total:
+            self._remove_partial()
+            raise DownloadError(f'Size mismatch: expected {self.total} bytes, got {size}')
+        self.hashes = {name: hasher.hexdigest() for name, hasher in self._hashers.items()}
+        for name, expected in self.expected_hashes.items():
+            if self.hashes.get(name) != expected:
+                self._remove_partial()
+                raise DownloadError(f'{name} mismatch: expected {expected}, got {self.hashes.get(name)}')
+        os.replace(self.part_path, self.dest_path)
+        try:
+            os.remove(self.state_path)
+        except FileNotFoundError:
+            pass
+        logger.info(f"Download complete: {self.dest_path} (sha256 {self.hashes.get('sha256')})")
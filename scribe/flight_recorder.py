@@ -0,0 +1,185 @@
+# flight_recorder.py
+"""Flight recorder: the last seconds of decoded audio and pipeline events, dumped on errors.
+
+Two preallocated ring buffers are filled while recognition runs: the PCM the recognition
+loop decoded (the current session only, cleared on start) and pipeline events (session
+start/stop with the settings the replay needs, mode switches, typed partials and finals,
+inserter commands, errors). Memory stays at seconds x sample rate x 2 bytes plus
+MAX_EVENTS small dicts.
+
+dump() writes a bundle folder to the flight_recordings folder in the app data folder:
+
+    audio.wav      16-bit mono PCM of the last seconds of the session
+    events.jsonl   a header line ({"type": "header", sample_rate, model_path, mode,
+                   blocksize, partial_interval, reason, ...}) and one line per event;
+                   audio_at is the event's position in audio.wav in seconds (negative
+                   for events before its first sample)
+
+The recognition loop dumps a bundle when it fails; the tray's Diagnostics menu dumps one
+on request. A bundle replays with the settings it was recorded with:
+
+    python -m scribe.cli replay <bundle folder>
+
+The audio may start mid-utterance when the buffer has wrapped, so the replayed text can
+differ at the start; the sequence that led to the error is what it reproduces.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import wave
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SECONDS = 30.0
+MAX_EVENTS = 2000
+MAX_BUNDLES = 10  # Older bundles are deleted when a new one is written
+FOLDER = 'flight_recordings'
+AUDIO_FILE = 'audio.wav'
+EVENTS_FILE = 'events.jsonl'
+
+
+def get_flight_recordings_path():
+    from scribe.utils import get_app_data_path
+
+    path = os.path.join(get_app_data_path(), FOLDER)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def read_bundle(path):
+    """Returns (wav path, header dict) of a bundle folder, or None if path is not one."""
+    events_path = os.path.join(path, EVENTS_FILE)
+    audio_path = os.path.join(path, AUDIO_FILE)
+    if not (os.path.isdir(path) and os.path.isfile(events_path) and os.path.isfile(audio_path)):
+        return None
+    with open(events_path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline() or '{}')
+    return audio_path, header if header.get('type') == 'header' else {}
+
+
+class FlightRecorder:
+    """Ring buffers of recent PCM and events; thread-safe, fixed memory once configured."""
+
+    def __init__(self, seconds=DEFAULT_SECONDS, sample_rate=16000, max_events=MAX_EVENTS, output_dir=None):
+        self.enabled = True
+        self.output_dir = output_dir
+        self._lock = threading.Lock()
+        self._events = [None] * max_events
+        self._event_count = 0
+        self._session = {}
+        self._seconds = 0.0
+        self.sample_rate = 0
+        self.configure(seconds, sample_rate)
+
+    def configure(self, seconds=None, sample_rate=None, enabled=None):
+        """Resizes the audio buffer (cleared if its size changes) and enables or disables recording."""
+        with self._lock:
+            if enabled is not None:
+                self.enabled = bool(enabled)
+            seconds = self._seconds if seconds is None else max(1.0, float(seconds))
+            sample_rate = self.sample_rate if sample_rate is None else int(sample_rate)
+            if (seconds, sample_rate) != (self._seconds, self.sample_rate):
+                self._seconds, self.sample_rate = seconds, sample_rate
+                self._audio = bytearray(int(seconds * sample_rate) * 2)
+                self._audio_write = 0  # Next byte to write
+                self._audio_filled = 0  # Valid bytes in the buffer
+                self._samples_total = 0  # Samples recorded since creation (event positions)
+            if not self.enabled:
+                self._audio_write = self._audio_filled = 0
+
+    def start_session(self, **session):
+        """Clears the audio of the previous session and records a 'start' event with session settings."""
+        sample_rate = session.get('sample_rate')
+        if sample_rate and sample_rate != self.sample_rate:
+            self.configure(sample_rate=sample_rate)
+        with self._lock:
+            self._session = dict(session)
+            self._audio_write = self._audio_filled = 0
+        self.event('start', **session)
+
+    def record_audio(self, data):
+        """Appends decoded 16-bit PCM; the oldest audio is overwritten when the buffer is full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            buffer, size = self._audio, len(self._audio)
+            self._samples_total += len(data) // 2
+            if len(data) >= size:
+                buffer[:] = data[len(data) - size:]
+                self._audio_write, self._audio_filled = 0, size
+                return
+            end = self._audio_write + len(data)
+            if end <= size:
+                buffer[self._audio_write:end] = data
+            else:
+                first = size - self._audio_write
+                buffer[self._audio_write:] = data[:first]
+                buffer[:end - size] = data[first:]
+            self._audio_write = end % size
+            self._audio_filled = min(size, self._audio_filled + len(data))
+
+    def event(self, kind, **fields):
+        """Records a pipeline event (fields must be JSON-serializable)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._events[self._event_count % len(self._events)] = (time.time(), self._samples_total, kind, fields)
+            self._event_count += 1
+
+    def _snapshot(self):
+        with self._lock:
+            size = len(self._audio)
+            if self._audio_filled < size:
+                audio = bytes(self._audio[:self._audio_filled])
+            else:
+                audio = bytes(self._audio[self._audio_write:]) + bytes(self._audio[:self._audio_write])
+            count = min(self._event_count, len(self._events))
+            start = self._event_count - count
+            events = [self._events[i % len(self._events)] for i in range(start, self._event_count)]
+            first_sample = self._samples_total - len(audio) // 2
+            return audio, events, first_sample, dict(self._session), self.sample_rate
+
+    def dump(self, reason, directory=None):
+        """Writes a bundle folder and returns its path, or None if there is nothing to write."""
+        audio, events, first_sample, session, sample_rate = self._snapshot()
+        if not audio and not events:
+            return None
+        parent = directory or self.output_dir or get_flight_recordings_path()
+        path = os.path.join(parent, time.strftime('flight_%Y%m%d_%H%M%S'))
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(parent, time.strftime('flight_%Y%m%d_%H%M%S') + f'_{suffix}')
+        try:
+            os.makedirs(path)
+            with wave.open(os.path.join(path, AUDIO_FILE), 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(sample_rate)
+                wav.writeframes(audio)
+            with open(os.path.join(path, EVENTS_FILE), 'w', encoding='utf-8') as f:
+                header = dict(session, type='header', reason=reason, created=time.strftime('%Y-%m-%dT%H:%M:%S'),
+                              sample_rate=sample_rate, audio_seconds=round(len(audio) / 2 / sample_rate, 3))
+                f.write(json.dumps(header, ensure_ascii=False) + '\n')
+                for created, samples, kind, fields in events:
+                    line = dict(fields, type='event', kind=kind, time=round(created, 3),
+                                audio_at=round((samples - first_sample) / sample_rate, 3))
+                    f.write(json.dumps(line, ensure_ascii=False, default=str) + '\n')
+        except OSError as e:
+            logger.error(f"Failed to write flight recording: {e}")
+            return None
+        logger.info(f"Flight recording ({reason}) written to {path}")
+        self._prune(parent)
+        return path
+
+    @staticmethod
+    def _prune(parent):
+        bundles = sorted(name for name in os.listdir(parent) if name.startswith('flight_'))
+        for name in bundles[:-MAX_BUNDLES]:
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+
+
+recorder = FlightRecorder()
@@ -45,6 +45,12 @@ class HotkeyManager(QObject):
         command_hotkey = modes.get('command_mode', 'Ctrl+Alt+Q')
         self._hotkey_refs['command'] = keyboard.add_hotkey(command_hotkey, self.controller.switch_to_command_mode)
         logger.info(f"Press {command_hotkey} for command mode.")
+        # Sampling profiler (diagnostics)
+        profiler_hotkey = modes.get('profiler', '')
+        if profiler_hotkey:
+            from scribe.profiler import profiler
+            self._hotkey_refs['profiler'] = keyboard.add_hotkey(profiler_hotkey, profiler.toggle)
+            logger.info(f"Press {profiler_hotkey} to start/stop profiling.")
 
         # Hotkeys for switching models
         models_dict = self.settings_manager.get('models', {})
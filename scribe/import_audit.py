@@ -0,0 +1,113 @@
+# import_audit.py
+"""Import-time audit: measures how long every module takes to import.
+
+Enabled by setting the SCRIBE_IMPORT_AUDIT environment variable; it is installed when the
+scribe package is first imported, so modules imported before that (PyQt5 in run.py) are not
+listed.
+
+For each module the report lists the cumulative time (including the modules it imported)
+and the self time. The report is logged and written to import_audit.txt in the app data
+folder when the process exits.
+"""
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = 'SCRIBE_IMPORT_AUDIT'
+REPORT_FILE = 'import_audit.txt'
+REPORT_TOP = 60  # Rows shown in the logged report
+
+_records = {}  # module name -> [cumulative seconds, self seconds, thread name]
+_local = threading.local()
+_lock = threading.Lock()
+_installed = False
+
+
+class _TimedLoader:
+    """Wraps a module loader and times exec_module, subtracting nested imports for self time."""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(0.0)  # Time spent in nested imports
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with _lock:
+                _records[module.__name__] = [elapsed, elapsed - nested, threading.current_thread().name]
+
+
+class _AuditFinder(MetaPathFinder):
+    """Delegates to the remaining finders and wraps the loader of every found spec."""
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader)
+                return spec
+        return None
+
+
+def install():
+    """Starts timing all subsequent imports; safe to call more than once."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    sys.meta_path.insert(0, _AuditFinder())
+    atexit.register(write_report)
+
+
+def install_from_env():
+    if os.environ.get(ENV_VAR, '').strip() not in ('', '0'):
+        install()
+
+
+def format_report(top=None):
+    """Returns the audit as text, slowest cumulative imports first."""
+    with _lock:
+        rows = sorted(_records.items(), key=lambda r: r[1][0], reverse=True)
+    total_self = sum(r[1][1] for r in rows)
+    lines = [f"Imported modules: {len(rows)}, total import time: {total_self * 1000:.0f} ms",
+             f"{'cumulative ms':>14} {'self ms':>9}  module [thread]"]
+    for name, (cumulative, own, thread) in rows[:top] if top else rows:
+        lines.append(f"{cumulative * 1000:14.1f} {own * 1000:9.1f}  {name} [{thread}]")
+    return '\n'.join(lines)
+
+
+def write_report():
+    if not _records:
+        return
+    logger.info("Import audit:\n" + format_report(REPORT_TOP))
+    try:
+        from scribe.utils import get_app_data_path
+        path = os.path.join(get_app_data_path(), REPORT_FILE)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(format_report() + '\n')
+    except OSError as e:
+        logger.warning(f"Failed to write import audit report: {e}")
@@ -9,6 +9,8 @@ import win32clipboard
 import win32con
 
 from scribe.inserters.text_inserter import TextInserter
+from scribe.logging_config import dump_trace, trace
+from scribe.watchdog import watchdog
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +19,9 @@ class ClipboardTextInserter(TextInserter):
         self.settings_manager = settings_manager
         self._orig_clipboard = None
         self._queue = queue.Queue()
-        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker = threading.Thread(target=self._worker_loop, name='scribe-clipboard-inserter', daemon=True)
         self._running = False
+        self._generation = 0  # A worker exits when it is no longer the current one
         self._update_settings(self.settings_manager.all())
         self.settings_manager.settings_changed.connect(self._update_settings)
 
@@ -45,41 +48,44 @@ class ClipboardTextInserter(TextInserter):
             logger.error(f"Failed to get buffer on startup: {e}")
         self._running = True
         if not self._worker.is_alive():
-            self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._worker = threading.Thread(target=self._worker_loop, args=(self._generation,), name='scribe-clipboard-inserter', daemon=True)
             self._worker.start()
 
+    def restart(self):
+        """Abandons a wedged worker and starts a new one on the same queue."""
+        logger.warning("Restarting the worker thread")
+        self._generation += 1
+        self._running = True
+        self._worker = threading.Thread(target=self._worker_loop, args=(self._generation,), name='scribe-clipboard-inserter', daemon=True)
+        self._worker.start()
+
     def stop(self):
         logger.info("stop() called")
         self._running = False
-        self._queue.put(('__STOP__', None))
+        self._queue.put(('__STOP__', None, None, 0.0))
         if self._worker.is_alive():
             self._worker.join(timeout=1)
 
     def insert_text(self, text: str):
-        logger.info(f"insert_text() called with text: {text!r}")
-        self._queue.put(('insert_text', text))
+        trace(logger, "insert_text(%r)", text)
+        self._enqueue('insert_text', text)
 
     def erase_chars(self, count: int):
-        logger.info(f"erase_chars() called with count: {count}")
-        self._queue.put(('erase_chars', count))
+        trace(logger, "erase_chars(%d)", count)
+        self._enqueue('erase_chars', count)
 
-    def _worker_loop(self):
-        while self._running:
+    def _worker_loop(self, generation=0):
+        while self._running and generation == self._generation:
             try:
-                cmd, arg = self._queue.get()
+                cmd, arg, trace_context, enqueued = self._queue.get()
                 if cmd == '__STOP__':
                     break
+                watchdog.begin('inserter')
+                started = time.perf_counter()
+                self._trace_started(trace_context, enqueued, started)
                 if cmd == 'insert_text':
                     # Сохраняем и вставляем через буфер обмена
-                    win32clipboard.OpenClipboard()
-                    win32clipboard.EmptyClipboard()
-                    win32clipboard.SetClipboardData(win32con.CF_UNICODETEXT, arg)
-                    win32clipboard.CloseClipboard()
-                    win32api.keybd_event(0x11, 0, 0, 0)  # Ctrl
-                    win32api.keybd_event(0x56, 0, 0, 0)  # V
-                    win32api.keybd_event(0x56, 0, 2, 0)  # V up
-                    win32api.keybd_event(0x11, 0, 2, 0)  # Ctrl up
-                    time.sleep(self.clipboard_delay * len(arg))
+                    self._paste(arg, generation)
                 elif cmd == 'insert_actions':
                     # Собираем итоговый текст с учётом спецклавиш
                     buf = ''
@@ -97,27 +103,43 @@ class ClipboardTextInserter(TextInserter):
                             elif key == 'Backspace':
                                 buf = buf[:-1] if buf else buf
                     # Вставляем итоговый буфер через буфер обмена
-                    win32clipboard.OpenClipboard()
-                    win32clipboard.EmptyClipboard()
-                    win32clipboard.SetClipboardData(win32con.CF_UNICODETEXT, buf)
-                    win32clipboard.CloseClipboard()
-                    win32api.keybd_event(0x11, 0, 0, 0)  # Ctrl
-                    win32api.keybd_event(0x56, 0, 0, 0)  # V
-                    win32api.keybd_event(0x56, 0, 2, 0)  # V up
-                    win32api.keybd_event(0x11, 0, 2, 0)  # Ctrl up
-                    time.sleep(self.clipboard_delay * len(buf))
+                    self._paste(buf, generation)
                 elif cmd == 'erase_chars':
                     for _ in range(arg):
+                        if generation != self._generation:
+                            break  # Abandoned by restart(): the new worker owns the input
                         win32api.keybd_event(0x08, 0, 0, 0)  # Backspace
                         win32api.keybd_event(0x08, 0, 2, 0)
                         time.sleep(0.01)
+                self._trace_finished(started)
             except Exception as e:
                 logger.error(f"{e}")
+                dump_trace("Text insertion failed")
+            finally:
+                # An abandoned worker must not clear the busy mark of its replacement
+                if generation == self._generation:
+                    watchdog.end('inserter')
+
+    def _paste(self, text, generation):
+        """Puts text on the clipboard and sends Ctrl+V, unless the worker was abandoned meanwhile."""
+        # Opening the clipboard is where a worker wedges (another program holds it)
+        win32clipboard.OpenClipboard()
+        if generation != self._generation:
+            win32clipboard.CloseClipboard()
+            return
+        win32clipboard.EmptyClipboard()
+        win32clipboard.SetClipboardData(win32con.CF_UNICODETEXT, text)
+        win32clipboard.CloseClipboard()
+        win32api.keybd_event(0x11, 0, 0, 0)  # Ctrl
+        win32api.keybd_event(0x56, 0, 0, 0)  # V
+        win32api.keybd_event(0x56, 0, 2, 0)  # V up
+        win32api.keybd_event(0x11, 0, 2, 0)  # Ctrl up
+        time.sleep(self.clipboard_delay * len(text))
 
     def insert_actions(self, actions: list):
         """Pastes a list of actions (text/key) via the clipboard, supporting special keys."""
-        logger.info(f"called with actions: {actions!r}")
-        self._queue.put(('insert_actions', actions))
+        trace(logger, "insert_actions(%r)", actions)
+        self._enqueue('insert_actions', actions)
 
     def wait_until_idle(self, timeout=2.0):
         """Waits until the command queue and worker thread are completely empty."""
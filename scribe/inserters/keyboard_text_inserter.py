@@ -7,6 +7,8 @@ import time
 import keyboard
 
 from scribe.inserters.text_inserter import TextInserter
+from scribe.logging_config import dump_trace, trace
+from scribe.watchdog import watchdog
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +16,9 @@ class KeyboardTextInserter(TextInserter):
     def __init__(self, settings_manager):
         self.settings_manager = settings_manager
         self._queue = queue.Queue()
-        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker = threading.Thread(target=self._worker_loop, name='scribe-keyboard-inserter', daemon=True)
         self._running = False
+        self._generation = 0  # A worker exits when it is no longer the current one
         self._update_settings(self.settings_manager.all())
         self.settings_manager.settings_changed.connect(self._update_settings)
 
@@ -29,53 +32,81 @@ class KeyboardTextInserter(TextInserter):
         logger.info("start() called")
         self._running = True
         if not self._worker.is_alive():
-            self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._worker = threading.Thread(target=self._worker_loop, args=(self._generation,), name='scribe-keyboard-inserter', daemon=True)
             self._worker.start()
 
+    def restart(self):
+        """Abandons a wedged worker and starts a new one on the same queue."""
+        logger.warning("Restarting the worker thread")
+        self._generation += 1
+        self._running = True
+        self._worker = threading.Thread(target=self._worker_loop, args=(self._generation,), name='scribe-keyboard-inserter', daemon=True)
+        self._worker.start()
+
     def stop(self):
         logger.info("stop() called")
         self._running = False
-        self._queue.put(('__STOP__', None))
+        self._queue.put(('__STOP__', None, None, 0.0))
         if self._worker.is_alive():
             self._worker.join(timeout=1)
 
 
     def insert_text(self, text: str):
-        logger.info(f"insert_text() called with text: {text!r}")
-        self._queue.put(('insert_text', text))
+        trace(logger, "insert_text(%r)", text)
+        self._enqueue('insert_text', text)
 
     def insert_actions(self, actions: list):
-        logger.info(f"insert_actions() called with actions: {actions!r}")
-        self._queue.put(('insert_actions', actions))
+        trace(logger, "insert_actions(%r)", actions)
+        self._enqueue('insert_actions', actions)
 
     def erase_chars(self, count: int):
-        logger.info(f"erase_chars() called with count: {count}")
-        self._queue.put(('erase_chars', count))
+        trace(logger, "erase_chars(%d)", count)
+        self._enqueue('erase_chars', count)
 
-    def _worker_loop(self):
-        while self._running:
+    def _worker_loop(self, generation=0):
+        while self._running and generation == self._generation:
             try:
-                cmd, arg = self._queue.get()
+                cmd, arg, trace_context, enqueued = self._queue.get()
                 if cmd == '__STOP__':
                     break
+                watchdog.begin('inserter')
+                started = time.perf_counter()
+                self._trace_started(trace_context, enqueued, started)
                 if cmd == 'insert_text':
-                    keyboard.write(arg, delay=self.key_delay)
-                    time.sleep(self.after_text_delay * len(arg))
+                    self._type(arg, generation)
                 elif cmd == 'insert_actions':
                     # Выполняем действия строго в том порядке, в котором они были переданы
                     for action in arg:
+                        if generation != self._generation:
+                            break  # Abandoned by restart(): the new worker owns the keyboard
                         if action['type'] == 'text' and action['value']:
-                            keyboard.write(action['value'], delay=self.key_delay)
-                            time.sleep(self.after_text_delay * len(action['value']))
+                            self._type(action['value'], generation)
                         elif action['type'] == 'key' and action['value']:
                             keyboard.send(action['value'])
                             time.sleep(self.key_delay)
                 elif cmd == 'erase_chars':
                     for _ in range(arg):
+                        if generation != self._generation:
+                            break
                         keyboard.send('backspace')
                         time.sleep(self.backspace_delay)
+                self._trace_finished(started)
             except Exception as e:
                 logger.error(f"{e}")
+                dump_trace("Text insertion failed")
+            finally:
+                # An abandoned worker must not clear the busy mark of its replacement
+                if generation == self._generation:
+                    watchdog.end('inserter')
+
+    def _type(self, text, generation):
+        """Types text like keyboard.write(text, delay=key_delay), stopping if the worker is abandoned."""
+        for char in text:
+            if generation != self._generation:
+                return
+            keyboard.write(char)
+            time.sleep(self.key_delay)
+        time.sleep(self.after_text_delay * len(text))
 
     def wait_until_idle(self, timeout=2.0):
         """Waits until the command queue and worker thread are completely empty."""
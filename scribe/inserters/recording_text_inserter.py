@@ -0,0 +1,124 @@
+# inserters/recording_text_inserter.py
+import time
+
+from scribe.inserters.text_inserter import TextInserter
+
+# Keys of special commands as they end up in a document
+KEY_TEXT = {'Space': ' ', 'Tab': '\t', 'Enter': '\n'}
+
+
+class RecordingTextInserter(TextInserter):
+    """Applies inserter commands to an in-memory document instead of the focused window.
+
+    Commands run synchronously on the caller's thread, so a replay is deterministic. Every
+    command is kept in operations as (cmd, arg) and counted: keystrokes are typed characters
+    and special keys, erases are Backspace presses. If clock is given, first_issued keeps
+    its value at the first command of each result kind ('partial', 'final').
+    """
+
+    def __init__(self, settings_manager=None, clock=None):
+        self.settings_manager = settings_manager
+        self.clock = clock
+        self.document = ''
+        self.operations = []
+        self.first_issued = {}
+        self.keystrokes = 0
+        self.erases = 0
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def wait_until_idle(self, timeout=2.0):
+        pass
+
+    def _begin(self, cmd, arg):
+        started = time.perf_counter()
+        trace_context = self.trace_context
+        self._trace_started(trace_context, started, started)
+        if self.clock is not None and trace_context is not None and trace_context['kind'] not in self.first_issued:
+            self.first_issued[trace_context['kind']] = self.clock()
+        self.operations.append((cmd, arg))
+        return started
+
+    def typing_seconds(self, inserter_type):
+        """Estimated time the real inserter of inserter_type would spend on operations.
+
+        Uses the delays the keyboard and clipboard inserters sleep between keystrokes and
+        pastes, read from settings_manager (their defaults if there is none).
+        """
+        settings = self.settings_manager
+        if inserter_type == 'clipboard':
+            cb = settings.get('clipboard_settings', {}) if settings is not None else {}
+            paste_delay = cb.get('clipboard_delay_ms', 10) / 1000.0
+            total = 0.0
+            for cmd, arg in self.operations:
+                if cmd == 'insert_text':
+                    total += paste_delay * len(arg)
+                elif cmd == 'insert_actions':
+                    total += paste_delay * len(self._actions_text(arg))
+                elif cmd == 'erase_chars':
+                    total += 0.01 * arg
+            return total
+        kb = settings.get('keyboard_settings', {}) if settings is not None else {}
+        key_delay = kb.get('key_delay_ms', 20) / 1000.0
+        after_text_delay = kb.get('after_text_delay_ms', 5) / 1000.0
+        backspace_delay = kb.get('backspace_delay_ms', 10) / 1000.0
+        total = 0.0
+        for cmd, arg in self.operations:
+            if cmd == 'insert_text':
+                total += (key_delay + after_text_delay) * len(arg)
+            elif cmd == 'insert_actions':
+                for action in arg:
+                    if action['type'] == 'text' and action['value']:
+                        total += (key_delay + after_text_delay) * len(action['value'])
+                    elif action['type'] == 'key' and action['value']:
+                        total += key_delay
+            elif cmd == 'erase_chars':
+                total += backspace_delay * arg
+        return total
+
+    @staticmethod
+    def _actions_text(actions):
+        text = ''
+        for action in actions:
+            if action['type'] == 'text' and action['value']:
+                text += action['value']
+            elif action['type'] == 'key' and action['value']:
+                if action['value'] == 'Backspace':
+                    text = text[:-1]
+                else:
+                    text += KEY_TEXT.get(action['value'], '')
+        return text
+
+    def insert_text(self, text: str):
+        started = self._begin('insert_text', text)
+        self.document += text
+        self.keystrokes += len(text)
+        self._trace_finished(started)
+
+    def insert_actions(self, actions: list):
+        started = self._begin('insert_actions', actions)
+        for action in actions:
+            if not action['value']:
+                continue
+            if action['type'] == 'text':
+                self.document += action['value']
+                self.keystrokes += len(action['value'])
+            elif action['type'] == 'key':
+                self.keystrokes += 1
+                if action['value'] == 'Backspace':
+                    self.document = self.document[:-1]
+                    self.erases += 1
+                else:
+                    self.document += KEY_TEXT.get(action['value'], '')
+        self._trace_finished(started)
+
+    def erase_chars(self, count: int):
+        started = self._begin('erase_chars', count)
+        if count > 0:
+            self.document = self.document[:max(0, len(self.document) - count)]
+            self.erases += count
+        self._trace_finished(started)
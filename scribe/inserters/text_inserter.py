@@ -1,8 +1,21 @@
 # inserters/text_inserter.py
+import time
 from abc import ABC, abstractmethod
 
+from scribe.flight_recorder import recorder
+from scribe.latency_tracer import tracer
+from scribe.metrics import registry
+
+INSERTER_COMMANDS = registry.counter('scribe_inserter_commands_total', "Commands queued for the text inserter")
+INSERTER_BACKLOG = registry.gauge('scribe_inserter_backlog', "Commands waiting in the active text inserter's queue")
+
 
 class TextInserter(ABC):
+    # Set by the recognizer before it queues the commands for a partial or final:
+    # {'origin': perf_counter stamp of the audio block, 'kind': 'partial'|'final'}.
+    # Copied into every queued command for latency tracing (see latency_tracer.py).
+    trace_context = None
+
     @abstractmethod
     def wait_until_idle(self, timeout=2.0):
         """By default, does nothing (for compatibility)."""
@@ -22,3 +35,23 @@ class TextInserter(ABC):
     @abstractmethod
     def erase_chars(self, count: int):
         pass
+
+    def _enqueue(self, cmd, arg):
+        """Queues a command as (cmd, arg, trace context, enqueue time)."""
+        self._queue.put((cmd, arg, self.trace_context, time.perf_counter()))
+        recorder.event('insert', cmd=cmd, arg=arg)
+        INSERTER_COMMANDS.inc()
+        # Sampled when the metrics are read; follows the inserter that queued last
+        INSERTER_BACKLOG.set_function(self._queue.qsize)
+
+    @staticmethod
+    def _trace_started(trace, enqueued, started):
+        """Records the queue wait and, once per result, the latency until its first keystroke."""
+        tracer.record('inserter_queue', started - enqueued)
+        if trace is not None and not trace.get('issued'):
+            trace['issued'] = True
+            tracer.record(f"e2e_{trace['kind']}", started - trace['origin'])
+
+    @staticmethod
+    def _trace_finished(started):
+        tracer.record('inject', time.perf_counter() - started)
@@ -0,0 +1,106 @@
+# latency_tracer.py
+"""Latency tracing from captured audio block to injected keystroke.
+
+Every audio block is stamped with time.perf_counter() in the audio callback. The stamp of
+the block that produced a partial or final travels with the text into the inserter queue,
+so each stage of the path can be timed:
+
+    queue           audio block waiting in the recognizer's audio queue
+    decode          KaldiRecognizer.AcceptWaveform
+    parse           reading the partial/final JSON
+    replacements    TextProcessor (replacements and special commands)
+    diff            computing the diff and queueing inserter commands
+    inserter_queue  command waiting in the inserter queue
+    inject          keystrokes or paste issued by the inserter worker
+    final_pass      two-pass decoding: the large model decoding one utterance
+    e2e_partial     audio block captured -> first keystroke of the partial issued
+    e2e_final       audio block captured -> first keystroke of the final issued
+
+Each stage keeps its last MAX_SAMPLES samples; stats() reports p50/p95/p99 over them and
+log_summary() writes the same table to the log (on every recognition stop). Every sample
+is also counted in the scribe_stage_seconds{stage=...} histogram of metrics.py, which is
+not reset between recognitions.
+"""
+import logging
+import math
+import threading
+from collections import deque
+
+from scribe.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+MAX_SAMPLES = 2048  # Per stage; older samples are dropped
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list (fraction in 0..1)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LatencyTracer:
+    """Thread-safe per-stage latency samples with percentile summaries."""
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.enabled = True
+        self._samples = {}  # stage -> deque of seconds
+        self._counts = {}  # stage -> samples recorded since reset (not only the kept ones)
+        self._histograms = {}  # stage -> metrics.Histogram
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        if not self.enabled or seconds < 0:
+            return
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.max_samples)
+                self._counts[stage] = 0
+            samples.append(seconds)
+            self._counts[stage] += 1
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = registry.histogram(
+                    'scribe_stage_seconds', "Time spent in each stage from audio block to keystroke (see latency_tracer.py)", stage=stage)
+        histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def stats(self):
+        """Returns {stage: {'count', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}} over the kept samples."""
+        with self._lock:
+            snapshot = {stage: (sorted(samples), self._counts[stage]) for stage, samples in self._samples.items()}
+        result = {}
+        for stage, (values, count) in snapshot.items():
+            result[stage] = {
+                'count': count,
+                'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+                'max_ms': round(values[-1] * 1000, 2) if values else 0.0,
+            }
+        return result
+
+    def format(self):
+        stats = self.stats()
+        if not stats:
+            return "  (no samples)"
+        lines = [f"  {'stage':<16} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        for stage in sorted(stats):
+            s = stats[stage]
+            lines.append(f"  {stage:<16} {s['count']:>7} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['max_ms']:>9.1f}")
+        return '\n'.join(lines)
+
+    def log_summary(self):
+        if self._samples:
+            logger.info("Recognition latency:\n" + self.format())
+
+
+tracer = LatencyTracer()
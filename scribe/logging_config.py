@@ -1,14 +1,102 @@
+# logging_config.py
+"""Logging setup and hot-path trace points.
+
+Records are handed to a QueueHandler and written by a QueueListener thread, so a thread
+that logs never waits for the console or the log file. Records cross the queue
+unformatted; the listener thread formats them.
+
+trace() is for code that runs per audio block or per partial: it keeps the event in an
+in-memory ring buffer of the last TRACE_EVENTS events (no formatting, no logging call)
+and logs it at DEBUG only if that level is enabled for the logger, with %-style arguments
+that are formatted later, on the listener thread. dump_trace() writes the buffer to the
+log when something fails, so the events leading up to an error are available without
+running at DEBUG level.
+"""
+import atexit
 import logging
+import queue
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = "[%(levelname)s] %(filename)s: %(message)s"
+TRACE_EVENTS = 1000  # Events kept in the ring buffer
+DUMP_INTERVAL = 5.0  # Seconds; errors in a burst dump the buffer once
+
+_listener = None
+_trace_events = deque(maxlen=TRACE_EVENTS)  # (time, thread name, logger name, message, args)
+_last_dump = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Passes records to the listener thread as they are; formatting happens there."""
+
+    def prepare(self, record):
+        return record
 
 
 def setup_logging(log_to_file=False, log_file_path="app.log", log_level="INFO"):
+    global _listener
     handlers = [logging.StreamHandler()]
     if log_to_file:
         handlers.append(logging.FileHandler(log_file_path, encoding="utf-8"))
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
     # Convert log_level string to logging constant
     level = getattr(logging, log_level.upper(), logging.INFO)
-    logging.basicConfig(
-        level=level,
-        format="[%(levelname)s] %(filename)s: %(message)s",
-        handlers=handlers
-    )
+
+    stop_logging()
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(records))
+    root.setLevel(level)
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Writes the records still queued and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def trace(log, message, *args):
+    """Hot-path trace point: recorded in the ring buffer, logged by log at DEBUG if enabled."""
+    _trace_events.append((time.time(), threading.current_thread().name, log.name, message, args))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(message, *args, stacklevel=2)
+
+
+def format_trace():
+    lines = []
+    for created, thread_name, log_name, message, args in list(_trace_events):
+        try:
+            text = message % args if args else message
+        except (TypeError, ValueError):
+            text = f"{message} {args!r}"
+        stamp = time.strftime('%H:%M:%S', time.localtime(created)) + f".{int(created * 1000) % 1000:03d}"
+        lines.append(f"  {stamp} [{thread_name}] {log_name}: {text}")
+    return '\n'.join(lines)
+
+
+def dump_trace(reason):
+    """Logs the recent trace events as an error; repeated calls within DUMP_INTERVAL are skipped."""
+    global _last_dump
+    now = time.monotonic()
+    if not _trace_events or (_last_dump is not None and now - _last_dump < DUMP_INTERVAL):
+        return
+    _last_dump = now
+    logger.error("%s; last %d trace events:\n%s", reason, len(_trace_events), format_trace())
@@ -0,0 +1,251 @@
+# metrics.py
+"""Pipeline metrics: counters, gauges and fixed-bucket histograms.
+
+Metrics are created once, usually at module level, and updated from the audio, decoder
+and inserter threads; an update is a lock and an addition. The shared registry can be
+read as a JSON-ready snapshot() or in the Prometheus text format (render()), and
+MetricsServer serves both on localhost:
+
+    GET /metrics       -> Prometheus text format
+    GET /metrics.json  -> snapshot()
+
+Names follow the Prometheus conventions: scribe_ prefix, base units (seconds), _total for
+counters. Labels are fixed per metric object: registry.counter(name, help, kind='final')
+returns the same object for the same name and labels.
+"""
+import bisect
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 9464
+# Seconds; covers per-block decode times as well as multi-second model loads
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in items) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing value (events, seconds of audio)."""
+
+    type = 'counter'
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def sample(self):
+        return {'labels': dict(self.labels), 'value': self.value}
+
+    def render(self, name):
+        return [f"{name}{_format_labels(self.labels)} {_format_value(self.value)}"]
+
+
+class Gauge(Counter):
+    """Value that goes up and down, or is read from a function when sampled."""
+
+    type = 'gauge'
+
+    def __init__(self, labels):
+        super().__init__(labels)
+        self._function = None
+
+    def set(self, value):
+        self.value = value
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """Samples function() instead of the stored value (e.g. a queue's qsize)."""
+        self._function = function
+
+    def get(self):
+        function = self._function
+        if function is None:
+            return self.value
+        try:
+            return function()
+        except Exception:
+            return self.value
+
+    def sample(self):
+        return {'labels': dict(self.labels), 'value': self.get()}
+
+    def render(self, name):
+        return [f"{name}{_format_labels(self.labels)} {_format_value(self.get())}"]
+
+
+class Histogram:
+    """Observations counted into fixed buckets, with their sum and count."""
+
+    type = 'histogram'
+
+    def __init__(self, labels, buckets=DEFAULT_BUCKETS):
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # The last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def _cumulative(self):
+        with self._lock:
+            counts, total, count = list(self._counts), self.sum, self.count
+        cumulative, running = [], 0
+        for index, bound in enumerate(self.buckets + (float('inf'),)):
+            running += counts[index]
+            cumulative.append((bound, running))
+        return cumulative, total, count
+
+    def sample(self):
+        cumulative, total, count = self._cumulative()
+        return {
+            'labels': dict(self.labels),
+            'count': count,
+            'sum': round(total, 6),
+            'buckets': {_format_value(bound): value for bound, value in cumulative},
+        }
+
+    def render(self, name):
+        cumulative, total, count = self._cumulative()
+        lines = [f"{name}_bucket{_format_labels(self.labels, ('le', _format_value(bound)))} {value}" for bound, value in cumulative]
+        lines.append(f"{name}_sum{_format_labels(self.labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(self.labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metric families; each family holds one metric object per label set."""
+
+    def __init__(self):
+        self._families = {}  # name -> (type, help, {labels: metric})
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labels, **kwargs):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = (cls.type, help_text, {})
+            elif family[0] != cls.type:
+                raise ValueError(f"Metric {name} is already registered as a {family[0]}")
+            metric = family[2].get(key)
+            if metric is None:
+                metric = family[2][key] = cls(key, **kwargs)
+            return metric
+
+    def counter(self, name, help_text='', **labels):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text='', **labels):
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text='', buckets=DEFAULT_BUCKETS, **labels):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def _families_copy(self):
+        with self._lock:
+            return [(name, kind, help_text, list(metrics.values())) for name, (kind, help_text, metrics) in sorted(self._families.items())]
+
+    def snapshot(self):
+        """Returns {name: {'type', 'help', 'samples': [...]}} with the current values."""
+        return {
+            name: {'type': kind, 'help': help_text, 'samples': [metric.sample() for metric in metrics]}
+            for name, kind, help_text, metrics in self._families_copy()
+        }
+
+    def render(self):
+        """Returns all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, kind, help_text, metrics in self._families_copy():
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for metric in metrics:
+                lines.extend(metric.render(name))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    server_version = 'ScribeMetrics/1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"[metrics] {self.address_string()} {format % args}")
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/metrics':
+            body, content_type = registry.render().encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        elif path == '/metrics.json':
+            body, content_type = json.dumps(registry.snapshot()).encode('utf-8'), 'application/json; charset=utf-8'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """Serves the shared registry over HTTP on localhost from a background thread."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self._httpd = None
+        self._thread = None
+
+    def start(self):
+        """Binds the socket and starts serving; returns the bound (host, port)."""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='scribe-metrics-server', daemon=True)
+        self._thread.start()
+        logger.info(f"[metrics] Serving http://{self.host}:{self.port}/metrics")
+        return self.host, self.port
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            logger.info("[metrics] Stopped")
@@ -0,0 +1,199 @@
+# model_catalog.py
+"""Vosk model catalog: on-disk cache with conditional revalidation and an indexed view."""
+import json
+import logging
+import os
+import threading
+import time
+
+from scribe.downloader import get_http_session
+from scribe.utils import get_app_data_path
+
+logger = logging.getLogger(__name__)
+
+VOSK_MODELS_JSON_URL = "https://raw.githubusercontent.com/AIgrator/VoskModels/refs/heads/main/vosk_models.json"
+CATALOG_CACHE_FILE = 'vosk_models.json'
+CATALOG_META_FILE = 'vosk_models.meta.json'
+CATALOG_MIRROR_FILE = 'vosk_models.json'  # Optional offline mirror placed in the models folder
+CATALOG_TTL = 24 * 60 * 60  # Seconds before the cached catalog is revalidated
+FETCH_TIMEOUT = (5, 20)
+
+
+class ModelCatalog(list):
+    """The catalog entries (a plain list, as before) plus an index by language."""
+
+    def __init__(self, entries=()):
+        super().__init__(entries)
+        self._by_language = {}
+        titles = {}
+        for m in self:
+            code = m.get('language')
+            if code == 'unknown':
+                continue
+            self._by_language.setdefault(code, []).append(m)
+            if code not in titles:
+                titles[code] = m.get('title') or code
+        self._languages = sorted(titles.items(), key=lambda x: x[1].lower())
+
+    def languages(self):
+        """Returns [(code, title), ...] sorted by title, excluding 'unknown'."""
+        return list(self._languages)
+
+    def models_for_language(self, lang):
+        return list(self._by_language.get(lang, []))
+
+
+def as_catalog(models_json):
+    """Wraps a raw catalog list in a ModelCatalog unless it already is one."""
+    return models_json if isinstance(models_json, ModelCatalog) else ModelCatalog(models_json or [])
+
+
+class CatalogCache:
+    """Keeps the model catalog in the app data folder and revalidates it with ETag/Last-Modified.
+
+    get() never waits for the network if any copy (cache or local mirror) exists; a stale
+    copy is returned immediately and refreshed in the background.
+    """
+
+    def __init__(self, cache_dir=None, url=VOSK_MODELS_JSON_URL, ttl=CATALOG_TTL, mirror_paths=None):
+        self.cache_dir = cache_dir or get_app_data_path()
+        self.url = url
+        self.ttl = ttl
+        self.mirror_paths = [p for p in (mirror_paths or []) if p]
+        self.cache_path = os.path.join(self.cache_dir, CATALOG_CACHE_FILE)
+        self.meta_path = os.path.join(self.cache_dir, CATALOG_META_FILE)
+        self._catalog = None
+        self._meta = {}
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+
+    def add_mirror_path(self, path):
+        """Registers a local catalog file used when there is no cache and the network is unavailable."""
+        with self._lock:
+            if path and path not in self.mirror_paths:
+                self.mirror_paths.append(path)
+
+    # --- disk ---
+
+    def _read_json(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_json(self, path, data):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _load_from_disk(self):
+        data = self._read_json(self.cache_path)
+        if isinstance(data, list):
+            self._catalog = ModelCatalog(data)
+            self._meta = self._read_json(self.meta_path) or {}
+            return True
+        for path in self.mirror_paths:
+            data = self._read_json(path)
+            if isinstance(data, list):
+                logger.info(f"Using local model catalog mirror: {path}")
+                self._catalog = ModelCatalog(data)
+                self._meta = {}
+                return True
+        return False
+
+    # --- public API ---
+
+    def is_stale(self):
+        return time.time() - self._meta.get('fetched_at', 0) > self.ttl
+
+    def get(self, force_refresh=False):
+        """Returns the ModelCatalog; fetches synchronously only if no local copy exists."""
+        with self._lock:
+            if self._catalog is None:
+                self._load_from_disk()
+            catalog = self._catalog
+        if catalog is None or force_refresh:
+            return self.refresh()
+        if self.is_stale():
+            self.refresh_async()
+        return catalog
+
+    def prefetch_async(self):
+        """Loads the local copy and revalidates it in the background if it is missing or stale."""
+        with self._lock:
+            if self._catalog is None:
+                self._load_from_disk()
+            needs_refresh = self._catalog is None or self.is_stale()
+        if needs_refresh:
+            self.refresh_async()
+
+    def refresh(self):
+        """Revalidates the catalog against the server and returns the current ModelCatalog."""
+        headers = {}
+        with self._lock:
+            has_cache = self._catalog is not None and self._meta.get('url') == self.url
+            if has_cache and self._meta.get('etag'):
+                headers['If-None-Match'] = self._meta['etag']
+            if has_cache and self._meta.get('last_modified'):
+                headers['If-Modified-Since'] = self._meta['last_modified']
+        response = get_http_session().get(self.url, headers=headers, timeout=FETCH_TIMEOUT)
+        if response.status_code == 304:
+            logger.debug("Model catalog not modified")
+            with self._lock:
+                self._meta['fetched_at'] = time.time()
+                self._save_meta()
+                return self._catalog
+        response.raise_for_status()
+        data = response.json()
+        if not isinstance(data, list):
+            raise ValueError('Unexpected model catalog format')
+        with self._lock:
+            self._catalog = ModelCatalog(data)
+            self._meta = {
+                'url': self.url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+            }
+            try:
+                self._write_json(self.cache_path, data)
+                self._save_meta()
+            except OSError as e:
+                logger.warning(f"Failed to write model catalog cache: {e}")
+            logger.info(f"Model catalog updated: {len(data)} models")
+            return self._catalog
+
+    def _save_meta(self):
+        try:
+            self._write_json(self.meta_path, self._meta)
+        except OSError as e:
+            logger.warning(f"Failed to write model catalog metadata: {e}")
+
+    def refresh_async(self):
+        """Starts a background revalidation unless one is already running."""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_quietly, name='scribe-catalog-refresh', daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Background model catalog refresh failed: {e}")
+
+
+_catalog_cache = None
+_catalog_cache_lock = threading.Lock()
+
+
+def get_catalog_cache():
+    """Returns the shared catalog cache stored in the app data folder."""
+    global _catalog_cache
+    with _catalog_cache_lock:
+        if _catalog_cache is None:
+            _catalog_cache = CatalogCache()
+        return _catalog_cache
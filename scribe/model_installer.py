@@ -0,0 +1,263 @@
+# model_installer.py
+"""Model archive installation: download and extraction run as one overlapped pipeline.
+
+The zip central directory is fetched first (see Downloader.tail_bytes). Every member is
+extracted by a worker pool as soon as all of its bytes are on disk, so installation time
+is bounded by the slower of download and decompression instead of their sum.
+"""
+import logging
+import os
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from scribe.downloader import DownloadCancelledError, Downloader, DownloadError
+
+logger = logging.getLogger(__name__)
+
+CENTRAL_DIRECTORY_BYTES = 1024 * 1024  # Tail of the archive fetched first; holds the zip central directory
+POLL_INTERVAL = 0.1
+
+
+def default_extract_workers():
+    return max(2, min(8, (os.cpu_count() or 2)))
+
+
+class _ZipReaders:
+    """One ZipFile handle per worker thread; ZipFile objects are not safe to share between threads."""
+
+    def __init__(self, zip_path):
+        self.zip_path = zip_path
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        zf = getattr(self._local, 'zf', None)
+        if zf is None:
+            zf = zipfile.ZipFile(self.zip_path, 'r')
+            self._local.zf = zf
+            with self._lock:
+                self._all.append(zf)
+        return zf
+
+    def close(self):
+        with self._lock:
+            for zf in self._all:
+                zf.close()
+            self._all.clear()
+
+
+def _top_level_names(infos):
+    names = set()
+    for info in infos:
+        first = info.filename.replace('\\', '/').lstrip('/').split('/', 1)[0]
+        if first and first not in ('.', '..'):
+            names.add(first)
+    return names
+
+
+def extract_zip_parallel(zip_path, extract_to, workers=None, is_cancelled=None, progress_callback=None):
+    """Extracts all members of zip_path into extract_to using a thread pool.
+
+    zlib decompression and file writes release the GIL, so members really decompress in parallel.
+    progress_callback(extracted_members, total_members) is called from worker threads.
+    """
+    os.makedirs(extract_to, exist_ok=True)
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        infos = zf.infolist()
+    readers = _ZipReaders(zip_path)
+    done = [0]
+    lock = threading.Lock()
+
+    def extract(info):
+        if is_cancelled and is_cancelled():
+            raise DownloadCancelledError('Extraction cancelled')
+        readers.get().extract(info, extract_to)
+        with lock:
+            done[0] += 1
+            count = done[0]
+        if progress_callback:
+            progress_callback(count, len(infos))
+
+    try:
+        # Largest members first, so the slowest one does not start last
+        ordered = sorted(infos, key=lambda i: i.file_size, reverse=True)
+        with ThreadPoolExecutor(max_workers=workers or default_extract_workers(), thread_name_prefix='scribe-extract') as pool:
+            for future in [pool.submit(extract, info) for info in ordered]:
+                future.result()
+    finally:
+        readers.close()
+
+
+class ModelInstaller:
+    """Downloads a model zip into lang_dir and extracts it while the download is running.
+
+    Falls back to download-then-extract (still parallel) when the server does not accept
+    Range requests or the central directory is not within the prefetched tail.
+    progress_callback(stage, done, total) is called with stage 'download' or 'extract'.
+    """
+
+    def __init__(
+        self,
+        url,
+        lang_dir,
+        segments=4,
+        expected_hashes=None,
+        workers=None,
+        progress_callback=None,
+        is_cancelled=None
+    ):
+        self.url = url
+        self.lang_dir = lang_dir
+        self.zip_path = os.path.join(lang_dir, os.path.basename(url))
+        self.workers = workers or default_extract_workers()
+        self.progress_callback = progress_callback
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.downloader = Downloader(
+            url,
+            self.zip_path,
+            segments=segments,
+            expected_hashes=expected_hashes,
+            progress_callback=self._on_download_progress,
+            is_cancelled=self.is_cancelled,
+            tail_bytes=CENTRAL_DIRECTORY_BYTES
+        )
+        self.installed_dirs = []
+        self._archive_dirs = set()
+        self._download_finished = threading.Event()
+        self._download_failed = False
+        self._streamed = False
+        self._stream_error = None
+        self._members_done = 0
+        self._members_total = 0
+        self._lock = threading.Lock()
+
+    def _report(self, stage, done, total):
+        if self.progress_callback:
+            self.progress_callback(stage, done, total)
+
+    def _on_download_progress(self, downloaded, total):
+        self._report('download', downloaded, total)
+
+    def _on_member_extracted(self):
+        with self._lock:
+            self._members_done += 1
+            done, total = self._members_done, self._members_total
+        if self._download_finished.is_set():
+            self._report('extract', done, total)
+
+    def run(self):
+        """Installs the model and returns the list of extracted top-level folders."""
+        os.makedirs(self.lang_dir, exist_ok=True)
+        existing = set(os.listdir(self.lang_dir))
+        extractor = threading.Thread(target=self._stream_extract, name='scribe-stream-extract', daemon=True)
+        extractor.start()
+        try:
+            try:
+                self.downloader.download()
+            except BaseException:
+                self._download_failed = True
+                raise
+            finally:
+                self._download_finished.set()
+                extractor.join()
+            if self._stream_error is not None:
+                raise self._stream_error
+            # Members are checked by their CRC on extraction; the whole archive by size and hash here
+            self.downloader.finalize()
+            if not self._streamed:
+                logger.info("Streaming extraction was not possible, extracting after download")
+                with zipfile.ZipFile(self.zip_path, 'r') as zf:
+                    self._archive_dirs = _top_level_names(zf.infolist())
+                self._report('extract', 0, 1)
+                extract_zip_parallel(
+                    self.zip_path,
+                    self.lang_dir,
+                    workers=self.workers,
+                    is_cancelled=self.is_cancelled,
+                    progress_callback=lambda done, total: self._report('extract', done, total)
+                )
+        except BaseException:
+            # Remove only what this installation created; the .part file is kept for resuming
+            for name in self._archive_dirs - existing:
+                shutil.rmtree(os.path.join(self.lang_dir, name), ignore_errors=True)
+            raise
+        try:
+            os.remove(self.zip_path)
+        except OSError as e:
+            logger.warning(f"Failed to remove model archive {self.zip_path}: {e}")
+        self.installed_dirs = sorted(self._archive_dirs)
+        return self.installed_dirs
+
+    def _read_central_directory(self):
+        """Waits for the archive tail and returns the member list, or None if streaming is impossible."""
+        while not self.downloader.ready.wait(POLL_INTERVAL):
+            if self._download_finished.is_set():
+                return None
+        if not self.downloader.is_segmented or not self.downloader.tail_bytes:
+            return None
+        total = self.downloader.total
+        while not self.downloader.is_range_available(total - CENTRAL_DIRECTORY_BYTES, total - 1):
+            if self._download_finished.wait(POLL_INTERVAL):
+                return None
+        try:
+            with zipfile.ZipFile(self.downloader.part_path, 'r') as zf:
+                infos = zf.infolist()
+                directory_start = getattr(zf, 'start_dir', None)
+        except (zipfile.BadZipFile, OSError) as e:
+            # The central directory is larger than the prefetched tail
+            logger.info(f"Cannot read the zip central directory early: {e}")
+            return None
+        if directory_start is None or directory_start < total - CENTRAL_DIRECTORY_BYTES:
+            return None
+        # A member's bytes span from its local header to the next member's header
+        infos.sort(key=lambda i: i.header_offset)
+        ranges = []
+        for idx, info in enumerate(infos):
+            end = infos[idx + 1].header_offset if idx + 1 < len(infos) else directory_start
+            ranges.append((info, info.header_offset, end - 1))
+        return ranges
+
+    def _stream_extract(self):
+        try:
+            ranges = self._read_central_directory()
+            if ranges is None:
+                return
+            self._streamed = True
+            self._archive_dirs = _top_level_names(info for info, _, _ in ranges)
+            self._members_total = len(ranges)
+            logger.info(f"Streaming extraction of {len(ranges)} archive members with {self.workers} workers")
+            readers = _ZipReaders(self.downloader.part_path)
+            pending = ranges
+            futures = []
+
+            def extract(info):
+                readers.get().extract(info, self.lang_dir)
+                self._on_member_extracted()
+
+            try:
+                with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scribe-extract') as pool:
+                    while pending:
+                        if self._download_failed or self.is_cancelled():
+                            break
+                        finished = self._download_finished.is_set()
+                        ready = [r for r in pending if self.downloader.is_range_available(r[1], r[2])]
+                        if ready:
+                            pending = [r for r in pending if r not in ready]
+                            futures.extend(pool.submit(extract, info) for info, _, _ in ready)
+                        elif finished:
+                            break
+                        else:
+                            self._download_finished.wait(POLL_INTERVAL)
+                    for future in futures:
+                        future.result()
+            finally:
+                readers.close()
+            if pending and not self._download_failed:
+                raise DownloadError(f'{len(pending)} archive members were not extracted')
+        except Exception as e:
+            if not self._download_failed:
+                logger.error(f"Streaming extraction failed: {e}")
+                self._stream_error = e
@@ -1,16 +1,17 @@
 # model_manager.py
 import locale
 import os
-import zipfile
 
-import requests
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QCheckBox, QDialog, QHBoxLayout, QLabel, QListWidget, QMessageBox, QProgressBar, QPushButton, QVBoxLayout, QWidget
 
+from scribe.downloader import Downloader
+from scribe.model_catalog import CATALOG_MIRROR_FILE, as_catalog, get_catalog_cache
+from scribe.model_installer import ModelInstaller, extract_zip_parallel
+from scribe.model_registry import get_model_registry
 from scribe.utils import resource_path
 
-VOSK_MODELS_JSON_URL = "https://raw.githubusercontent.com/AIgrator/VoskModels/refs/heads/main/vosk_models.json"
 
 class ExtractThread(QThread):
     finished = pyqtSignal(str)
@@ -23,10 +24,7 @@ class ExtractThread(QThread):
 
     def run(self):
         try:
-            if not os.path.exists(self.extract_to):
-                os.makedirs(self.extract_to)
-            with zipfile.ZipFile(self.zip_path, 'r') as zip_ref:
-                zip_ref.extractall(self.extract_to)
+            extract_zip_parallel(self.zip_path, self.extract_to)
             self.finished.emit(self.zip_path)
         except Exception as e:
             self.error.emit(str(e))
@@ -36,30 +34,74 @@ class DownloadThread(QThread):
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
 
-    def __init__(self, url, dest_path):
+    def __init__(self, url, dest_path, segments=1, expected_hashes=None):
         super().__init__()
         self.url = url
         self.dest_path = dest_path
+        self.segments = segments
+        self.expected_hashes = expected_hashes
+
+    def _on_progress(self, downloaded, total):
+        if total:
+            self.progress.emit(int(downloaded * 100 / total))
 
     def run(self):
         try:
-            with requests.get(self.url, stream=True) as response:
-                response.raise_for_status()  # выбросит исключение при ошибке (4xx/5xx)
+            # Resumes from '<dest>.part' if a previous attempt was interrupted
+            downloader = Downloader(
+                self.url,
+                self.dest_path,
+                segments=self.segments,
+                expected_hashes=self.expected_hashes,
+                progress_callback=self._on_progress,
+                is_cancelled=self.isInterruptionRequested
+            )
+            downloader.run()
+            self.finished.emit(self.dest_path)
 
-                total = int(response.headers.get('Content-Length', 0))
-                downloaded = 0
+        except Exception as e:
+            self.error.emit(str(e))
 
-                with open(self.dest_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            if total:
-                                percent = int(downloaded * 100 / total)
-                                self.progress.emit(percent)
 
-            self.finished.emit(self.dest_path)
+class InstallThread(QThread):
+    """Downloads a model archive and extracts it while it downloads (see ModelInstaller)."""
 
+    progress = pyqtSignal(int)
+    stage_changed = pyqtSignal(str)  # 'download' or 'extract'
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    def __init__(self, url, lang_dir, segments=4, expected_hashes=None):
+        super().__init__()
+        self.url = url
+        self.lang_dir = lang_dir
+        self.segments = segments
+        self.expected_hashes = expected_hashes
+        self._stage = None
+
+    def _on_progress(self, stage, done, total):
+        if stage != self._stage:
+            self._stage = stage
+            self.stage_changed.emit(stage)
+        if total:
+            self.progress.emit(int(done * 100 / total))
+
+    def run(self):
+        try:
+            installer = ModelInstaller(
+                self.url,
+                self.lang_dir,
+                segments=self.segments,
+                expected_hashes=self.expected_hashes,
+                progress_callback=self._on_progress,
+                is_cancelled=self.isInterruptionRequested
+            )
+            installed_dirs = installer.run()
+            # Index the new model in the worker thread, so its size is never computed on the UI thread
+            registry = get_model_registry(os.path.dirname(self.lang_dir))
+            for name in installed_dirs:
+                registry.register(os.path.basename(self.lang_dir), name)
+            self.finished.emit(installer.zip_path)
         except Exception as e:
             self.error.emit(str(e))
 
@@ -71,12 +113,12 @@ class ModelManager:
             os.makedirs(self.models_dir)
 
     def has_models(self):
-        # Check for at least one model (presence of am/final.mdl in subfolders)
-        for root, dirs, _files in os.walk(self.models_dir):
-            if 'am' in dirs:
-                if os.path.exists(os.path.join(root, 'am', 'final.mdl')):
-                    return True
-        return False
+        # Answered by the installed-model registry instead of walking the models tree
+        return get_model_registry(self.models_dir).has_models()
+
+    def get_newest_model(self, lang):
+        """Returns the name of the most recently installed model of a language, or None."""
+        return get_model_registry(self.models_dir).newest_model(lang)
 
     def get_system_language(self):
         lang, _ = locale.getdefaultlocale()
@@ -84,25 +126,19 @@ class ModelManager:
             return lang.split('_')[0]
         return 'en'
 
-    def fetch_models_json(self):
-        response = requests.get(VOSK_MODELS_JSON_URL)
-        response.raise_for_status()
-        return response.json()
+    def fetch_models_json(self, force_refresh=False):
+        # Served from the on-disk cache (or a vosk_models.json mirror in the models folder);
+        # the network is only awaited when there is no local copy at all
+        catalog_cache = get_catalog_cache()
+        catalog_cache.add_mirror_path(os.path.join(self.models_dir, CATALOG_MIRROR_FILE))
+        return catalog_cache.get(force_refresh=force_refresh)
 
     def get_languages(self, models_json):
-        # Collect unique (code, title) pairs for languages, excluding 'unknown'
-        lang_map = {}
-        for m in models_json:
-            code = m.get('language')
-            title = m.get('title') or code
-            if code != "unknown" and code not in lang_map:
-                lang_map[code] = title
-        # Return a list of tuples (code, title)
-        return sorted(lang_map.items(), key=lambda x: x[1].lower())
+        # List of tuples (code, title), excluding 'unknown'
+        return as_catalog(models_json).languages()
 
     def get_models_for_language(self, models_json, lang):
-        # Exclude 'unknown'
-        return [m for m in models_json if m['language'] == lang and m['language'] != "unknown"]
+        return as_catalog(models_json).models_for_language(lang)
 
     def ensure_language_folder(self, lang):
         lang_dir = os.path.join(self.models_dir, lang)
@@ -112,19 +148,13 @@ class ModelManager:
 
     @staticmethod
     def extract_zip(zip_path, extract_to):
-        # Explicitly create the folder for extraction if it doesn't exist
-        if not os.path.exists(extract_to):
-            os.makedirs(extract_to)
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+        # Creates the folder for extraction if it doesn't exist
+        extract_zip_parallel(zip_path, extract_to)
 
     @staticmethod
     def delete_model_folder(models_dir, lang, model_name):
         """Deletes the model folder by language and model name (only the model folder, not the language folder)."""
-        model_path = os.path.join(models_dir, lang, model_name)
-        if os.path.exists(model_path) and os.path.isdir(model_path):
-            import shutil
-            shutil.rmtree(model_path)
+        get_model_registry(models_dir).remove(lang, model_name)
 
 class ModelDownloadDialog(QDialog):
     def __init__(self, models_json, lang_models, models_dir, texts, settings_manager=None, parent=None):
@@ -271,50 +301,29 @@ class ModelDownloadDialog(QDialog):
             self.status_label.setText(self.texts['download_model_status_no_model'])
             return
         download_url = model['download_url']
-        zip_name = os.path.basename(download_url)
         lang = model['language']
         lang_dir = os.path.join(self.models_dir, lang)
         if not os.path.exists(lang_dir):
             os.makedirs(lang_dir)
-        zip_path = os.path.join(lang_dir, zip_name)
         self._downloaded_model_info = model  # Save info about the model being downloaded
-        from .model_manager import DownloadThread
-        self.thread = DownloadThread(download_url, zip_path)
+        segments = self.settings_manager.get('download_segments', 4) if self.settings_manager is not None else 4
+        expected_hashes = {algo: model[algo] for algo in ('sha256', 'md5') if model.get(algo)}
+        # Download and extraction overlap: members are unpacked as soon as their bytes arrive
+        self.thread = InstallThread(download_url, lang_dir, segments=segments, expected_hashes=expected_hashes)
         self.thread.progress.connect(self.progress.setValue)
-        self.thread.finished.connect(lambda path: self.on_download_finished(path, lang_dir, lang))
+        self.thread.stage_changed.connect(self.on_install_stage_changed)
+        self.thread.finished.connect(lambda path: self.on_extract_finished(path, lang_dir, lang))
         self.thread.error.connect(self.on_download_error)
         self.thread.start()
 
-    def on_download_finished(self, zip_path, lang_dir, lang):
-        import time
-        self.status_label.setText(self.texts['download_model_status_extracting'] + f"\n{zip_path}")
-        self.progress.setVisible(True)
-        self.progress.setRange(0, 0)
-        # Check for archive existence, wait if needed
-        attempts = 0
-        while not os.path.exists(zip_path) and attempts < 10:
-            time.sleep(0.2)
-            attempts += 1
-        if not os.path.exists(zip_path):
-            self.status_label.setText(self.texts['download_model_status_no_archive'] + f"\n{zip_path}")
-            self.progress.setVisible(False)
-            self.ok_button.setVisible(True)
-            return
-        self.status_label.setText(self.texts['download_model_status_extracting'])
-        self.status_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        # Start extraction in a separate thread
-        from .model_manager import ExtractThread
-        self.extract_thread = ExtractThread(zip_path, lang_dir)
-        self.extract_thread.finished.connect(lambda path: self.on_extract_finished(path, lang_dir, lang))
-        self.extract_thread.error.connect(self.on_extract_error)
-        self.extract_thread.start()
+    def on_install_stage_changed(self, stage):
+        if stage == 'extract':
+            self.status_label.setText(self.texts['download_model_status_extracting'])
+        else:
+            self.status_label.setText(self.texts['download_model_status_downloading'])
 
     def on_extract_finished(self, zip_path, lang_dir, lang):
-        import os
-        try:
-            os.remove(zip_path)
-        except Exception:
-            pass
+        # The installer has already removed the archive
         # Save info about the downloaded model in settings_manager
         if self.settings_manager is not None and hasattr(self, '_downloaded_model_info'):
             models_dict = self.settings_manager.get('models', {})
@@ -360,6 +369,14 @@ class ModelDownloadDialog(QDialog):
         self.progress.setVisible(False)
         self.ok_button.setVisible(True)
 
+    def reject(self):
+        # Stop a running download; the partial file is kept so the next attempt resumes it
+        thread = getattr(self, 'thread', None)
+        if isinstance(thread, QThread) and thread.isRunning():
+            thread.requestInterruption()
+            thread.wait(5000)
+        super().reject()
+
     def on_download_error(self, msg):
         self.status_label.setText(self.texts['download_model_status_error'] + f" {msg}")
         self.progress.setVisible(False)
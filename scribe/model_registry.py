@@ -0,0 +1,277 @@
+# model_registry.py
+"""Persistent index of installed Vosk models.
+
+Replaces walking the models tree on startup and on every settings change. The index lives
+in the app data folder (so writing it never touches the mtimes it validates against) and
+is revalidated with a handful of directory stats:
+
+- models_dir mtime       -> a language folder was added or removed
+- <lang> folder mtime    -> a model folder was added or removed in that language
+- <model> fingerprint    -> the model contents changed; its entry is recomputed. The
+                           fingerprint covers the model, am/ and conf/ folder mtimes and
+                           am/final.mdl, so files replaced or removed inside am/ or conf/
+                           are noticed too
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+from scribe.audio_utils import AudioUtils
+from scribe.utils import get_app_data_path, get_models_path
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_FILE = 'model_registry.json'
+MODEL_MARKER = os.path.join('am', 'final.mdl')  # A folder is a model if this file exists
+FINGERPRINT_DIRS = ('am', 'conf')  # Subfolders whose mtimes are part of the fingerprint
+DELETING_SUFFIX = '.deleting-'  # Model folders being removed are renamed with this suffix first
+REVALIDATE_INTERVAL = 1.0  # Seconds during which a revalidation result is reused
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _model_fingerprint(model_path):
+    """Cheap identity of an installed model, or None if it is not a model.
+
+    [folder mtime, am/ and conf/ mtimes, size and mtime of am/final.mdl]: a few stats.
+    """
+    try:
+        marker = os.stat(os.path.join(model_path, MODEL_MARKER))
+    except OSError:
+        return None
+    subdirs = [_mtime_ns(os.path.join(model_path, d)) for d in FINGERPRINT_DIRS]
+    return [_mtime_ns(model_path), *subdirs, marker.st_size, marker.st_mtime_ns]
+
+
+def _folder_size(path):
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class ModelRegistry:
+    """Index of the models installed under models_dir, keyed by '<language>/<model name>'."""
+
+    def __init__(self, models_dir, registry_path=None):
+        self.models_dir = os.path.abspath(models_dir)
+        self.registry_path = registry_path or os.path.join(get_app_data_path(), REGISTRY_FILE)
+        self._lock = threading.RLock()
+        self._models = {}
+        self._dir_mtimes = {}
+        self._last_validated = 0.0
+        self._load()
+
+    # --- persistence ---
+
+    def _load(self):
+        try:
+            with open(self.registry_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            root = data.get('roots', {}).get(self.models_dir, {})
+        except (OSError, ValueError, AttributeError):
+            root = {}
+        self._models = root.get('models', {})
+        self._dir_mtimes = root.get('dir_mtimes', {})
+
+    def _save(self):
+        """Writes the registry atomically; other models roots in the same file are preserved."""
+        try:
+            with open(self.registry_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data.get('roots'), dict):
+                data = {'roots': {}}
+        except (OSError, ValueError, AttributeError):
+            data = {'roots': {}}
+        data['roots'][self.models_dir] = {'models': self._models, 'dir_mtimes': self._dir_mtimes}
+        tmp_path = self.registry_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.registry_path)
+        except OSError as e:
+            logger.warning(f"Failed to save model registry: {e}")
+
+    # --- scanning ---
+
+    def _lang_dirs(self):
+        try:
+            return [d for d in os.listdir(self.models_dir) if os.path.isdir(os.path.join(self.models_dir, d))]
+        except OSError:
+            return []
+
+    def _make_entry(self, language, name):
+        path = os.path.join(self.models_dir, language, name)
+        fingerprint = _model_fingerprint(path)
+        if fingerprint is None:
+            return None
+        return {
+            'language': language,
+            'name': name,
+            'path': os.path.join(language, name),
+            'size': _folder_size(path),
+            'sample_rate': AudioUtils.detect_sample_rate(path),
+            'fingerprint': fingerprint,
+            'installed_at': fingerprint[0] / 1e9 if fingerprint[0] else time.time(),
+        }
+
+    def _scan_language(self, language):
+        """Syncs the entries of one language folder with its immediate subfolders."""
+        lang_dir = os.path.join(self.models_dir, language)
+        try:
+            names = {
+                d for d in os.listdir(lang_dir)
+                if os.path.isdir(os.path.join(lang_dir, d)) and DELETING_SUFFIX not in d
+            }
+        except OSError:
+            names = set()
+        for key in [k for k, m in self._models.items() if m['language'] == language and m['name'] not in names]:
+            del self._models[key]
+        for name in names:
+            key = f'{language}/{name}'
+            if key in self._models:
+                continue
+            entry = self._make_entry(language, name)
+            if entry is not None:
+                self._models[key] = entry
+        self._dir_mtimes[language] = _mtime_ns(lang_dir)
+
+    def revalidate(self, force=False):
+        """Brings the index in line with the disk using directory mtimes; rescans only what changed.
+
+        force also recomputes the entry of every model.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_validated < REVALIDATE_INTERVAL:
+                return
+            changed = False
+            root_mtime = _mtime_ns(self.models_dir)
+            if force or root_mtime != self._dir_mtimes.get(''):
+                languages = set(self._lang_dirs())
+                for language in set(self._dir_mtimes) - languages - {''}:
+                    self._dir_mtimes.pop(language, None)
+                for key in [k for k, m in self._models.items() if m['language'] not in languages]:
+                    del self._models[key]
+                self._dir_mtimes[''] = root_mtime
+                changed = True
+            else:
+                languages = set(self._dir_mtimes) - {''}
+            for language in languages:
+                lang_mtime = _mtime_ns(os.path.join(self.models_dir, language))
+                if force or lang_mtime != self._dir_mtimes.get(language):
+                    self._scan_language(language)
+                    changed = True
+            for key, entry in list(self._models.items()):
+                model_path = os.path.join(self.models_dir, entry['path'])
+                if not force and _model_fingerprint(model_path) == entry['fingerprint']:
+                    continue
+                fresh = self._make_entry(entry['language'], entry['name'])
+                if fresh is None:
+                    del self._models[key]
+                else:
+                    fresh['installed_at'] = entry.get('installed_at', fresh['installed_at'])
+                    self._models[key] = fresh
+                changed = True
+            self._last_validated = now
+            if changed:
+                self._save()
+
+    # --- transactional updates ---
+
+    def register(self, language, name):
+        """Adds (or refreshes) an installed model. Returns its entry, or None if the folder is not a model."""
+        with self._lock:
+            entry = self._make_entry(language, name)
+            key = f'{language}/{name}'
+            if entry is None:
+                self._models.pop(key, None)
+            else:
+                entry['installed_at'] = time.time()
+                self._models[key] = entry
+            self._dir_mtimes[''] = _mtime_ns(self.models_dir)
+            self._dir_mtimes[language] = _mtime_ns(os.path.join(self.models_dir, language))
+            self._save()
+            return entry
+
+    def remove(self, language, name):
+        """Deletes a model folder from disk and from the index.
+
+        The folder is first renamed aside, so the index never points at a half-deleted model.
+        """
+        with self._lock:
+            model_path = os.path.join(self.models_dir, language, name)
+            trash_path = None
+            if os.path.isdir(model_path):
+                trash_path = model_path + f'{DELETING_SUFFIX}{os.getpid()}'
+                os.replace(model_path, trash_path)
+            self._models.pop(f'{language}/{name}', None)
+            self._dir_mtimes[language] = _mtime_ns(os.path.join(self.models_dir, language))
+            self._save()
+        if trash_path:
+            shutil.rmtree(trash_path)
+
+    # --- queries ---
+
+    def models(self, language=None):
+        self.revalidate()
+        with self._lock:
+            return [dict(m) for m in self._models.values() if language is None or m['language'] == language]
+
+    def has_models(self):
+        return bool(self.models())
+
+    def get(self, language, name):
+        if not language or not name:
+            return None
+        self.revalidate()
+        with self._lock:
+            entry = self._models.get(f'{language}/{name}')
+            return dict(entry) if entry else None
+
+    def get_model_path(self, language, name):
+        entry = self.get(language, name)
+        return os.path.join(self.models_dir, entry['path']) if entry else None
+
+    def newest_model(self, language):
+        """Returns the name of the most recently installed model of a language, or None."""
+        models = self.models(language)
+        if not models:
+            return None
+        return max(models, key=lambda m: m.get('installed_at', 0))['name']
+
+    def get_sample_rate(self, model_path):
+        """Returns the registered sample rate of the model at model_path (read from disk if unknown)."""
+        model_path = os.path.abspath(model_path)
+        with self._lock:
+            for entry in self._models.values():
+                if os.path.join(self.models_dir, entry['path']) == model_path:
+                    return entry['sample_rate']
+        return AudioUtils.detect_sample_rate(model_path)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(models_dir=None):
+    """Returns the shared registry for models_dir (the default models folder if omitted)."""
+    models_dir = os.path.abspath(models_dir or get_models_path())
+    with _registries_lock:
+        registry = _registries.get(models_dir)
+        if registry is None:
+            registry = ModelRegistry(models_dir)
+            _registries[models_dir] = registry
+        return registry
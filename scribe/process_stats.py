@@ -0,0 +1,101 @@
+# process_stats.py
+"""Resource usage of the current process without extra dependencies.
+
+CPU time comes from os.times(); resident memory from /proc on Linux, the resource module
+on other POSIX systems and GetProcessMemoryInfo on Windows; open handles from the fd
+folder on POSIX and GetProcessHandleCount on Windows. Values that a platform cannot
+report are None.
+"""
+import os
+import sys
+import threading
+
+MB = 1024 * 1024
+
+
+def cpu_seconds():
+    """User + system CPU time of this process, all threads included."""
+    times = os.times()
+    return times.user + times.system
+
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    class _ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    def _memory_counters():
+        counters = _ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters
+
+    def rss_bytes():
+        counters = _memory_counters()
+        return counters.WorkingSetSize if counters else None
+
+    def peak_rss_bytes():
+        counters = _memory_counters()
+        return counters.PeakWorkingSetSize if counters else None
+
+    def open_handles():
+        """Kernel handles of the process: files, sockets, threads, events, ..."""
+        count = wintypes.DWORD()
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.kernel32.GetProcessHandleCount(process, ctypes.byref(count)):
+            return None
+        return count.value
+
+else:
+    import resource
+
+    def rss_bytes():
+        try:
+            with open('/proc/self/statm', 'r') as f:
+                return int(f.read().split()[1]) * resource.getpagesize()
+        except (OSError, ValueError, IndexError):
+            return None  # No /proc (macOS, BSD)
+
+    def peak_rss_bytes():
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    def open_handles():
+        """Open file descriptors of the process: files, sockets, pipes."""
+        for folder in ('/proc/self/fd', '/dev/fd'):
+            try:
+                return len(os.listdir(folder)) - 1  # Without the descriptor listdir opened
+            except OSError:
+                continue
+        return None
+
+
+def _mb(value):
+    return round(value / MB, 1) if value is not None else None
+
+
+def snapshot():
+    """Returns {'cpu_seconds', 'rss_mb', 'peak_rss_mb', 'handles', 'threads'} for this process."""
+    return {
+        'cpu_seconds': round(cpu_seconds(), 3),
+        'rss_mb': _mb(rss_bytes()),
+        'peak_rss_mb': _mb(peak_rss_bytes()),
+        'handles': open_handles(),
+        'threads': threading.active_count(),
+    }
@@ -0,0 +1,181 @@
+# profiler.py
+"""On-demand sampling profiler for diagnosing sluggishness on user machines.
+
+A background thread reads the stacks of every Python thread with sys._current_frames()
+every SAMPLE_INTERVAL seconds, for at most MAX_SECONDS. The recognition loop, the
+inserter workers, the Qt main thread, the model loader and the audio callback (while it
+runs Python code) all show up under their thread names. Sampling is wall-clock: threads
+waiting on a queue or lock are sampled too, in the frame where they wait.
+
+When sampling stops, two files are written to the profiles folder in the app data folder:
+
+    profile_<time>.collapsed  one 'thread;outer;...;inner count' line per stack, for
+                              flame graph tools (flamegraph.pl, speedscope)
+    profile_<time>.prof       pstats data (python -m pstats, snakeviz); call counts are
+                              sample counts and times are samples x interval
+
+Started and stopped from the tray menu (Diagnostics) or the profiler hotkey.
+"""
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = 0.01  # Seconds between samples (100 Hz)
+MAX_SECONDS = 30.0  # A profile stops by itself after this long
+MAX_DEPTH = 128  # Frames kept per stack, innermost first
+PROFILES_FOLDER = 'profiles'
+
+
+def get_profiles_path():
+    from scribe.utils import get_app_data_path
+
+    path = os.path.join(get_app_data_path(), PROFILES_FOLDER)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _short_path(filename):
+    parts = filename.replace('\\', '/').split('/')
+    return '/'.join(parts[-2:])
+
+
+class SamplingProfiler:
+    """Samples all thread stacks for a bounded time and writes collapsed-stack and pstats files."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL, max_seconds=MAX_SECONDS, output_dir=None):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.output_dir = output_dir
+        self.last_files = []
+        self._finished_callbacks = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def add_finished_callback(self, callback):
+        """callback(files) is called on the profiler thread with the paths written (empty on failure)."""
+        self._finished_callbacks.append(callback)
+
+    def start(self, seconds=None):
+        """Starts sampling for seconds (default max_seconds); returns False if already running."""
+        with self._lock:
+            if self.running:
+                return False
+            self._stop.clear()
+            duration = min(seconds or self.max_seconds, self.max_seconds)
+            self._thread = threading.Thread(target=self._run, args=(duration,), name='scribe-profiler', daemon=True)
+            self._thread.start()
+        logger.info(f"Profiling started for up to {duration:.0f} s")
+        return True
+
+    def stop(self):
+        """Stops sampling early; the files are written by the profiler thread."""
+        self._stop.set()
+
+    def toggle(self):
+        """Starts a profile, or stops the one running. Safe to call from any thread."""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def _run(self, duration):
+        own_id = threading.get_ident()
+        stacks = Counter()  # (thread name, (code keys outermost first)) -> samples
+        codes = {}  # code key -> (filename, first line, function name)
+        ticks = 0
+        started = time.perf_counter()
+        deadline = started + duration
+        while not self._stop.is_set() and time.perf_counter() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    code = frame.f_code
+                    key = id(code)
+                    if key not in codes:
+                        codes[key] = (code.co_filename, code.co_firstlineno, code.co_name)
+                    stack.append(key)
+                    frame = frame.f_back
+                stack.reverse()
+                stacks[(names.get(thread_id, f'thread-{thread_id}'), tuple(stack))] += 1
+            del frame
+            ticks += 1
+            self._stop.wait(self.interval)
+        elapsed = time.perf_counter() - started
+        files = []
+        try:
+            files = self._write(stacks, codes, elapsed / ticks if ticks else self.interval)
+            logger.info(f"Profile of {elapsed:.1f} s ({ticks} samples) written to {files[0]}")
+        except Exception as e:
+            logger.error(f"Failed to write the profile: {e}")
+        self.last_files = files
+        for callback in self._finished_callbacks:
+            try:
+                callback(files)
+            except Exception as e:
+                logger.error(f"Profiler callback failed: {e}")
+
+    def _write(self, stacks, codes, sample_seconds):
+        output_dir = self.output_dir or get_profiles_path()
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, time.strftime('profile_%Y%m%d_%H%M%S'))
+        collapsed_path, pstats_path = base + '.collapsed', base + '.prof'
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for (thread_name, stack), count in sorted(stacks.items(), key=lambda item: -item[1]):
+                frames = [thread_name.replace(';', ':')]
+                frames.extend(f"{codes[key][2]} ({_short_path(codes[key][0])}:{codes[key][1]})" for key in stack)
+                f.write(f"{';'.join(frames)} {count}\n")
+        with open(pstats_path, 'wb') as f:
+            marshal.dump(self._pstats(stacks, codes, sample_seconds), f)
+        return [collapsed_path, pstats_path]
+
+    @staticmethod
+    def _pstats(stacks, codes, sample_seconds):
+        """Builds the dict pstats.Stats loads: {func: (cc, nc, tt, ct, {caller: (cc, nc, tt, ct)})}."""
+        stats = {}
+
+        def entry(func):
+            if func not in stats:
+                stats[func] = [0, 0, 0.0, 0.0, {}]
+            return stats[func]
+
+        for (thread_name, stack), count in stacks.items():
+            # Each thread is a root function, so pstats shows time per thread
+            funcs = [('~', 0, f'<thread {thread_name}>')] + [codes[key] for key in stack]
+            seconds = count * sample_seconds
+            seen = set()
+            for index, func in enumerate(funcs):
+                item = entry(func)
+                is_leaf = index == len(funcs) - 1
+                if func not in seen:  # Recursion counts once per sample
+                    seen.add(func)
+                    item[0] += count
+                    item[1] += count
+                    item[3] += seconds
+                if is_leaf:
+                    item[2] += seconds
+                if index:
+                    caller = item[4].setdefault(funcs[index - 1], [0, 0, 0.0, 0.0])
+                    caller[0] += count
+                    caller[1] += count
+                    caller[2] += seconds if is_leaf else 0.0
+                    caller[3] += seconds
+        return {func: (cc, nc, tt, ct, {caller: tuple(values) for caller, values in callers.items()})
+                for func, (cc, nc, tt, ct, callers) in stats.items()}
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,392 @@
+# recognition_server.py
+"""Local recognition server: one resident vosk.Model shared by many clients.
+
+Plain HTTP/1.1 on localhost (no extra dependencies):
+
+    POST /v1/recognize?rate=16000&mode=transcribe&partials=1&lang=en
+        Request body: raw 16-bit mono PCM, streamed (chunked) or with Content-Length.
+        Response: application/x-ndjson, streamed as audio is decoded. A 'session' event
+        comes first, then partial/final events (see decoder.HeadlessSession), then an
+        'end' event with the session metrics.
+        Replacements: the settings' list for 'lang' (default: the recognition language);
+        'replacements=0' disables them, and an X-Scribe-Replacements header with a JSON
+        list of {"find", "replace"} items replaces them for this client.
+    GET /v1/metrics   -> server and recent session metrics (JSON)
+    GET /v1/health    -> {"status": "ok", ...}
+
+Each connection reads, decodes and answers in lockstep on its own thread, so a client that
+sends faster than it can be decoded is slowed down by TCP flow control (backpressure).
+At most max_sessions streams are decoded at once; further requests wait up to
+queue_timeout seconds and are then rejected with 503. KaldiRecognizers are pooled and
+Reset() between sessions instead of being rebuilt.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from scribe.audio_utils import AudioUtils
+from scribe.decoder import HeadlessSession, StaticSettings, TextProcessor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 2700
+DEFAULT_MAX_SESSIONS = 4
+QUEUE_TIMEOUT = 2.0  # Seconds a request waits for a free session slot before 503
+IDLE_TIMEOUT = 30.0  # Seconds without data before a connection is dropped
+BLOCK_SECONDS = 0.25  # Audio accumulated before each decoder step
+RECENT_SESSIONS = 20  # Finished sessions kept for /v1/metrics
+
+
+class RecognizerPool:
+    """Idle KaldiRecognizers for one model, reused across sessions."""
+
+    def __init__(self, model, sample_rate, max_idle):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self.created += 1
+        import vosk
+        return vosk.KaldiRecognizer(self.model, self.sample_rate)
+
+    def release(self, recognizer):
+        try:
+            recognizer.Reset()
+        except Exception:
+            return  # Not reusable; let it be collected
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(recognizer)
+
+    @property
+    def idle(self):
+        with self._lock:
+            return len(self._idle)
+
+
+class SessionMetrics:
+    """Counters of one client stream."""
+
+    def __init__(self, session_id, client):
+        self.id = session_id
+        self.client = client
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.bytes_in = 0
+        self.audio_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.write_seconds = 0.0  # Time blocked sending events to a slow reader
+        self.partials = 0
+        self.finals = 0
+        self.first_partial_latency = None
+        self.wall_seconds = None
+        self.error = None
+
+    def as_dict(self):
+        wall = self.wall_seconds if self.wall_seconds is not None else time.perf_counter() - self._start
+        return {
+            'id': self.id,
+            'client': self.client,
+            'started': round(self.started, 3),
+            'bytes_in': self.bytes_in,
+            'audio_seconds': round(self.audio_seconds, 3),
+            'decode_seconds': round(self.decode_seconds, 3),
+            'write_seconds': round(self.write_seconds, 3),
+            'wall_seconds': round(wall, 3),
+            'rtf': round(self.decode_seconds / self.audio_seconds, 4) if self.audio_seconds else None,
+            'partials': self.partials,
+            'finals': self.finals,
+            'first_partial_latency': round(self.first_partial_latency, 3) if self.first_partial_latency is not None else None,
+            'error': self.error,
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = IDLE_TIMEOUT
+    server_version = 'ScribeRecognition/1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"[server] {self.address_string()} {format % args}")
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.command == 'POST' and status >= 400:
+            # The unread request body would be parsed as the next request
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/v1/metrics':
+            self._send_json(200, self.server.owner.metrics())
+        elif path == '/v1/health':
+            owner = self.server.owner
+            self._send_json(200, {'status': 'ok' if owner.model is not None else 'no_model', 'model': owner.model_path})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/v1/recognize':
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            self.server.owner.handle_stream(self, parse_qs(url.query))
+        except OSError as e:
+            # Disconnects and idle timeouts (socket.timeout is an OSError on every Python version)
+            logger.info(f"[server] Client {self.address_string()} disconnected: {e}")
+            self.close_connection = True
+
+    # --- request body ---
+
+    def iter_body(self):
+        """Yields the request body as it arrives (chunked or Content-Length)."""
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    # Trailer section ends with an empty line
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    return
+                data = self.rfile.read(size)
+                self.rfile.readline()
+                if len(data) < size:
+                    raise ConnectionError("request body ended early")
+                yield data
+        else:
+            remaining = int(self.headers.get('Content-Length', 0))
+            while remaining > 0:
+                data = self.rfile.read1(min(remaining, 65536))
+                if not data:
+                    raise ConnectionError("request body ended early")
+                remaining -= len(data)
+                yield data
+
+    # --- streamed response ---
+
+    def start_stream(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+
+    def write_event(self, event):
+        data = (json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8')
+        self.wfile.write(f'{len(data):X}\r\n'.encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+    def end_stream(self):
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+
+class RecognitionServer:
+    """Serves the recognition pipeline of one loaded model over HTTP on localhost."""
+
+    def __init__(self, model=None, sample_rate=16000, model_path=None, settings=None,
+                 host=DEFAULT_HOST, port=DEFAULT_PORT, max_sessions=DEFAULT_MAX_SESSIONS, queue_timeout=QUEUE_TIMEOUT):
+        self.settings = settings if settings is not None else StaticSettings()
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.queue_timeout = queue_timeout
+        self.model = None
+        self.model_path = None
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self._lock = threading.Lock()
+        self._active = {}  # session id -> SessionMetrics
+        self._recent = deque(maxlen=RECENT_SESSIONS)
+        self._totals = {'sessions': 0, 'rejected': 0, 'failed': 0, 'audio_seconds': 0.0, 'decode_seconds': 0.0}
+        self._started = time.time()
+        self._httpd = None
+        self._thread = None
+        if model is not None:
+            self.set_model(model, sample_rate, model_path)
+
+    def set_model(self, model, sample_rate, model_path=None):
+        """Switches to another loaded model; running sessions finish on the previous one."""
+        with self._lock:
+            self.model = model
+            self.model_path = model_path
+            self._pool = RecognizerPool(model, sample_rate, self.max_sessions)
+        logger.info(f"[server] Serving model {model_path} ({sample_rate} Hz)")
+
+    # --- lifecycle ---
+
+    def start(self):
+        """Binds the socket and serves on a background thread; returns the bound (host, port)."""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='scribe-recognition-server', daemon=True)
+        self._thread.start()
+        logger.info(f"[server] Listening on http://{self.host}:{self.port}/v1/recognize (max {self.max_sessions} sessions)")
+        return self.host, self.port
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while self._thread.is_alive():
+                self._thread.join(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            logger.info("[server] Stopped")
+
+    # --- sessions ---
+
+    def _processor_for(self, handler, query):
+        header = handler.headers.get('X-Scribe-Replacements')
+        if header:
+            replacements = json.loads(header)
+            if not isinstance(replacements, list):
+                raise ValueError("X-Scribe-Replacements must be a JSON list")
+            return TextProcessor(replacements)
+        if query.get('replacements', ['1'])[0] == '0':
+            return TextProcessor(enabled=False, partial_enabled=False)
+        lang = query.get('lang', [None])[0]
+        processor = TextProcessor.from_settings(self.settings)
+        if lang and lang != processor.lang:
+            processor.replacements = self.settings.get('replaces', {}).get(lang, [])
+            processor.lang = lang
+        return processor
+
+    def handle_stream(self, handler, query):
+        with self._lock:
+            pool = self._pool
+        if pool is None:
+            handler._send_json(503, {'error': 'no model loaded'}, {'Retry-After': '5'})
+            return
+        try:
+            processor = self._processor_for(handler, query)
+            input_rate = int(query.get('rate', [pool.sample_rate])[0])
+            mode = query.get('mode', ['transcribe'])[0]
+            partials = query.get('partials', ['1'])[0] != '0'
+            if mode not in ('transcribe', 'command') or input_rate <= 0:
+                raise ValueError("invalid mode or rate")
+        except ValueError as e:
+            handler._send_json(400, {'error': str(e)})
+            return
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._totals['rejected'] += 1
+            handler._send_json(503, {'error': 'too many sessions'}, {'Retry-After': '1'})
+            return
+        recognizer = None
+        streaming = False
+        metrics = SessionMetrics(uuid.uuid4().hex[:12], handler.address_string())
+        with self._lock:
+            self._active[metrics.id] = metrics
+            self._totals['sessions'] += 1
+        try:
+            recognizer = pool.acquire()
+            session = HeadlessSession(pool.model, pool.sample_rate, self.settings, mode=mode, partials=partials,
+                                      recognizer=recognizer, processor=processor)
+            handler.start_stream()
+            streaming = True
+            handler.write_event({'type': 'session', 'id': metrics.id, 'sample_rate': pool.sample_rate, 'model': self.model_path})
+            self._run_session(handler, session, metrics, input_rate)
+            handler.end_stream()
+        except Exception as e:
+            metrics.error = str(e)
+            with self._lock:
+                self._totals['failed'] += 1
+            if isinstance(e, OSError) or not streaming:
+                raise
+            logger.error(f"[server] Session {metrics.id} failed: {e}")
+            handler.write_event({'type': 'error', 'error': str(e)})
+            handler.end_stream()
+        finally:
+            metrics.wall_seconds = time.perf_counter() - metrics._start
+            if recognizer is not None:
+                pool.release(recognizer)
+            self._slots.release()
+            with self._lock:
+                self._active.pop(metrics.id, None)
+                self._recent.append(metrics.as_dict())
+                self._totals['audio_seconds'] += metrics.audio_seconds
+                self._totals['decode_seconds'] += metrics.decode_seconds
+
+    def _run_session(self, handler, session, metrics, input_rate):
+        block_bytes = max(2, int(input_rate * BLOCK_SECONDS) * 2)
+        buffer = b''
+
+        def decode(data):
+            if input_rate != session.sample_rate:
+                data = AudioUtils.resample_audio(data, input_rate, session.sample_rate)
+            started = time.perf_counter()
+            events = session.feed(data) if data else []
+            metrics.decode_seconds += time.perf_counter() - started
+            metrics.audio_seconds = session.position
+            send(events)
+
+        def send(events):
+            started = time.perf_counter()
+            for event in events:
+                if event['type'] == 'partial':
+                    metrics.partials += 1
+                    if metrics.first_partial_latency is None:
+                        metrics.first_partial_latency = time.perf_counter() - metrics._start
+                else:
+                    metrics.finals += 1
+                handler.write_event(event)
+            metrics.write_seconds += time.perf_counter() - started
+
+        for chunk in handler.iter_body():
+            metrics.bytes_in += len(chunk)
+            buffer += chunk
+            while len(buffer) >= block_bytes:
+                decode(buffer[:block_bytes])
+                buffer = buffer[block_bytes:]
+        decode(buffer[:len(buffer) // 2 * 2])
+        started = time.perf_counter()
+        events = session.finish()
+        metrics.decode_seconds += time.perf_counter() - started
+        send(events)
+        handler.write_event(dict({'type': 'end'}, **metrics.as_dict()))
+
+    def metrics(self):
+        with self._lock:
+            pool = self._pool
+            return {
+                'model': self.model_path,
+                'uptime_seconds': round(time.time() - self._started, 1),
+                'max_sessions': self.max_sessions,
+                'active_sessions': [m.as_dict() for m in self._active.values()],
+                'totals': {k: round(v, 3) if isinstance(v, float) else v for k, v in self._totals.items()},
+                'pool': {'created': pool.created, 'idle': pool.idle} if pool else None,
+                'recent_sessions': list(self._recent),
+            }
@@ -0,0 +1,176 @@
+# replay.py
+"""Deterministic replay of WAV files through VoskRecognizer.
+
+The real pipeline (VoskRecognizer with its audio queue, partial throttling, diff insertion,
+replacements and two-pass decoding) runs unchanged, with two stand-ins:
+
+- WavStream replaces sounddevice.RawInputStream and plays a WAV file into the audio
+  callback in blocks of the configured blocksize, either as fast as possible or paced at
+  a multiple of real time;
+- RecordingTextInserter (inserters/recording_text_inserter.py) applies the inserter
+  commands to an in-memory document and counts keystrokes and erases.
+
+Each block is fed only after the recognizer has processed the previous one (lockstep), and
+the partial throttle runs on the replayed audio position instead of the wall clock, so the
+same file, model and settings always give the same document and counts. With two-pass
+decoding the moment the large model's text is committed still depends on timing; the
+final document does not.
+"""
+import logging
+import threading
+import time
+
+from scribe.audio_utils import AudioUtils
+from scribe.decoder import StaticSettings
+from scribe.inserters.recording_text_inserter import RecordingTextInserter
+from scribe.latency_tracer import tracer
+
+logger = logging.getLogger(__name__)
+
+TAIL_SILENCE_SECONDS = 1.0  # Appended to the recording so the last utterance reaches an endpoint
+
+
+class WavStream:
+    """Stand-in for sounddevice.RawInputStream that plays 16-bit mono PCM into callback.
+
+    source is a WAV path or raw PCM bytes at samplerate. speed 0 feeds blocks as fast as
+    the recognizer takes them, 1.0 in real time, 2.0 twice as fast. lockstep, if given, is
+    called after every block and should return once the block has been processed.
+    """
+
+    def __init__(self, source, samplerate, blocksize, callback, speed=0.0, lockstep=None,
+                 tail_silence=TAIL_SILENCE_SECONDS, **_kwargs):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.callback = callback
+        self.speed = speed
+        self.lockstep = lockstep
+        if isinstance(source, (bytes, bytearray)):
+            pcm = bytes(source)
+        else:
+            pcm = b''.join(AudioUtils.iter_wav_blocks(source, samplerate, 1.0))
+        self._pcm = pcm + b'\0' * (int(samplerate * tail_silence) * 2)
+        self.audio_seconds = len(self._pcm) // 2 / samplerate
+        self.position = 0.0  # Seconds of audio delivered so far
+        self.processing_seconds = 0.0  # Time spent in the callback and waiting for lockstep
+        self.finished = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def clock(self):
+        """The replay clock: seconds of audio delivered, including the block being processed."""
+        return self.position
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='scribe-replay-stream', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def close(self):
+        self._stopped.set()
+
+    def _run(self):
+        block_bytes = self.blocksize * 2
+        started = time.perf_counter()
+        try:
+            for offset in range(0, len(self._pcm), block_bytes):
+                if self._stopped.is_set():
+                    break
+                block = self._pcm[offset:offset + block_bytes]
+                if self.speed > 0:
+                    delay = started + (self.position + len(block) / 2 / self.samplerate) / self.speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                self.position += len(block) / 2 / self.samplerate
+                block_started = time.perf_counter()
+                self.callback(block, len(block) // 2, None, None)
+                if self.lockstep is not None:
+                    self.lockstep()
+                self.processing_seconds += time.perf_counter() - block_started
+        finally:
+            self.finished.set()
+
+
+def replay_file(source, model, sample_rate, model_path='', settings=None, blocksize=4000,
+                partial_interval=0.5, speed=0.0, mode='transcribe', final_model=None,
+                final_sample_rate=None, timeout=None):
+    """Replays one WAV file (or PCM bytes) through a VoskRecognizer; returns a report dict.
+
+    The report has the final document, the final texts, inserter counters, audio and
+    processing seconds, the real-time factor (processing / audio), the audio position at
+    which the first partial and final were typed, the time the keyboard and clipboard
+    inserters would need to type the operations, and the per-stage latency percentiles
+    of latency_tracer. In 'command' mode nothing is typed and the
+    matched voice commands are reported instead of executed.
+    """
+    from scribe.command_handler import match_command
+    from scribe.vosk_recognizer import VoskRecognizer
+
+    settings = settings if settings is not None else StaticSettings()
+    finals, commands, streams = [], [], []
+
+    def clock():
+        return streams[0].clock() if streams else 0.0
+
+    inserter = RecordingTextInserter(settings, clock=clock)
+
+    def on_final(text):
+        finals.append(text)
+        if mode == 'command':
+            commands.append(match_command(text, settings, recognizer._lang))
+
+    def stream_factory(**kwargs):
+        stream = WavStream(source, speed=speed, lockstep=recognizer.wait_until_processed, **kwargs)
+        streams.append(stream)
+        return stream
+
+    recognizer = VoskRecognizer(
+        model_path,
+        model=model,
+        sample_rate=sample_rate,
+        blocksize=blocksize,
+        partial_interval=partial_interval,
+        settings_manager=settings,
+        mode=mode,
+        final_handler=on_final,
+        final_model=final_model,
+        final_sample_rate=final_sample_rate,
+        inserter=inserter,
+        stream_factory=stream_factory,
+        clock=clock
+    )
+    tracer.reset()
+    started = time.perf_counter()
+    recognizer.start()
+    if not streams:
+        raise RuntimeError("Replay stream was not opened")
+    stream = streams[0]
+    if not stream.finished.wait(timeout):
+        logger.warning(f"Replay of {source} timed out")
+    thread = recognizer.recognition_thread
+    recognizer.stop()
+    if thread is not None:
+        thread.join()
+    wall_seconds = time.perf_counter() - started
+
+    report = {
+        'source': source if isinstance(source, str) else '<pcm>',
+        'text': inserter.document,
+        'finals': finals,
+        'keystrokes': inserter.keystrokes,
+        'erases': inserter.erases,
+        'operations': len(inserter.operations),
+        'audio_seconds': round(stream.audio_seconds, 3),
+        'processing_seconds': round(stream.processing_seconds, 3),
+        'wall_seconds': round(wall_seconds, 3),
+        'rtf': round(stream.processing_seconds / stream.audio_seconds, 4) if stream.audio_seconds else None,
+        'first_partial_at': inserter.first_issued.get('partial'),
+        'first_final_at': inserter.first_issued.get('final'),
+        'typing_seconds': {kind: round(inserter.typing_seconds(kind), 3) for kind in ('keyboard', 'clipboard')},
+        'latency': tracer.stats(),
+    }
+    if mode == 'command':
+        report['commands'] = commands
+    return report
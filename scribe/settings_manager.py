@@ -13,6 +13,7 @@ class SettingsManager(QObject):
         "modes": {  # Hotkeys for switching modes
             "transcribe_mode": "Ctrl+Shift+Q",  # Hotkey for transcribe mode
             "command_mode": "Ctrl+Alt+Q",       # Hotkey for command mode
+            "profiler": "",                     # Hotkey to start/stop the sampling profiler (empty = none)
         },
         "blocksize": 4000,  # Audio block size for processing
         "selected_microphone": None,  # Name of the selected microphone device
@@ -36,6 +37,7 @@ class SettingsManager(QObject):
             "clipboard_delay_ms": 10   # Delay between sending clipboard commands (ms)
         },
         "transcribe_to_file": False,   # Whether to write final results to file
+        "archive_transcripts": True,   # Whether to index final results written to file for full-text search
         "log_to_file": False,          # Whether to log program activity to file
         "log_level": "DEBUG",  # Log level: DEBUG, INFO, WARNING, ERROR, CRITICAL
         "tray_color": {  # Colors for tray icon states
@@ -66,7 +68,35 @@ class SettingsManager(QObject):
             "theme": "auto",  # Theme for the main window (auto, dark, light)
             "open_on_tray_click": True # Whether to open main window on left click on tray icon
         },
-        "auto_stop_timeout": 0  # Timeout in seconds for auto-stopping listening, 0 = never
+        "auto_stop_timeout": 0,  # Timeout in seconds for auto-stopping listening, 0 = never
+        "download_segments": 4,  # Parallel connections for model downloads (1 = single stream)
+        "model_warmup": True,  # Decode a short synthetic clip after loading a model so the first dictation is fast
+        "pre_roll": {  # Always-open capture: the microphone stays open and speech just before the hotkey is kept
+            "enabled": False,
+            "milliseconds": 500,
+        },
+        "recognition_server": {  # Local HTTP server sharing the loaded model with other programs (see recognition_server.py)
+            "enabled": False,
+            "port": 2700,
+            "max_sessions": 4,
+        },
+        "flight_recorder": {  # Last seconds of audio and pipeline events, written to disk only on errors (see flight_recorder.py)
+            "enabled": True,
+            "seconds": 30,
+        },
+        "watchdog": {  # Restarts the audio stream, recognition loop or inserter worker when it stalls (see watchdog.py)
+            "enabled": True,
+            "audio_stall_seconds": 3,
+            "decoder_stall_seconds": 5,
+            "inserter_stall_seconds": 30,
+        },
+        "metrics": {  # Pipeline metrics for monitoring on http://127.0.0.1:<port>/metrics (see metrics.py)
+            "enabled": False,
+            "port": 9464,
+        },
+        "two_pass": {  # Two-pass decoding: the current model types live partials, a larger one decodes the final text
+            "final_models": {},  # language -> name of the installed model for final results (none = single pass)
+        }
     }
 
     @staticmethod
@@ -0,0 +1,230 @@
+# startup.py
+"""Startup orchestration: overlap model loading and device probing with UI construction.
+
+As soon as the settings are read, the Vosk model and the microphone are prepared on worker
+threads while Qt builds the translations, tray and windows. ModelLoadScheduler then picks
+up the prepared results instead of doing the same work serially. Every phase is recorded in a
+timeline that is logged once the application is ready.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_chdir_lock = threading.Lock()
+
+
+class StartupTimeline:
+    """Thread-safe record of named startup phases relative to process start."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self._phases = []  # (name, start, end, thread name)
+        self._lock = threading.Lock()
+        self.ready_at = None
+
+    def add(self, name, start, end):
+        with self._lock:
+            if self.ready_at is not None:
+                return  # Later model reloads are not part of startup
+            self._phases.append((name, start - self.origin, end - self.origin, threading.current_thread().name))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+    def mark_ready(self):
+        """Records time-to-ready once; returns True the first time it is called."""
+        with self._lock:
+            if self.ready_at is not None:
+                return False
+            self.ready_at = time.perf_counter() - self.origin
+            return True
+
+    def phases(self):
+        with self._lock:
+            return sorted(self._phases, key=lambda p: p[1])
+
+    def format(self):
+        lines = [f"  {name:<22} {start * 1000:8.0f} ms -> {end * 1000:8.0f} ms ({(end - start) * 1000:6.0f} ms) [{thread}]"
+                 for name, start, end, thread in self.phases()]
+        if self.ready_at is not None:
+            lines.append(f"  {'ready':<22} {self.ready_at * 1000:8.0f} ms")
+        return '\n'.join(lines)
+
+    def log_summary(self):
+        logger.info("Startup timeline:\n" + self.format())
+
+
+timeline = StartupTimeline()
+
+
+def load_vosk_model(model_path):
+    """Constructs vosk.Model for model_path.
+
+    On Windows, loading models from paths with non-ASCII characters is problematic, so such a
+    model is loaded by its base name from inside its parent directory. The working directory
+    is process-wide and the UI may be resolving relative resource paths at the same time, so
+    the change is limited to paths that need it and serialized by a lock.
+
+    The growth of resident memory during the load is kept as the model's approximate
+    footprint in the scribe_model_memory_bytes{model=<folder name>} gauge.
+    """
+    import vosk
+
+    from scribe.metrics import registry
+    from scribe.process_stats import rss_bytes
+
+    rss_before = rss_bytes()
+    if model_path and sys.platform == 'win32' and not model_path.isascii():
+        with _chdir_lock:
+            original_cwd = os.getcwd()
+            os.chdir(os.path.dirname(model_path))
+            try:
+                model = vosk.Model(os.path.basename(model_path))
+            finally:
+                # Restore the original working directory immediately.
+                os.chdir(original_cwd)
+    else:
+        model = vosk.Model(model_path)
+    rss_after = rss_bytes()
+    if rss_before is not None and rss_after is not None:
+        registry.gauge('scribe_model_memory_bytes', "Resident memory growth while the model loaded (approximate footprint)",
+                       model=model_folder_name(model_path)).set(max(0, rss_after - rss_before))
+    return model
+
+
+def model_folder_name(model_path):
+    return os.path.basename(os.path.normpath(model_path)) if model_path else ''
+
+
+def warm_up_loaded_model(model, model_path, sample_rate):
+    """Runs the model warm-up (see model_warmup); failures are logged and never block loading."""
+    from scribe.model_warmup import warm_up_model
+    try:
+        with timeline.phase('model_warmup'):
+            warm_up_model(model, model_path, sample_rate)
+    except Exception as e:
+        logger.warning(f"Model warm-up failed: {e}")
+
+
+def probe_input_device(sample_rate, mic_name, use_cache=True):
+    """Checks the microphone against the model sample rate.
+
+    Returns (need_resample, input_sample_rate). With use_cache, the result of the last run is
+    returned from the warm-start cache without touching PortAudio; Application re-probes in
+    the background and corrects the controller if it changed.
+    """
+    from scribe.warm_cache import get_warm_cache
+    cache = get_warm_cache()
+    key = f"{mic_name or ''}@{sample_rate}"
+    cached = cache.get('mic_formats', key) if use_cache else None
+    if cached is not None:
+        return bool(cached[0]), int(cached[1])
+    result = _probe_input_device(sample_rate, mic_name)
+    cache.set('mic_formats', key, list(result))
+    cache.save()
+    return result
+
+
+def _probe_input_device(sample_rate, mic_name):
+    from scribe.audio_devices import AudioDevices
+    if AudioDevices.check_microphone_sample_rate(sample_rate, device=mic_name):
+        return False, sample_rate
+    logger.warning(f"Microphone {mic_name or '[default]'} does not support {sample_rate} Hz. Resampling or errors possible!")
+    # Get the actual microphone sample rate only if resampling is needed
+    input_sample_rate = sample_rate
+    try:
+        import sounddevice as sd
+        if mic_name:
+            for dev in sd.query_devices():
+                if dev['name'] == mic_name and dev['max_input_channels'] > 0:
+                    input_sample_rate = int(dev['default_samplerate'])
+                    break
+            else:
+                input_sample_rate = int(sd.query_devices(kind='input')['default_samplerate'])
+        else:
+            input_sample_rate = int(sd.query_devices(kind='input')['default_samplerate'])
+    except Exception:
+        pass
+    return True, input_sample_rate
+
+
+class ModelPreloader:
+    """Loads the model and probes the microphone on worker threads.
+
+    Results are handed out once through take_preload(); a preload for another model path
+    or microphone is discarded there.
+    """
+
+    def __init__(self, model_path, mic_name, warmup=False):
+        from scribe.model_registry import get_model_registry
+
+        self.model_path = os.path.abspath(model_path)
+        self.mic_name = mic_name
+        self.warmup = warmup
+        self.sample_rate = get_model_registry().get_sample_rate(model_path)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='scribe-preload')
+        self.model_future = self._executor.submit(self._load, model_path)
+        self.device_future = self._executor.submit(self._timed, 'device_probe', probe_input_device, self.sample_rate, mic_name)
+        self._executor.shutdown(wait=False)
+
+    def _load(self, model_path):
+        with timeline.phase('model_load'):
+            model = load_vosk_model(model_path)
+        if self.warmup:
+            warm_up_loaded_model(model, model_path, self.sample_rate)
+        return model
+
+    @staticmethod
+    def _timed(name, func, *args):
+        with timeline.phase(name):
+            return func(*args)
+
+    def matches(self, model_path, mic_name):
+        return bool(model_path) and os.path.abspath(model_path) == self.model_path and mic_name == self.mic_name
+
+
+_preloader = None
+_preloader_lock = threading.Lock()
+
+
+def start_preload(model_path, mic_name, warmup=False):
+    """Begins loading (and optionally warming up) model_path in the background.
+
+    No-op if a preload is already pending.
+    """
+    global _preloader
+    with _preloader_lock:
+        if _preloader is not None or not model_path:
+            return
+        try:
+            _preloader = ModelPreloader(model_path, mic_name, warmup=warmup)
+            logger.info(f"Preloading model in the background: {model_path}")
+        except Exception as e:
+            logger.warning(f"Model preload could not be started: {e}")
+
+
+def take_preload(model_path, mic_name):
+    """Returns the pending ModelPreloader if it was started for model_path and mic_name, else None.
+
+    The preload is handed out only once, so a later reload always loads the model afresh.
+    """
+    global _preloader
+    with _preloader_lock:
+        preloader, _preloader = _preloader, None
+    if preloader is None:
+        return None
+    if not preloader.matches(model_path, mic_name):
+        logger.debug("Discarding model preload for a different model or microphone")
+        return None
+    return preloader
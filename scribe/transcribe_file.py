@@ -1,9 +1,10 @@
 # transcribe_file.py
 import logging
 import os
-import sys
 import time
 
+from scribe.utils import get_records_path
+
 logger = logging.getLogger(__name__)
 
 def get_transcribe_file(obj, transcribe_file_attr='_transcribe_file'):
@@ -26,14 +27,7 @@ def get_transcribe_file(obj, transcribe_file_attr='_transcribe_file'):
         enabled = settings.get('transcribe_to_file', False)
     if enabled:
         ts = int(time.time())
-        if getattr(sys, 'frozen', False):
-            # If the application is run as a bundle, the PyInstaller bootloader
-            # extends the sys module by a flag frozen=True and sets the app
-            # path into variable _MEIPASS'.
-            base_dir = os.path.dirname(sys.executable)
-        else:
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        records_dir = os.path.join(base_dir, 'records')
+        records_dir = get_records_path()
         # Always try to create the records folder
         if not os.path.exists(records_dir):
             try:
@@ -50,3 +44,16 @@ def get_transcribe_file(obj, transcribe_file_attr='_transcribe_file'):
             logger.error(f"Failed to open transcription file: {e}")
             setattr(obj, transcribe_file_attr, None)
     return getattr(obj, transcribe_file_attr)
+
+
+def close_transcribe_file(obj, transcribe_file_attr='_transcribe_file'):
+    """Closes the file opened by get_transcribe_file for obj, if any; the next call opens a new one."""
+    transcribe_file = getattr(obj, transcribe_file_attr, None)
+    if transcribe_file is None:
+        return
+    setattr(obj, transcribe_file_attr, None)
+    try:
+        transcribe_file.close()
+        logger.info(f"Transcription file closed: {transcribe_file.name}")
+    except Exception as e:
+        logger.error(f"Failed to close transcription file: {e}")
@@ -0,0 +1,265 @@
+# transcript_archive.py
+"""Full-text searchable archive of final transcription results (SQLite FTS5).
+
+Live finals are queued and written by a background thread (scribe-archive-writer), so the
+recognition thread never waits for SQLite, the archive lock, an import or a search.
+"""
+import atexit
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from scribe.utils import get_records_path
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILE_NAME = 'transcripts.sqlite3'
+TRANSCRIPT_FILE_RE = re.compile(r'^transcript_(\d+)\.txt$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    started_at REAL,
+    line_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    source_id INTEGER NOT NULL REFERENCES sources(id),
+    line INTEGER NOT NULL,
+    created_at REAL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transcripts_created_at ON transcripts(created_at);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(
+    text, content='transcripts', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS transcripts_ai AFTER INSERT ON transcripts BEGIN
+    INSERT INTO transcripts_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_ad AFTER DELETE ON transcripts BEGIN
+    INSERT INTO transcripts_fts(transcripts_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def source_started_at(name):
+    """Returns the Unix timestamp encoded in a transcript_<ts>.txt file name, or None."""
+    m = TRANSCRIPT_FILE_RE.match(name)
+    return float(m.group(1)) if m else None
+
+
+class TranscriptArchive:
+    """Indexed store of transcription lines.
+
+    One connection is shared between the writer thread (live finals, see queue_line), the
+    importer and the UI; all access goes through a lock. Falls back to LIKE search if the
+    SQLite build has no FTS5.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 is not available, using slow LIKE search: {e}")
+            self.has_fts = False
+        self._conn.commit()
+        self._live_sources = set()  # Names of the files of live sessions; never imported
+        self._pending = queue.Queue()  # (source name, text, created_at) of queued live finals
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def queue_line(self, source_name, text, created_at=None):
+        """Queues a final result of a live session for add_line on the writer thread. Does not block."""
+        # Before the caller writes the line to the file, so the importer skips the file from now on
+        self._live_sources.add(source_name)
+        with self._writer_lock:
+            self._pending.put((source_name, text, created_at if created_at is not None else time.time()))
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_pending, name='scribe-archive-writer', daemon=True)
+                self._writer.start()
+
+    def flush(self, timeout=5.0):
+        """Writes the queued live finals and stops the writer thread (a later queue_line starts a new one)."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+            if writer is None:
+                return
+            self._pending.put(None)
+        writer.join(timeout)
+
+    def _write_pending(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+            try:
+                self.add_line(*item)
+            except Exception as e:
+                logger.error(f"Failed to add transcript to archive: {e}")
+
+    def _get_or_create_source(self, name, started_at):
+        """Returns (source_id, line_count, created). Must be called with the lock held."""
+        cur = self._conn.execute(
+            'INSERT OR IGNORE INTO sources(name, started_at) VALUES (?, ?)', (name, started_at)
+        )
+        created = cur.rowcount == 1
+        row = self._conn.execute('SELECT id, line_count FROM sources WHERE name = ?', (name,)).fetchone()
+        return row['id'], row['line_count'], created
+
+    def add_line(self, source_name, text, created_at=None):
+        """Appends one final result of a live session to the archive."""
+        created_at = created_at if created_at is not None else time.time()
+        with self._lock:
+            source_id, line_count, _ = self._get_or_create_source(source_name, source_started_at(source_name))
+            self._conn.execute(
+                'INSERT INTO transcripts(source_id, line, created_at, text) VALUES (?, ?, ?, ?)',
+                (source_id, line_count, created_at, text)
+            )
+            self._conn.execute('UPDATE sources SET line_count = ? WHERE id = ?', (line_count + 1, source_id))
+            self._conn.commit()
+
+    def import_file(self, path):
+        """Imports a transcript file unless it is already known. Returns the number of imported lines.
+
+        Files of live sessions are skipped: their lines arrive through queue_line.
+        """
+        name = os.path.basename(path)
+        if name in self._live_sources:
+            return 0
+        started_at = source_started_at(name)
+        if started_at is None:
+            started_at = os.path.getmtime(path)
+        # Read outside the lock; it is held only for the source check and the inserts
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = [text for text in (line.strip() for line in f) if text]
+        with self._lock:
+            source_id, _, created = self._get_or_create_source(name, started_at)
+            if not created:
+                self._conn.commit()
+                return 0
+            rows = [(source_id, i, started_at, text) for i, text in enumerate(lines)]
+            self._conn.executemany(
+                'INSERT INTO transcripts(source_id, line, created_at, text) VALUES (?, ?, ?, ?)', rows
+            )
+            self._conn.execute('UPDATE sources SET line_count = ? WHERE id = ?', (len(rows), source_id))
+            self._conn.commit()
+        return len(rows)
+
+    def import_folder(self, records_dir, is_cancelled=None):
+        """Imports all transcript_*.txt files from records_dir. Returns the number of imported lines."""
+        if not os.path.isdir(records_dir):
+            return 0
+        names = sorted(n for n in os.listdir(records_dir) if TRANSCRIPT_FILE_RE.match(n))
+        with self._lock:
+            known = {row['name'] for row in self._conn.execute('SELECT name FROM sources')}
+        imported = 0
+        for name in names:
+            if is_cancelled and is_cancelled():
+                break
+            if name in known or name in self._live_sources:
+                continue
+            try:
+                imported += self.import_file(os.path.join(records_dir, name))
+            except Exception as e:
+                logger.error(f"Failed to import transcript file {name}: {e}")
+        if imported:
+            logger.info(f"Imported {imported} transcript lines from {records_dir}")
+        return imported
+
+    @staticmethod
+    def _fts_query(query):
+        """Converts free user input into a safe FTS5 query: every word must match as a prefix."""
+        words = re.findall(r'\w+', query, flags=re.UNICODE)
+        return ' '.join(f'"{w}"*' for w in words)
+
+    def search(self, query, limit=200):
+        """Returns matching lines as dicts (id, source, created_at, text, snippet), best matches first."""
+        query = query.strip()
+        if not query:
+            return []
+        with self._lock:
+            if self.has_fts:
+                fts_query = self._fts_query(query)
+                if not fts_query:
+                    return []
+                rows = self._conn.execute(
+                    """
+                    SELECT t.id, s.name AS source, t.created_at, t.text,
+                           snippet(transcripts_fts, 0, '[', ']', '…', 16) AS snippet
+                    FROM transcripts_fts
+                    JOIN transcripts t ON t.id = transcripts_fts.rowid
+                    JOIN sources s ON s.id = t.source_id
+                    WHERE transcripts_fts MATCH ?
+                    ORDER BY rank, t.created_at DESC
+                    LIMIT ?
+                    """,
+                    (fts_query, limit)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    """
+                    SELECT t.id, s.name AS source, t.created_at, t.text, t.text AS snippet
+                    FROM transcripts t JOIN sources s ON s.id = t.source_id
+                    WHERE t.text LIKE ? ESCAPE '\\'
+                    ORDER BY t.created_at DESC
+                    LIMIT ?
+                    """,
+                    ('%' + re.sub(r'([%_\\])', r'\\\1', query) + '%', limit)
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM transcripts').fetchone()[0]
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_transcript_archive():
+    """Returns the shared archive stored in the records folder (opened on first use)."""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = TranscriptArchive(os.path.join(get_records_path(), ARCHIVE_FILE_NAME))
+        return _archive
+
+
+def archive_transcript(source_path, text):
+    """Queues a live final result for the archive; errors are logged and never reach the caller."""
+    try:
+        get_transcript_archive().queue_line(os.path.basename(source_path), text)
+    except Exception as e:
+        logger.error(f"Failed to add transcript to archive: {e}")
+
+
+def flush_transcript_archive():
+    """Writes the live finals still queued (at exit, so none are lost with the daemon writer thread)."""
+    if _archive is not None:
+        _archive.flush()
+
+
+atexit.register(flush_transcript_archive)
@@ -33,10 +33,22 @@ class TranslationManager:
 
     def _load_translations(self, lang_code: str) -> Dict[str, str]:
         path = os.path.join(self.translations_dir, f'{lang_code}.json')
-        if not os.path.isfile(path):
-            raise FileNotFoundError(f"Translation file not found: {path}")
+        try:
+            stat = os.stat(path)
+        except OSError:
+            raise FileNotFoundError(f"Translation file not found: {path}") from None
+        # The parsed file is kept in the warm-start cache while its size and mtime are unchanged
+        from scribe.warm_cache import get_warm_cache
+        cache = get_warm_cache()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        cached = cache.get('translations', path)
+        if cached and cached.get('signature') == signature:
+            return cached['data']
         with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            data = json.load(f)
+        cache.set('translations', path, {'signature': signature, 'data': data}, limit=2)
+        cache.save()
+        return data
 
     def __getitem__(self, key: str) -> str:
         return self.translations[key]
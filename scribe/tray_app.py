@@ -2,12 +2,15 @@
 import logging
 import webbrowser
 
-from PyQt5.QtCore import QCoreApplication, QObject, QThread, pyqtSignal
-from PyQt5.QtGui import QColor, QFont, QIcon, QPainter, QPixmap
+from PyQt5.QtCore import QBuffer, QByteArray, QCoreApplication, QIODevice, QObject, QThread, QUrl, pyqtSignal
+from PyQt5.QtGui import QColor, QDesktopServices, QFont, QIcon, QPainter, QPixmap
 from PyQt5.QtWidgets import QAction, QActionGroup, QApplication, QMenu, QSystemTrayIcon
 
 from scribe.audio_devices import AudioDevices
+from scribe.flight_recorder import recorder
+from scribe.profiler import get_profiles_path, profiler
 from scribe.ui.about_dialog import AboutDialog
+from scribe.warm_cache import MAX_ICONS, get_warm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +18,7 @@ class TrayApp(QObject):
     """Manages the system tray icon and its context menu.Delegates all actions to the main Application instance."""
 
     update_tray_ui_signal = pyqtSignal()
+    profile_written_signal = pyqtSignal(list)  # Paths of a finished profile (emitted from the profiler thread)
 
     def __init__(self, application):
         super().__init__()
@@ -23,6 +27,7 @@ class TrayApp(QObject):
         self.texts = application.texts
         self.settings_manager = application.settings_manager
         self.about_dialog = None
+        self._icon_cache = {}  # Rendered tray icons of this run, see _label_icon
 
         self.tray = QSystemTrayIcon()
         self.menu = QMenu()
@@ -30,6 +35,8 @@ class TrayApp(QObject):
         self.tray.activated.connect(self._on_tray_activated)
 
         self.update_tray_ui_signal.connect(self._update_tray_ui_slot)
+        self.profile_written_signal.connect(self._on_profile_written)
+        profiler.add_finished_callback(self.profile_written_signal.emit)
         self._build_menu()
         self._update_tray_icon()
         self.tray.show()
@@ -79,15 +86,8 @@ class TrayApp(QObject):
         # Check for loading state first
         if getattr(self.application, 'is_loading_model', False):
             self.tray.setToolTip(self.texts.get('busy_loading_model', 'Loading model, please wait...'))
-            pixmap = QPixmap(size, size)
-            pixmap.fill(QColor(128, 128, 128))  # Gray color for loading
-            painter = QPainter(pixmap)
-            font = QFont('Arial', 16, QFont.Bold)
-            painter.setFont(font)
-            painter.setPen(QColor(255, 255, 255))
-            painter.drawText(pixmap.rect(), 0x84, "...")  # 0x84 = Qt.AlignCenter
-            painter.end()
-            self.tray.setIcon(QIcon(pixmap))
+            # Gray color for loading
+            self.tray.setIcon(self._label_icon("...", QColor(128, 128, 128), QColor(255, 255, 255), size))
             return  # Exit early
 
         settings = self.settings_manager.all()
@@ -114,15 +114,7 @@ class TrayApp(QObject):
             elif mode == 'command':
                 bg_color = get_color('command_color', (72, 0, 255))
 
-        pixmap = QPixmap(size, size)
-        pixmap.fill(bg_color)
-        painter = QPainter(pixmap)
-        font = QFont('Arial', 16, QFont.Bold)
-        painter.setFont(font)
-        painter.setPen(text_color)
-        painter.drawText(pixmap.rect(), 0x84, lang_code)  # 0x84 = Qt.AlignCenter
-        painter.end()
-        self.tray.setIcon(QIcon(pixmap))
+        self.tray.setIcon(self._label_icon(lang_code, bg_color, text_color, size))
 
         # Tooltip
         model_name = settings.get('current_model', '')
@@ -146,6 +138,39 @@ class TrayApp(QObject):
 
         self.tray.setToolTip("\n".join(tooltip_lines))
 
+    def _label_icon(self, text, bg_color, text_color, size):
+        """Returns the tray icon with text on a colored square.
+
+        Icons are reused within a run and kept as PNG in the warm-start cache between runs,
+        so a relaunch shows the tray without initializing fonts and painting.
+        """
+        key = f"{text}|{bg_color.name(QColor.HexArgb)}|{text_color.name(QColor.HexArgb)}|{size}"
+        icon = self._icon_cache.get(key)
+        if icon is not None:
+            return icon
+        pixmap = QPixmap()
+        cache = get_warm_cache()
+        cached_png = cache.get('icons', key)
+        if not (cached_png and pixmap.loadFromData(QByteArray.fromBase64(cached_png.encode('ascii')), 'PNG')):
+            pixmap = QPixmap(size, size)
+            pixmap.fill(bg_color)
+            painter = QPainter(pixmap)
+            font = QFont('Arial', 16, QFont.Bold)
+            painter.setFont(font)
+            painter.setPen(text_color)
+            painter.drawText(pixmap.rect(), 0x84, text)  # 0x84 = Qt.AlignCenter
+            painter.end()
+            data = QByteArray()
+            buffer = QBuffer(data)
+            buffer.open(QIODevice.WriteOnly)
+            pixmap.save(buffer, 'PNG')
+            buffer.close()
+            cache.set('icons', key, bytes(data.toBase64()).decode('ascii'), limit=MAX_ICONS)
+            cache.save()
+        icon = QIcon(pixmap)
+        self._icon_cache[key] = icon
+        return icon
+
     def _build_menu(self):
         """Builds or rebuilds the tray menu, connecting actions to the Application instance."""
         self.menu.clear()
@@ -172,6 +197,14 @@ class TrayApp(QObject):
         action_main_window.triggered.connect(self.application.show_main_window)
         self.menu.addAction(action_main_window)
 
+        # Batch Transcription Action
+        action_batch = QAction(self.texts.get('batch_menu', 'Transcribe recordings...'), self.app)
+        action_batch.triggered.connect(self.application.show_batch_transcribe)
+        self.menu.addAction(action_batch)
+
+        # Diagnostics Menu
+        self._build_diagnostics_menu()
+
         # Documentation Action
         self.action_documentation = QAction(self.texts.get('documentation', 'Documentation'), self.app)
         self.action_documentation.triggered.connect(lambda: webbrowser.open('https://aigrator.github.io/Scribe/'))
@@ -268,6 +301,47 @@ class TrayApp(QObject):
 
         self.menu.addMenu(mode_menu)
 
+    def _build_diagnostics_menu(self):
+        diagnostics_menu = QMenu(self.texts.get('diagnostics_menu', 'Diagnostics'), self.menu)
+        self.action_profiler = QAction(self.app)
+        self.action_profiler.triggered.connect(self._toggle_profiler)
+        diagnostics_menu.addAction(self.action_profiler)
+        action_flight_recording = QAction(self.texts.get('flight_recording_save', 'Save flight recording'), self.app)
+        action_flight_recording.triggered.connect(self._save_flight_recording)
+        diagnostics_menu.addAction(action_flight_recording)
+        action_open_folder = QAction(self.texts.get('diagnostics_open_folder', 'Open diagnostics folder'), self.app)
+        action_open_folder.triggered.connect(lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(get_profiles_path())))
+        diagnostics_menu.addAction(action_open_folder)
+        # The profiler hotkey can start or stop a profile while the menu is built
+        diagnostics_menu.aboutToShow.connect(self._update_profiler_action)
+        self._update_profiler_action()
+        self.menu.addMenu(diagnostics_menu)
+
+    def _update_profiler_action(self):
+        if profiler.running:
+            self.action_profiler.setText(self.texts.get('profiler_stop', 'Stop profiling'))
+        else:
+            self.action_profiler.setText(
+                self.texts.get('profiler_start', 'Start profiling ({0} s)').format(f"{profiler.max_seconds:.0f}"))
+
+    def _toggle_profiler(self):
+        profiler.toggle()
+        self._update_profiler_action()
+
+    def _save_flight_recording(self):
+        path = recorder.dump('requested from the tray menu')
+        title = self.texts.get('diagnostics_menu', 'Diagnostics')
+        if path:
+            self.tray.showMessage(title, self.texts.get('flight_recording_saved', 'Flight recording saved: {0}').format(path))
+        else:
+            self.tray.showMessage(title, self.texts.get('flight_recording_empty', 'Nothing recorded yet'))
+
+    def _on_profile_written(self, files):
+        self._update_profiler_action()
+        if files:
+            self.tray.showMessage(self.texts.get('diagnostics_menu', 'Diagnostics'),
+                                  self.texts.get('profiler_saved', 'Profile saved: {0}').format(files[0]))
+
     def _build_model_menu(self, settings):
         model_menu = QMenu(self.texts.get('model_select', 'Select model'), self.menu)
         model_action_group = QActionGroup(self.app)
@@ -295,7 +369,7 @@ class TrayApp(QObject):
         mic_action_group = QActionGroup(self.app)
         mic_action_group.setExclusive(True)
 
-        devices = AudioDevices.get_input_devices(wasapi_only=True)
+        devices = AudioDevices.get_cached_input_devices(wasapi_only=True)
         if not devices:
             no_mic_action = QAction(self.texts['mics_not_found'], self.app)
             no_mic_action.setEnabled(False)
@@ -0,0 +1,242 @@
+# ui/batch_transcribe_dialog.py
+import logging
+import os
+
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import (
+    QDialog,
+    QFileDialog,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QProgressBar,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+)
+
+from scribe.batch_transcriber import AUDIO_EXTENSIONS, BatchTranscriber, default_workers, find_audio_files, write_transcript
+from scribe.utils import resource_path
+
+logger = logging.getLogger(__name__)
+
+
+class BatchTranscribeThread(QThread):
+    """Runs a BatchTranscriber and writes a transcript for every finished recording."""
+
+    progress = pyqtSignal(int, int)  # done segments, total segments
+    file_done = pyqtSignal(dict)
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    def __init__(self, files, model_path, settings_manager, workers, output_dir=None):
+        super().__init__()
+        self.files = files
+        self.model_path = model_path
+        self.settings_manager = settings_manager
+        self.workers = workers
+        self.output_dir = output_dir
+
+    def _on_file(self, result):
+        if not result['error']:
+            try:
+                result['transcript'] = write_transcript(result, self.output_dir)
+            except OSError as e:
+                result['error'] = str(e)
+        self.file_done.emit(result)
+
+    def run(self):
+        try:
+            transcriber = BatchTranscriber(
+                self.model_path,
+                settings=self.settings_manager,
+                workers=self.workers,
+                progress_callback=self.progress.emit,
+                file_callback=self._on_file,
+                is_cancelled=self.isInterruptionRequested
+            )
+            self.finished.emit(transcriber.run(self.files))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class BatchTranscribeDialog(QDialog):
+    """Picks recordings and transcribes them with the current model on worker processes.
+
+    Closing the dialog cancels a run without waiting for it; idle is emitted once its
+    thread has ended, so the owner keeps the dialog (and the thread) until then.
+    """
+
+    idle = pyqtSignal()
+
+    def __init__(self, model_path, settings_manager, texts, parent=None):
+        super().__init__(parent)
+        self.model_path = model_path
+        self.settings_manager = settings_manager
+        self.texts = texts
+        self.thread = None
+        self._items = {}  # path -> QListWidgetItem
+        self.setWindowTitle(self.texts.get('batch_title', 'Transcribe recordings'))
+        self.setWindowIcon(QIcon(resource_path('resources/icon.ico')))
+        self.setMinimumWidth(560)
+        self.setMinimumHeight(420)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(self.texts.get('batch_files_label', 'WAV/FLAC recordings:')))
+        self.file_list = QListWidget()
+        layout.addWidget(self.file_list)
+
+        file_buttons = QHBoxLayout()
+        self.add_files_button = QPushButton(self.texts.get('batch_add_files', 'Add files...'))
+        self.add_files_button.clicked.connect(self.add_files)
+        self.add_folder_button = QPushButton(self.texts.get('batch_add_folder', 'Add folder...'))
+        self.add_folder_button.clicked.connect(self.add_folder)
+        self.clear_button = QPushButton(self.texts.get('batch_clear', 'Clear'))
+        self.clear_button.clicked.connect(self.clear_files)
+        for button in (self.add_files_button, self.add_folder_button, self.clear_button):
+            file_buttons.addWidget(button)
+        file_buttons.addStretch()
+        layout.addLayout(file_buttons)
+
+        form = QFormLayout()
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers_spin.setValue(default_workers())
+        self.workers_spin.setToolTip(self.texts.get('batch_workers_tooltip', 'Each worker process loads its own copy of the model'))
+        form.addRow(self.texts.get('batch_workers', 'Worker processes:'), self.workers_spin)
+        output_row = QHBoxLayout()
+        self.output_edit = QLineEdit()
+        self.output_edit.setPlaceholderText(self.texts.get('batch_output_placeholder', 'Next to the recordings'))
+        output_browse = QPushButton('...')
+        output_browse.clicked.connect(self.choose_output_dir)
+        output_row.addWidget(self.output_edit)
+        output_row.addWidget(output_browse)
+        form.addRow(self.texts.get('batch_output', 'Transcripts folder:'), output_row)
+        layout.addLayout(form)
+
+        self.progress = QProgressBar()
+        self.progress.setVisible(False)
+        layout.addWidget(self.progress)
+        self.status_label = QLabel('')
+        self.status_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.status_label)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.start_button = QPushButton(self.texts.get('batch_start', 'Transcribe'))
+        self.start_button.setEnabled(False)
+        self.start_button.clicked.connect(self.start)
+        self.cancel_button = QPushButton(self.texts.get('cancel', 'Cancel'))
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancel)
+        self.close_button = QPushButton(self.texts.get('close', 'Close'))
+        self.close_button.clicked.connect(self.reject)
+        for button in (self.start_button, self.cancel_button, self.close_button):
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+    def _add_paths(self, paths):
+        for path in find_audio_files(paths):
+            if path not in self._items:
+                item = QListWidgetItem(path)
+                self.file_list.addItem(item)
+                self._items[path] = item
+        self.start_button.setEnabled(bool(self._items))
+
+    def add_files(self):
+        patterns = ' '.join(f'*{ext}' for ext in AUDIO_EXTENSIONS)
+        paths, _ = QFileDialog.getOpenFileNames(self, self.texts.get('batch_add_files', 'Add files...'), '', f"Audio ({patterns})")
+        self._add_paths(paths)
+
+    def add_folder(self):
+        path = QFileDialog.getExistingDirectory(self, self.texts.get('batch_add_folder', 'Add folder...'))
+        if path:
+            self._add_paths([path])
+
+    def clear_files(self):
+        self.file_list.clear()
+        self._items = {}
+        self.start_button.setEnabled(False)
+
+    def choose_output_dir(self):
+        path = QFileDialog.getExistingDirectory(self, self.texts.get('batch_output', 'Transcripts folder:'))
+        if path:
+            self.output_edit.setText(path)
+
+    def _set_running(self, running):
+        for widget in (self.add_files_button, self.add_folder_button, self.clear_button, self.workers_spin, self.output_edit, self.start_button):
+            widget.setEnabled(not running)
+        self.cancel_button.setVisible(running)
+        self.progress.setVisible(running)
+
+    def start(self):
+        files = list(self._items)
+        for path, item in self._items.items():
+            item.setText(path)
+            item.setToolTip('')
+        self._set_running(True)
+        self.progress.setRange(0, 0)
+        self.status_label.setText(self.texts.get('batch_status_preparing', 'Finding pauses in the recordings...'))
+        self.thread = BatchTranscribeThread(files, self.model_path, self.settings_manager, self.workers_spin.value(),
+                                            self.output_edit.text().strip() or None)
+        self.thread.progress.connect(self.on_progress)
+        self.thread.file_done.connect(self.on_file_done)
+        self.thread.finished.connect(self.on_finished)
+        self.thread.error.connect(self.on_error)
+        self.thread.start()
+
+    def on_progress(self, done, total):
+        self.progress.setRange(0, max(1, total))
+        self.progress.setValue(done)
+        self.status_label.setText(self.texts.get('batch_status_progress', 'Decoded {0} of {1} segments').format(done, total))
+
+    def on_file_done(self, result):
+        item = self._items.get(result['path'])
+        if item is None:
+            return
+        if result['error']:
+            item.setText(f"✗ {result['path']}")
+            item.setToolTip(result['error'])
+        else:
+            item.setText(f"✓ {result['path']}")
+            item.setToolTip(result.get('transcript', ''))
+
+    def is_running(self):
+        return self.thread is not None and self.thread.isRunning()
+
+    def _thread_ended(self):
+        # Emitted as the last thing run() does, so this wait is short
+        self.thread.wait()
+        self.idle.emit()
+
+    def on_finished(self, results):
+        self._set_running(False)
+        failed = sum(1 for r in results if r['error'])
+        self.status_label.setText(self.texts.get('batch_status_done', 'Done: {0} transcribed, {1} failed').format(len(results) - failed, failed))
+        self._thread_ended()
+
+    def on_error(self, msg):
+        self._set_running(False)
+        self.status_label.setText(self.texts.get('batch_status_error', 'Transcription stopped:') + f" {msg}")
+        self._thread_ended()
+
+    def cancel(self):
+        if self.thread is not None and self.thread.isRunning():
+            self.thread.requestInterruption()
+
+    def reject(self):
+        # Running segments finish in the worker processes; nothing more is submitted. The
+        # thread stops at the next file or segment and emits idle; it is not waited for here
+        if self.is_running():
+            self.thread.requestInterruption()
+        super().reject()
+
+    def shutdown(self):
+        """Cancels a run and waits for its thread (application quit)."""
+        if self.is_running():
+            self.thread.requestInterruption()
+            self.thread.wait()
@@ -28,4 +28,16 @@ class BusyDialog(QDialog):
         gif_label.setMovie(movie)
         movie.start()
         layout.addWidget(gif_label)
+
+        # Current loading stage; hidden until set_stage() is called
+        self.stage_label = QLabel()
+        self.stage_label.setAlignment(Qt.AlignCenter)
+        self.stage_label.setStyleSheet('background: rgba(0, 0, 0, 160); color: white; border-radius: 4px; padding: 2px 6px;')
+        self.stage_label.hide()
+        layout.addWidget(self.stage_label)
         self.setModal(True)
+
+    def set_stage(self, text):
+        self.stage_label.setText(text)
+        self.stage_label.setVisible(bool(text))
+        self.adjustSize()
@@ -0,0 +1,209 @@
+# ui/diagnostics_page.py
+import time
+from collections import deque
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QFormLayout,
+    QGroupBox,
+    QHeaderView,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from scribe import process_stats
+from scribe.latency_tracer import tracer
+from scribe.metrics import registry
+from scribe.startup import model_folder_name
+from scribe.watchdog import watchdog
+
+from .styles import HINT_LABEL_STYLE
+
+MB = 1024 * 1024
+# Latency stages shown, in pipeline order (see latency_tracer.py)
+LATENCY_STAGES = ('e2e_partial', 'e2e_final', 'queue', 'decode', 'final_pass', 'inserter_queue', 'inject')
+
+
+def _metric(snapshot, name, field='value', **labels):
+    """Value of the sample of name with exactly labels in a registry snapshot (0 if absent)."""
+    for sample in snapshot.get(name, {}).get('samples', []):
+        if sample['labels'] == labels:
+            return sample[field]
+    return 0
+
+
+class DiagnosticsPageWidget(QWidget):
+    """Live pipeline health from the metrics registry and the latency tracer.
+
+    Refreshed every REFRESH_MS while the page is visible; the timer stops when it is hidden.
+    Rates are computed over the last RATE_WINDOW refreshes.
+    """
+
+    REFRESH_MS = 1000
+    RATE_WINDOW = 5
+
+    def __init__(self, tray_app, texts, settings_manager, parent=None):
+        super().__init__(parent)
+        self.tray_app = tray_app
+        self.texts = texts
+        self.settings_manager = settings_manager
+        self._history = deque(maxlen=self.RATE_WINDOW)  # (monotonic time, counters)
+
+        layout = QVBoxLayout(self)
+
+        self.config_label = QLabel()
+        self.config_label.setWordWrap(True)
+        layout.addWidget(self.config_label)
+
+        recognition_group = QGroupBox(self.texts.get('diag_recognition_group', 'Recognition'))
+        recognition_form = QFormLayout(recognition_group)
+        self.rtf_label = self._add_row(recognition_form, 'diag_rtf', 'Real-time factor:')
+        self.decoder_cpu_label = self._add_row(recognition_form, 'diag_decoder_cpu', 'Decoder CPU:')
+        self.process_cpu_label = self._add_row(recognition_form, 'diag_process_cpu', 'Scribe CPU:')
+        self.rates_label = self._add_row(recognition_form, 'diag_results_rate', 'Partials / finals per minute:')
+        self.watchdog_label = self._add_row(recognition_form, 'diag_watchdog', 'Watchdog restarts:')
+        layout.addWidget(recognition_group)
+
+        audio_group = QGroupBox(self.texts.get('diag_audio_group', 'Audio and text insertion'))
+        audio_form = QFormLayout(audio_group)
+        self.queue_label = self._add_row(audio_form, 'diag_queue', 'Audio queue:')
+        self.dropped_label = self._add_row(audio_form, 'diag_dropped', 'Dropped blocks / overflows:')
+        self.backlog_label = self._add_row(audio_form, 'diag_backlog', 'Insertion backlog:')
+        layout.addWidget(audio_group)
+
+        memory_group = QGroupBox(self.texts.get('diag_memory_group', 'Memory'))
+        memory_form = QFormLayout(memory_group)
+        self.model_memory_label = self._add_row(memory_form, 'diag_model_memory', 'Model:')
+        self.process_memory_label = self._add_row(memory_form, 'diag_process_memory', 'Scribe (peak):')
+        layout.addWidget(memory_group)
+
+        latency_group = QGroupBox(self.texts.get('diag_latency_group', 'Latency, ms'))
+        latency_layout = QVBoxLayout(latency_group)
+        self.latency_table = QTableWidget(0, 5)
+        self.latency_table.setHorizontalHeaderLabels([
+            self.texts.get('diag_col_stage', 'Stage'),
+            self.texts.get('diag_col_count', 'Samples'),
+            'p50', 'p95', 'p99',
+        ])
+        self.latency_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, 5):
+            self.latency_table.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        self.latency_table.verticalHeader().setVisible(False)
+        self.latency_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.latency_table.setSelectionMode(QAbstractItemView.NoSelection)
+        latency_layout.addWidget(self.latency_table)
+        layout.addWidget(latency_group, 1)
+
+        hint = QLabel(self.texts.get(
+            'diag_hint',
+            'A real-time factor near or above 1 means decoding cannot keep up: choose a larger block size '
+            '(General Settings) or a smaller model. A growing insertion backlog means the inserter delays '
+            '(Input Settings) are too long for the amount of text.'))
+        hint.setWordWrap(True)
+        hint.setStyleSheet(HINT_LABEL_STYLE)
+        layout.addWidget(hint)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def _add_row(self, form, key, default):
+        value = QLabel('–')
+        form.addRow(self.texts.get(key, default), value)
+        return value
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Rates start over: the time the page was hidden is not averaged in
+        self._history.clear()
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def _controller(self):
+        return getattr(self.tray_app, 'controller', None)
+
+    def refresh(self):
+        snapshot = registry.snapshot()
+        counters = {
+            'audio': _metric(snapshot, 'scribe_audio_seconds_total'),
+            'decode': _metric(snapshot, 'scribe_stage_seconds', 'sum', stage='decode'),
+            'partials': _metric(snapshot, 'scribe_results_total', kind='partial'),
+            'finals': _metric(snapshot, 'scribe_results_total', kind='final'),
+            'cpu': process_stats.cpu_seconds(),
+        }
+        self._history.append((time.monotonic(), counters))
+        self._update_config()
+        self._update_rates()
+
+        blocks = _metric(snapshot, 'scribe_audio_queue_depth')
+        controller = self._controller()
+        blocksize = getattr(controller, 'blocksize', None) or self.settings_manager.get('blocksize', 4000)
+        sample_rate = getattr(controller, 'sample_rate', 16000) or 16000
+        self.queue_label.setText(self.texts.get('diag_queue_value', '{0} blocks ({1:.0f} ms)').format(
+            blocks, blocks * blocksize * 1000 / sample_rate))
+        self.dropped_label.setText(f"{_metric(snapshot, 'scribe_audio_blocks_dropped_total')} / "
+                                   f"{_metric(snapshot, 'scribe_audio_overflows_total')}")
+        self.backlog_label.setText(self.texts.get('diag_backlog_value', '{0} commands').format(
+            _metric(snapshot, 'scribe_inserter_backlog')))
+        restarts = watchdog.report()
+        self.watchdog_label.setText(', '.join(f"{name} {stats['restarts']}" for name, stats in restarts.items()))
+        self._update_memory(snapshot, controller)
+        self._update_latency()
+
+    def _update_config(self):
+        controller = self._controller()
+        blocksize = getattr(controller, 'blocksize', None) or self.settings_manager.get('blocksize', 4000)
+        sample_rate = getattr(controller, 'sample_rate', 16000) or 16000
+        model = model_folder_name(getattr(controller, 'model_path', '')) or '–'
+        inserter = self.settings_manager.get('inserter_type', '')
+        self.config_label.setText(self.texts.get('diag_config', 'Model {0}, block size {1} ({2:.0f} ms), {3} inserter').format(
+            model, blocksize, blocksize * 1000 / sample_rate, inserter))
+
+    def _update_rates(self):
+        (started, first), (now, last) = self._history[0], self._history[-1]
+        elapsed = now - started
+        if elapsed <= 0:
+            return
+        audio = last['audio'] - first['audio']
+        decode = last['decode'] - first['decode']
+        if audio > 0:
+            self.rtf_label.setText(f"{decode / audio:.3f}")
+        else:
+            self.rtf_label.setText(self.texts.get('diag_idle', 'idle'))
+        # Share of one core spent decoding; Scribe CPU is all threads of the process
+        self.decoder_cpu_label.setText(f"{decode / elapsed * 100:.0f} %")
+        self.process_cpu_label.setText(f"{(last['cpu'] - first['cpu']) / elapsed * 100:.0f} %")
+        per_minute = 60.0 / elapsed
+        self.rates_label.setText(f"{(last['partials'] - first['partials']) * per_minute:.0f} / "
+                                 f"{(last['finals'] - first['finals']) * per_minute:.0f}")
+
+    def _update_memory(self, snapshot, controller):
+        models = [getattr(controller, 'model_path', None), getattr(controller, 'final_model_path', None)]
+        footprint = sum(_metric(snapshot, 'scribe_model_memory_bytes', model=model_folder_name(path)) for path in models if path)
+        self.model_memory_label.setText(f"~{footprint / MB:.0f} MB" if footprint else '–')
+        stats = process_stats.snapshot()
+        if stats['rss_mb'] is not None:
+            self.process_memory_label.setText(f"{stats['rss_mb']:.0f} MB ({stats['peak_rss_mb']:.0f} MB)")
+
+    def _update_latency(self):
+        stats = tracer.stats()
+        stages = [stage for stage in LATENCY_STAGES if stage in stats]
+        self.latency_table.setRowCount(len(stages))
+        for row, stage in enumerate(stages):
+            values = stats[stage]
+            cells = (self.texts.get(f'diag_stage_{stage}', stage), str(values['count']),
+                     f"{values['p50_ms']:.1f}", f"{values['p95_ms']:.1f}", f"{values['p99_ms']:.1f}")
+            for column, text in enumerate(cells):
+                item = self.latency_table.item(row, column)
+                if item is None:
+                    self.latency_table.setItem(row, column, QTableWidgetItem(text))
+                else:
+                    item.setText(text)
@@ -3,6 +3,9 @@ from PyQt5.QtWidgets import QFormLayout, QGroupBox, QLabel, QWidget
 
 from .hotkey_line_edit import HotkeyLineEdit
 
+# Keys of the 'modes' setting edited in the modes group; every other row is a model hotkey
+MODE_KEYS = ('transcribe_mode', 'command_mode', 'profiler')
+
 
 class HotkeysPageWidget(QWidget):
     def __init__(self, texts, settings_modes, parent=None, settings_manager=None):
@@ -31,6 +34,12 @@ class HotkeysPageWidget(QWidget):
             settings_modes.get('command_mode', 'Ctrl+Alt+Q'),
             parent_layout=modes_layout
         )
+        self.add_hotkey_row(
+            'profiler',
+            self.texts.get('hotkey_profiler', 'Start/stop profiling (diagnostics)'),
+            settings_modes.get('profiler', ''),
+            parent_layout=modes_layout
+        )
         layout.addRow(self.modes_groupbox)
 
         # Hotkeys for switching models
@@ -56,11 +65,11 @@ class HotkeysPageWidget(QWidget):
 
     def get_modes(self):
         # Only modes (without models)
-        return {k: v.text() for k, v in self.hotkey_inputs.items() if k in ('transcribe_mode', 'command_mode')}
+        return {k: v.text() for k, v in self.hotkey_inputs.items() if k in MODE_KEYS}
 
     def get_models_hotkeys(self):
         # Only hotkeys for models
-        return {k: v.text() for k, v in self.hotkey_inputs.items() if k not in ('transcribe_mode', 'command_mode')}
+        return {k: v.text() for k, v in self.hotkey_inputs.items() if k not in MODE_KEYS}
 
     def update_hotkeys(self):
         # Completely recreates hotkey inputs for models (e.g., after adding/removing a model)
@@ -85,7 +94,7 @@ class HotkeysPageWidget(QWidget):
 
         # Clear hotkey_inputs of models
         for key in list(self.hotkey_inputs.keys()):
-            if key not in ('transcribe_mode', 'command_mode'):
+            if key not in MODE_KEYS:
                 self.hotkey_inputs.pop(key)
 
         # Add new rows for all models from settings_manager
@@ -60,6 +60,27 @@ class MainSettingsPageWidget(QWidget):
         auto_stop_layout.addStretch()
         self.mode_buttons_group_layout.addLayout(auto_stop_layout)
 
+        # Pre-roll: always-open capture keeps the speech from just before the hotkey
+        from PyQt5.QtWidgets import QCheckBox, QSpinBox
+        pre_roll = self.settings.get('pre_roll', self.settings_manager.DEFAULTS['pre_roll'])
+        pre_roll_layout = QHBoxLayout()
+        self.pre_roll_checkbox = QCheckBox(self.texts.get('pre_roll_enabled', 'Keep the microphone open and include speech from before the hotkey:'))
+        self.pre_roll_checkbox.setChecked(bool(pre_roll.get('enabled', False)))
+        self.pre_roll_spin = QSpinBox()
+        self.pre_roll_spin.setRange(100, 3000)
+        self.pre_roll_spin.setSingleStep(100)
+        self.pre_roll_spin.setSuffix(self.texts.get('pre_roll_ms_suffix', ' ms'))
+        self.pre_roll_spin.setValue(int(pre_roll.get('milliseconds', 500)))
+        pre_roll_layout.addWidget(self.pre_roll_checkbox)
+        pre_roll_layout.addWidget(self.pre_roll_spin)
+        pre_roll_layout.addStretch()
+        self.mode_buttons_group_layout.addLayout(pre_roll_layout)
+        pre_roll_hint = QLabel(self.texts.get('pre_roll_hint', 'The system shows the microphone as in use while Scribe runs.'))
+        pre_roll_hint.setStyleSheet(HINT_LABEL_STYLE)
+        self.mode_buttons_group_layout.addWidget(pre_roll_hint)
+        self.pre_roll_checkbox.stateChanged.connect(self._on_pre_roll_changed)
+        self.pre_roll_spin.editingFinished.connect(self._on_pre_roll_changed)
+
         layout.addRow(self.mode_buttons_group)
 
         # Connect to the controller reloaded signal to keep the widget in sync
@@ -192,10 +213,71 @@ class MainSettingsPageWidget(QWidget):
         logging_layout.addLayout(log_level_layout)
         layout.addRow(logging_group)
 
+        # Local recognition server Group
+        from PyQt5.QtWidgets import QSpinBox
+        server_config = self.settings.get('recognition_server', self.settings_manager.DEFAULTS['recognition_server'])
+        server_group = QGroupBox(self.texts.get('server_group', 'Local recognition server'))
+        server_layout = QVBoxLayout(server_group)
+        self.server_enabled_checkbox = QCheckBox(self.texts.get('server_enabled', 'Share the loaded model with other programs on this computer'))
+        self.server_enabled_checkbox.setChecked(bool(server_config.get('enabled', False)))
+        server_layout.addWidget(self.server_enabled_checkbox)
+        server_options = QHBoxLayout()
+        server_options.addWidget(QLabel(self.texts.get('server_port', 'Port:')))
+        self.server_port_spin = QSpinBox()
+        self.server_port_spin.setRange(1024, 65535)
+        self.server_port_spin.setValue(int(server_config.get('port', 2700)))
+        server_options.addWidget(self.server_port_spin)
+        server_options.addWidget(QLabel(self.texts.get('server_max_sessions', 'Simultaneous clients:')))
+        self.server_sessions_spin = QSpinBox()
+        self.server_sessions_spin.setRange(1, 32)
+        self.server_sessions_spin.setValue(int(server_config.get('max_sessions', 4)))
+        server_options.addWidget(self.server_sessions_spin)
+        server_options.addStretch()
+        server_layout.addLayout(server_options)
+        self.server_hint_label = QLabel()
+        self.server_hint_label.setStyleSheet(HINT_LABEL_STYLE)
+        server_layout.addWidget(self.server_hint_label)
+        self._update_server_hint()
+        self.server_enabled_checkbox.stateChanged.connect(self._on_server_settings_changed)
+        self.server_port_spin.editingFinished.connect(self._on_server_settings_changed)
+        self.server_sessions_spin.editingFinished.connect(self._on_server_settings_changed)
+        layout.addRow(server_group)
+
+        # Pipeline metrics Group
+        metrics_config = self.settings.get('metrics', self.settings_manager.DEFAULTS['metrics'])
+        metrics_group = QGroupBox(self.texts.get('metrics_group', 'Pipeline metrics'))
+        metrics_layout = QVBoxLayout(metrics_group)
+        self.metrics_enabled_checkbox = QCheckBox(self.texts.get('metrics_enabled', 'Publish recognition metrics for monitoring tools on this computer'))
+        self.metrics_enabled_checkbox.setChecked(bool(metrics_config.get('enabled', False)))
+        metrics_layout.addWidget(self.metrics_enabled_checkbox)
+        metrics_options = QHBoxLayout()
+        metrics_options.addWidget(QLabel(self.texts.get('server_port', 'Port:')))
+        self.metrics_port_spin = QSpinBox()
+        self.metrics_port_spin.setRange(1024, 65535)
+        self.metrics_port_spin.setValue(int(metrics_config.get('port', 9464)))
+        metrics_options.addWidget(self.metrics_port_spin)
+        metrics_options.addStretch()
+        metrics_layout.addLayout(metrics_options)
+        self.metrics_hint_label = QLabel()
+        self.metrics_hint_label.setStyleSheet(HINT_LABEL_STYLE)
+        metrics_layout.addWidget(self.metrics_hint_label)
+        self._update_metrics_hint()
+        self.metrics_enabled_checkbox.stateChanged.connect(self._on_metrics_settings_changed)
+        self.metrics_port_spin.editingFinished.connect(self._on_metrics_settings_changed)
+        layout.addRow(metrics_group)
+
     def _on_auto_stop_changed(self, index):
         timeout_seconds = self.auto_stop_select.itemData(index)
         self.settings_manager.set('auto_stop_timeout', timeout_seconds)
 
+    def _on_pre_roll_changed(self, *args):
+        config = {
+            'enabled': self.pre_roll_checkbox.isChecked(),
+            'milliseconds': self.pre_roll_spin.value(),
+        }
+        if config != self.settings_manager.get('pre_roll'):
+            self.settings_manager.set('pre_roll', config)
+
     def _on_controller_reloaded(self, new_controller):
         """Handles the controller reload signal by reconnecting signals."""
         logger.debug("[MainSettingsPage] Controller reloaded, reconnecting signals.")
@@ -250,8 +332,9 @@ class MainSettingsPageWidget(QWidget):
     def open_records_folder(self):
         import os
         import subprocess
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        records_dir = os.path.join(base_dir, 'records')
+
+        from scribe.utils import get_records_path
+        records_dir = get_records_path()
         if not os.path.exists(records_dir):
             os.makedirs(records_dir, exist_ok=True)
         # Open folder in Explorer (Windows)
@@ -268,6 +351,34 @@ class MainSettingsPageWidget(QWidget):
     def _on_log_to_file_changed(self, state):
         self.settings_manager.set('log_to_file', bool(state))
 
+    def _update_server_hint(self):
+        url = f"http://127.0.0.1:{self.server_port_spin.value()}/v1/recognize"
+        self.server_hint_label.setText(self.texts.get('server_hint', 'Clients POST 16-bit mono PCM to {0}').format(url))
+
+    def _on_server_settings_changed(self, *args):
+        self._update_server_hint()
+        config = {
+            'enabled': self.server_enabled_checkbox.isChecked(),
+            'port': self.server_port_spin.value(),
+            'max_sessions': self.server_sessions_spin.value(),
+        }
+        if config != self.settings_manager.get('recognition_server'):
+            self.settings_manager.set('recognition_server', config)
+
+    def _update_metrics_hint(self):
+        base = f"http://127.0.0.1:{self.metrics_port_spin.value()}"
+        self.metrics_hint_label.setText(
+            self.texts.get('metrics_hint', 'Prometheus: {0}/metrics, JSON: {0}/metrics.json').format(base))
+
+    def _on_metrics_settings_changed(self, *args):
+        self._update_metrics_hint()
+        config = {
+            'enabled': self.metrics_enabled_checkbox.isChecked(),
+            'port': self.metrics_port_spin.value(),
+        }
+        if config != self.settings_manager.get('metrics'):
+            self.settings_manager.set('metrics', config)
+
     def _on_log_level_changed(self, idx):
         level = self.log_level_select.currentData()
         self.settings_manager.set('log_level', level)
@@ -466,7 +466,7 @@ class MainVoiceWindow(QWidget):
         try:
             self.mic_combo.clear()
             from scribe.audio_devices import AudioDevices
-            devices = AudioDevices.get_input_devices(wasapi_only=True)
+            devices = AudioDevices.get_cached_input_devices(wasapi_only=True)
             if not devices:
                 self.mic_combo.addItem(self.texts.get('mics_not_found', 'No microphones found'))
                 self.mic_combo.setEnabled(False)
@@ -3,20 +3,26 @@ import webbrowser
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import QDialog, QHBoxLayout, QLabel, QListWidget, QPushButton, QStackedWidget, QVBoxLayout
+from PyQt5.QtWidgets import QDialog, QHBoxLayout, QLabel, QListWidget, QPushButton, QStackedWidget, QVBoxLayout, QWidget
 
 from scribe.utils import resource_path
 
-from .hotkeys_page import HotkeysPageWidget
-from .input_settings_page import InputSettingsPageWidget
-from .main_settings_page import MainSettingsPageWidget
-from .replacements_page import ReplacementsPage
-from .voice_hotkeys_page import VoiceHotkeysPage
-from .voice_openfile_page import VoiceOpenfilePage
-from .vosk_models_page import VoskModelsPageWidget
-
 
 class SettingsWindow(QDialog):
+    # Page attribute, title key, default title, help anchor. Pages are imported and built on first view.
+    PAGES = (
+        ('hotkeys_page', 'settings_hotkeys', 'Hotkeys', "05_settings_hotkeys"),
+        ('main_page', 'settings_main', 'General Settings', "06_settings_general"),
+        ('input_page', 'settings_input', 'Input Settings', "07_settings_input"),
+        ('replacements_page', 'settings_replacements', 'Replacements', "08_settings_replacements"),
+        ('voice_hotkeys_page', 'voice_hotkeys_title', 'Voice Hotkeys', "09_settings_voice_hotkeys"),
+        ('voice_openfile_page', 'voice_openfile_title', 'Voice Program Launch', "10_settings_voice_launch"),
+        ('vosk_models_page', 'settings_models', 'Vosk Models', "11_settings_vosk_models"),
+        ('window_settings_page', 'settings_main_window', 'Main Window', "12_settings_main_window"),
+        ('transcript_search_page', 'settings_search', 'Transcript Search', None),
+        ('diagnostics_page', 'settings_diagnostics', 'Diagnostics', None),
+    )
+
     def __init__(self, tray_app, texts, settings_manager, parent=None):
         super().__init__(parent)
         self.tray_app = tray_app
@@ -39,37 +45,11 @@ class SettingsWindow(QDialog):
         self.pages_stack = QStackedWidget()
         self.main_hbox.addWidget(self.pages_stack)
 
-        self.main_page = MainSettingsPageWidget(self.tray_app, self.texts, self.settings_manager)
-        self.input_page = InputSettingsPageWidget(self.texts, self.settings_manager)
-        self.hotkeys_page = HotkeysPageWidget(self.texts, self.settings.get('modes', {}), settings_manager=self.settings_manager)
-        self.replacements_page = ReplacementsPage(texts=self.texts, settings_manager=self.settings_manager)
-        self.voice_hotkeys_page = VoiceHotkeysPage(texts=self.texts, settings_manager=self.settings_manager)
-        self.voice_openfile_page = VoiceOpenfilePage(texts=self.texts, settings_manager=self.settings_manager)
-
-        from .window_settings_page import WindowSettingsPageWidget
-        self.window_settings_page = WindowSettingsPageWidget(self.texts, self.settings_manager)
-        self.vosk_models_page = VoskModelsPageWidget(self.settings_manager, self.texts)
-
-        # Map pages to their help anchors
-        self.help_map = {
-            self.hotkeys_page: "05_settings_hotkeys",
-            self.main_page: "06_settings_general",
-            self.input_page: "07_settings_input",
-            self.replacements_page: "08_settings_replacements",
-            self.voice_hotkeys_page: "09_settings_voice_hotkeys",
-            self.voice_openfile_page: "10_settings_voice_launch",
-            self.vosk_models_page: "11_settings_vosk_models",
-            self.window_settings_page: "12_settings_main_window",
-        }
-
-        self.add_category(self.texts.get('settings_hotkeys', 'Hotkeys'), self.hotkeys_page)
-        self.add_category(self.texts.get('settings_main', 'General Settings'), self.main_page)
-        self.add_category(self.texts.get('settings_input', 'Input Settings'), self.input_page)
-        self.add_category(self.texts.get('settings_replacements', 'Replacements'), self.replacements_page)
-        self.add_category(self.texts.get('voice_hotkeys_title', 'Voice Hotkeys'), self.voice_hotkeys_page)
-        self.add_category(self.texts.get('voice_openfile_title', 'Voice Program Launch'), self.voice_openfile_page)
-        self.add_category(self.texts.get('settings_models', 'Vosk Models'), self.vosk_models_page)
-        self.add_category(self.texts.get('settings_main_window', 'Main Window'), self.window_settings_page)
+        # Every page starts as an empty placeholder and is replaced by the real page on first view
+        for attr, title_key, default_title, _anchor in self.PAGES:
+            setattr(self, attr, None)
+            self.add_category(self.texts.get(title_key, default_title), QWidget())
+        self.ensure_page(0)
 
         self.category_list.currentRowChanged.connect(self.on_category_changed)
 
@@ -96,8 +76,7 @@ class SettingsWindow(QDialog):
 
     def show_help(self):
         """Opens the documentation link for the currently active settings page."""
-        current_widget = self.pages_stack.currentWidget()
-        anchor = self.help_map.get(current_widget)
+        anchor = self.PAGES[self.pages_stack.currentIndex()][3]
         base_url = "https://aigrator.github.io/Scribe/"
 
         if anchor:
@@ -108,15 +87,59 @@ class SettingsWindow(QDialog):
 
         webbrowser.open(url)
 
+    def _create_page(self, attr):
+        if attr == 'hotkeys_page':
+            from .hotkeys_page import HotkeysPageWidget
+            return HotkeysPageWidget(self.texts, self.settings.get('modes', {}), settings_manager=self.settings_manager)
+        if attr == 'main_page':
+            from .main_settings_page import MainSettingsPageWidget
+            return MainSettingsPageWidget(self.tray_app, self.texts, self.settings_manager)
+        if attr == 'input_page':
+            from .input_settings_page import InputSettingsPageWidget
+            return InputSettingsPageWidget(self.texts, self.settings_manager)
+        if attr == 'replacements_page':
+            from .replacements_page import ReplacementsPage
+            return ReplacementsPage(texts=self.texts, settings_manager=self.settings_manager)
+        if attr == 'voice_hotkeys_page':
+            from .voice_hotkeys_page import VoiceHotkeysPage
+            return VoiceHotkeysPage(texts=self.texts, settings_manager=self.settings_manager)
+        if attr == 'voice_openfile_page':
+            from .voice_openfile_page import VoiceOpenfilePage
+            return VoiceOpenfilePage(texts=self.texts, settings_manager=self.settings_manager)
+        if attr == 'vosk_models_page':
+            from .vosk_models_page import VoskModelsPageWidget
+            return VoskModelsPageWidget(self.settings_manager, self.texts)
+        if attr == 'window_settings_page':
+            from .window_settings_page import WindowSettingsPageWidget
+            return WindowSettingsPageWidget(self.texts, self.settings_manager)
+        if attr == 'transcript_search_page':
+            from .transcript_search_page import TranscriptSearchPageWidget
+            return TranscriptSearchPageWidget(self.texts)
+        if attr == 'diagnostics_page':
+            from .diagnostics_page import DiagnosticsPageWidget
+            return DiagnosticsPageWidget(self.tray_app, self.texts, self.settings_manager)
+        raise ValueError(f"Unknown settings page: {attr}")
+
+    def ensure_page(self, idx):
+        """Builds the page at idx if it is still a placeholder and returns it."""
+        attr = self.PAGES[idx][0]
+        page = getattr(self, attr)
+        if page is None:
+            page = self._create_page(attr)
+            placeholder = self.pages_stack.widget(idx)
+            self.pages_stack.insertWidget(idx, page)
+            self.pages_stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            setattr(self, attr, page)
+        return page
+
     def on_category_changed(self, idx):
+        if idx < 0:
+            return
+        self.ensure_page(idx)
         self.pages_stack.setCurrentIndex(idx)
         # If the hotkeys page is selected — update model hotkeys
-        if hasattr(self, 'hotkeys_page') and idx == self.category_list.row(
-            self.category_list.findItems(
-                self.texts.get('settings_hotkeys', 'Hotkeys'),
-                Qt.MatchExactly
-            )[0]
-        ):
+        if self.PAGES[idx][0] == 'hotkeys_page':
             self.hotkeys_page.update_hotkeys()
 
     def save_and_accept(self):
@@ -131,16 +154,19 @@ class SettingsWindow(QDialog):
         update_dict = {
             'modes': merged_modes,
             'models_hotkeys': merged_models_hotkeys,
-            'inserter_type': self.input_page.get_inserter_type(),
-            'keyboard_settings': self.input_page.get_keyboard_settings(),
-            'clipboard_settings': self.input_page.get_clipboard_settings(),
-            'ui_language': self.main_page.get_ui_language(),
-            'transcribe_to_file': self.main_page.get_transcribe_to_file(),
         }
+        # Pages that were never opened have nothing to save
+        if self.input_page is not None:
+            update_dict['inserter_type'] = self.input_page.get_inserter_type()
+            update_dict['keyboard_settings'] = self.input_page.get_keyboard_settings()
+            update_dict['clipboard_settings'] = self.input_page.get_clipboard_settings()
+        if self.main_page is not None:
+            update_dict['ui_language'] = self.main_page.get_ui_language()
+            update_dict['transcribe_to_file'] = self.main_page.get_transcribe_to_file()
         # Get settings from all pages and merge them
-        update_dict.update(self.replacements_page.get_settings())
-        update_dict.update(self.voice_hotkeys_page.get_settings())
-        update_dict.update(self.voice_openfile_page.get_settings())
+        for page in (self.replacements_page, self.voice_hotkeys_page, self.voice_openfile_page):
+            if page is not None:
+                update_dict.update(page.get_settings())
 
         self.settings_manager.update(update_dict)
 
@@ -158,3 +184,10 @@ class SettingsWindow(QDialog):
     def closeEvent(self, event):
         self.hide()
         event.ignore()
+
+    def shutdown(self):
+        """Stops the background work of the pages; called before the window is dropped."""
+        for attr, _title_key, _default_title, _anchor in self.PAGES:
+            page = getattr(self, attr)
+            if hasattr(page, 'shutdown'):
+                page.shutdown()
@@ -0,0 +1,150 @@
+# ui/transcript_search_page.py
+import datetime
+import logging
+import os
+import time
+
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from scribe.transcript_archive import get_transcript_archive
+from scribe.utils import get_records_path
+
+from .styles import HINT_LABEL_STYLE
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptImportThread(QThread):
+    """Imports existing transcript_*.txt files from the records folder into the archive."""
+
+    finished = pyqtSignal(int)  # number of imported lines
+    error = pyqtSignal(str)
+
+    def run(self):
+        try:
+            imported = get_transcript_archive().import_folder(get_records_path(), is_cancelled=self.isInterruptionRequested)
+            self.finished.emit(imported)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class TranscriptSearchPageWidget(QWidget):
+    SEARCH_DELAY_MS = 250  # Debounce typing before running a query
+
+    def __init__(self, texts, parent=None):
+        super().__init__(parent)
+        self.texts = texts
+        self._import_thread = None
+        self._results = []
+
+        layout = QVBoxLayout(self)
+        search_row = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText(self.texts.get('search_placeholder', 'Search saved transcriptions...'))
+        self.search_edit.setClearButtonEnabled(True)
+        search_row.addWidget(self.search_edit)
+        self.reindex_button = QPushButton(self.texts.get('search_reindex', 'Import records'))
+        self.reindex_button.clicked.connect(self.start_import)
+        search_row.addWidget(self.reindex_button)
+        layout.addLayout(search_row)
+
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels([
+            self.texts.get('search_col_date', 'Date'),
+            self.texts.get('search_col_text', 'Text'),
+            self.texts.get('search_col_file', 'File'),
+        ])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.cellDoubleClicked.connect(self.open_source_file)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet(HINT_LABEL_STYLE)
+        layout.addWidget(self.status_label)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.run_search)
+        self.search_edit.textChanged.connect(self._search_timer.start)
+
+        # Pick up transcripts written before the archive existed (cheap when everything is imported)
+        self.start_import()
+
+    def start_import(self):
+        if self._import_thread and self._import_thread.isRunning():
+            return
+        self.reindex_button.setEnabled(False)
+        self.status_label.setText(self.texts.get('search_status_indexing', 'Indexing records...'))
+        self._import_thread = TranscriptImportThread()
+        self._import_thread.finished.connect(self._on_import_finished)
+        self._import_thread.error.connect(self._on_import_error)
+        self._import_thread.start()
+
+    def _on_import_finished(self, imported):
+        self.reindex_button.setEnabled(True)
+        self.status_label.setText(self.texts.get('search_status_indexed', 'Indexed lines: {}').format(get_transcript_archive().count()))
+        if self.search_edit.text().strip():
+            self.run_search()
+
+    def _on_import_error(self, msg):
+        self.reindex_button.setEnabled(True)
+        logger.error(f"Transcript import failed: {msg}")
+        self.status_label.setText(self.texts.get('search_status_error', 'Search error:') + f" {msg}")
+
+    def run_search(self):
+        query = self.search_edit.text()
+        started = time.perf_counter()
+        try:
+            self._results = get_transcript_archive().search(query)
+        except Exception as e:
+            logger.error(f"Transcript search failed: {e}")
+            self._results = []
+            self.status_label.setText(self.texts.get('search_status_error', 'Search error:') + f" {e}")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.table.setRowCount(len(self._results))
+        for row, hit in enumerate(self._results):
+            created = hit.get('created_at')
+            date_str = datetime.datetime.fromtimestamp(created).strftime('%Y-%m-%d %H:%M') if created else ''
+            for col, value in enumerate((date_str, hit['snippet'], hit['source'])):
+                item = QTableWidgetItem(value)
+                item.setToolTip(hit['text'] if col == 1 else value)
+                self.table.setItem(row, col, item)
+        if query.strip():
+            self.status_label.setText(
+                self.texts.get('search_status_results', 'Found: {} ({:.0f} ms)').format(len(self._results), elapsed_ms)
+            )
+
+    def open_source_file(self, row, _col):
+        if row < 0 or row >= len(self._results):
+            return
+        path = os.path.join(get_records_path(), self._results[row]['source'])
+        if not os.path.exists(path):
+            return
+        try:
+            os.startfile(path)
+        except Exception as e:
+            logger.error(f"Failed to open transcript file: {e}")
+
+    def shutdown(self):
+        """Stops a running import after the current file (called by SettingsWindow.shutdown)."""
+        if self._import_thread and self._import_thread.isRunning():
+            self._import_thread.requestInterruption()
+            self._import_thread.wait()
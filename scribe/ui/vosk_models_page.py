@@ -14,6 +14,7 @@ class VoskModelsPageWidget(QWidget):
         self.texts = texts
         self.model_manager = ModelManager(get_models_path())
         self.models_dict = self.settings_manager.get('models', {})
+        self._all_models = None
         self.layout = QVBoxLayout(self)
 
         self.table = QTableWidget()
@@ -40,6 +41,14 @@ class VoskModelsPageWidget(QWidget):
         self.set_current_button.clicked.connect(self.set_selected_as_current)
         self.set_current_button.setEnabled(False)
         self.layout.addWidget(self.set_current_button)
+        # Two-pass decoding: a larger model of the current language decodes the final text
+        self.final_model_button = QPushButton(self.texts.get('vosk_models_use_for_final', 'Use selected model for final results'))
+        self.final_model_button.setToolTip(self.texts.get('vosk_models_final_tooltip',
+                                                          'The current model types the text as you speak; when you pause, '
+                                                          'the selected (larger) model decodes the phrase again and corrects it.'))
+        self.final_model_button.clicked.connect(self.toggle_selected_as_final)
+        self.final_model_button.setEnabled(False)
+        self.layout.addWidget(self.final_model_button)
         self.table.itemSelectionChanged.connect(self.on_selection_changed)
         # Initialize table on first open
         self.update_table()
@@ -76,6 +85,42 @@ class VoskModelsPageWidget(QWidget):
         self.update_table()
 
 
+    def _final_models(self):
+        return dict((self.settings_manager.get('two_pass') or {}).get('final_models', {}))
+
+    def toggle_selected_as_final(self):
+        row = self.table.currentRow()
+        all_models = self._get_all_models()
+        if row < 0 or row >= len(all_models):
+            return
+        model = all_models[row]
+        final_models = self._final_models()
+        if final_models.get(model.get('language')) == model.get('name'):
+            final_models.pop(model.get('language'), None)
+        else:
+            final_models[model.get('language')] = model.get('name')
+        two_pass = dict(self.settings_manager.get('two_pass') or {})
+        two_pass['final_models'] = final_models
+        # The controller is reloaded with the second model from on_settings_changed
+        self.settings_manager.set('two_pass', two_pass)
+        self.update_table()
+
+    def _update_final_model_button(self):
+        row = self.table.currentRow()
+        all_models = self._get_all_models()
+        if row < 0 or row >= len(all_models):
+            self.final_model_button.setEnabled(False)
+            return
+        model = all_models[row]
+        is_final = self._final_models().get(model.get('language')) == model.get('name')
+        if is_final:
+            self.final_model_button.setText(self.texts.get('vosk_models_stop_final', 'Stop using selected model for final results'))
+        else:
+            self.final_model_button.setText(self.texts.get('vosk_models_use_for_final', 'Use selected model for final results'))
+        # Only a model of the current language, other than the current model, can decode its final results
+        self.final_model_button.setEnabled(is_final or (
+            model.get('language') == self.settings_manager.get('language') and model.get('name') != self.settings_manager.get('current_model')))
+
     def open_download_dialog(self):
         # Get the list of models from github (or locally if offline)
         try:
@@ -108,6 +153,7 @@ class VoskModelsPageWidget(QWidget):
         self.models_dict = self.settings_manager.get('models', {})
         if not isinstance(self.models_dict, dict):
             self.models_dict = {}
+        self._all_models = None
         all_models = self._get_all_models()
         current_model = self.settings_manager.get('current_model', None)
         self.table.clear()
@@ -129,11 +175,14 @@ class VoskModelsPageWidget(QWidget):
                 self.table.setItem(0, col, item)
             self.delete_button.setEnabled(False)
             self.set_current_button.setEnabled(False)
+            self.final_model_button.setEnabled(False)
             return
         self.table.setRowCount(len(all_models))
         highlight_row = -1
+        final_models = self._final_models()
         for row, model in enumerate(all_models):
             is_current = (model.get('name') == current_model)
+            is_final = final_models.get(model.get('language')) == model.get('name')
             for col, _field in enumerate(fields):
                 value = str(model.get(_field, ''))
                 item = QTableWidgetItem(value)
@@ -145,6 +194,11 @@ class VoskModelsPageWidget(QWidget):
                     font.setBold(True)
                     item.setFont(font)
                     item.setToolTip(value + f"\n{self.texts.get('vosk_models_current_hint', 'Current model')}")
+                elif is_final:
+                    font = item.font()
+                    font.setItalic(True)
+                    item.setFont(font)
+                    item.setToolTip(value + f"\n{self.texts.get('vosk_models_final_hint', 'Model for final results')}")
                 self.table.setItem(row, col, item)
             if is_current:
                 highlight_row = row
@@ -159,13 +213,15 @@ class VoskModelsPageWidget(QWidget):
         # The "Set as current" button is active only if a non-current model is selected
         selected = self.table.currentRow()
         self.set_current_button.setEnabled(selected >= 0 and (highlight_row != selected))
+        self._update_final_model_button()
 
     def _get_all_models(self):
-        # Collect all models from self.models_dict for all languages
-        all_models = []
-        for lang_models in self.models_dict.values():
-            all_models.extend(lang_models)
-        return all_models
+        # Collect all models from self.models_dict for all languages (cached until the table is rebuilt)
+        if self._all_models is None:
+            self._all_models = []
+            for lang_models in self.models_dict.values():
+                self._all_models.extend(lang_models)
+        return self._all_models
 
     def on_selection_changed(self):
         selected = self.table.selectedItems()
@@ -181,6 +237,7 @@ class VoskModelsPageWidget(QWidget):
                 enable_set = True
         self.delete_button.setEnabled(enable_delete)
         self.set_current_button.setEnabled(enable_set)
+        self._update_final_model_button()
 
     def delete_selected_model(self):
         row = self.table.currentRow()
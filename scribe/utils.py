@@ -53,8 +53,25 @@ def get_models_path():
     return models_path
 
 
+def get_records_path():
+    """Get the absolute path to the records folder with transcription files.
+
+    - If frozen (PyInstaller), it's a 'records' folder next to the executable.
+    - If running from source, it's a 'records' folder in the project root.
+    The folder is not created here; callers create it when they write to it.
+    """
+    if getattr(sys, 'frozen', False):
+        base_dir = os.path.dirname(sys.executable)
+    else:
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, 'records')
+
+
 def get_specific_model_path(language, model_name):
-    """Constructs and verifies the absolute path to a specific model directory.
+    """Returns the absolute path to a specific installed model directory.
+
+    The lookup goes through the installed-model registry, which is revalidated with a few
+    directory stats instead of probing the model files.
 
     Args:
         language (str): The language of the model (e.g., 'en').
@@ -67,16 +84,24 @@ def get_specific_model_path(language, model_name):
     if not all([language, model_name]):
         return None
 
-    models_dir = get_models_path()
+    from scribe.model_registry import get_model_registry
+    return get_model_registry(get_models_path()).get_model_path(language, model_name)
+
 
-    # Construct the potential path and normalize it.
-    candidate_path = os.path.abspath(os.path.join(models_dir, language, model_name))
+def get_final_model_path(settings, language, model_path):
+    """Returns the path of the model that decodes final results in two-pass mode, or None.
 
-    # Verify that it's a valid model directory by checking for a key file.
-    if os.path.exists(os.path.join(candidate_path, 'am', 'final.mdl')):
-        return candidate_path
+    Args:
+        settings: settings dict or SettingsManager.
+        language (str): The language of the current model.
+        model_path (str): Path of the current model; choosing it for final results means single pass.
 
-    return None
+    """
+    model_name = (settings.get('two_pass') or {}).get('final_models', {}).get(language)
+    final_path = get_specific_model_path(language, model_name)
+    if not final_path or (model_path and os.path.abspath(final_path) == os.path.abspath(model_path)):
+        return None
+    return final_path
 
 
 def resource_path(relative_path):
@@ -18,23 +18,32 @@ class VoiceTyperController(QObject):
     def __init__(
         self,
         model_path,
+        model=None,
         inserter_type='keyboard',
         sample_rate=16000,
         blocksize=4000,
         settings_manager=None,
         need_resample=False,
         input_sample_rate=None,
-        application=None
+        application=None,
+        final_model=None,
+        final_model_path=None,
+        final_sample_rate=None
     ):
         super().__init__()
         self.application = application
         self.model_path = model_path
+        self.model = model  # Loaded vosk.Model; shared by every recognizer this controller creates
         self.inserter_type = inserter_type
         self.sample_rate = sample_rate
         self.blocksize = blocksize
         self.settings_manager = settings_manager
         self.need_resample = need_resample
         self.input_sample_rate = input_sample_rate
+        # Two-pass decoding: larger model that decodes every utterance again for the final text
+        self.final_model = final_model
+        self.final_model_path = final_model_path
+        self.final_sample_rate = final_sample_rate
         self.recognizer = None
         self.running = False
         self.auto_stop_countdown = -1
@@ -61,15 +70,19 @@ class VoiceTyperController(QObject):
 
         kwargs = dict(
             model_path=self.model_path,
+            model=self.model,
             sample_rate=self.sample_rate,
             blocksize=self.blocksize,
             inserter_type=self.inserter_type,
             settings_manager=self.settings_manager,
             need_resample=self.need_resample,
             input_sample_rate=self.input_sample_rate,
-            device_name=self.device_name
+            device_name=self.device_name,
+            final_model=self.final_model,
+            final_sample_rate=self.final_sample_rate
         )
         self.recognizer = VoskRecognizer(**kwargs)
+        self.model = self.recognizer.model
         # Use a direct connection to ensure the slot is executed immediately in the emitter's thread.
         # This is safe because _reset_auto_stop_timer is thread-safe.
         self.recognizer.text_recognized.connect(self._reset_auto_stop_timer, Qt.DirectConnection)
@@ -236,6 +249,48 @@ class VoiceTyperController(QObject):
             self.recognizer.inserter.wait_until_idle(timeout=0.1)
         return True
 
+    def update_input_format(self, need_resample, input_sample_rate):
+        """Applies a microphone format that changed since it was taken from the warm-start cache."""
+        logger.info(f"[VoiceTyperController] Input format updated: need_resample={need_resample}, input_sample_rate={input_sample_rate}")
+        self.need_resample = need_resample
+        self.input_sample_rate = input_sample_rate
+        if self.recognizer is not None:
+            self.recognizer.need_resample = need_resample
+            self.recognizer.input_sample_rate = input_sample_rate
+
+    def update_pre_roll(self):
+        """Applies the pre_roll setting: always-open capture that keeps the last milliseconds of speech."""
+        pre_roll = self.settings_manager.get('pre_roll') or {}
+        seconds = pre_roll.get('milliseconds', 500) / 1000.0 if pre_roll.get('enabled', False) else 0.0
+        if self.recognizer is not None and seconds != self.recognizer.pre_roll_seconds:
+            self.recognizer.set_pre_roll(seconds)
+
+    def shutdown(self):
+        """Stops recognition and releases the microphone, also when it is kept open for the pre-roll."""
+        if self.running:
+            self.stop()
+        self.running = False
+        if self.recognizer is not None:
+            self.recognizer.shutdown()
+
+    def dispose(self):
+        """Shuts down and disconnects every signal, so a replaced controller can be collected.
+
+        Used when a model reload replaces this controller; it also closes an always-open
+        microphone before the new controller opens its own.
+        """
+        self.shutdown()
+        for signal in (self.microphone_changed, self.state_changed):
+            try:
+                signal.disconnect()
+            except (TypeError, RuntimeError):
+                pass  # Nothing connected
+        if self.recognizer is not None:
+            try:
+                self.recognizer.text_recognized.disconnect()
+            except (TypeError, RuntimeError):
+                pass
+
     def set_inserter_type(self, inserter_type):
         self.inserter_type = inserter_type
         if hasattr(self.recognizer, 'set_inserter_type'):
@@ -1,22 +1,39 @@
 # vosk_recognizer.py
-import json
 import logging
-import os
+import math
 import queue
-import sys
 import threading
 import time
 import traceback
+from collections import deque
 
-import sounddevice as sd
-import vosk
 from PyQt5.QtCore import QObject, pyqtSignal
 
-from scribe.replacements import apply_replacements, apply_replacements_actions, load_replacements
-from scribe.transcribe_file import get_transcribe_file
+from scribe.decoder import FinalPassDecoder, StreamDecoder, TextProcessor
+from scribe.flight_recorder import recorder
+from scribe.latency_tracer import tracer
+from scribe.logging_config import dump_trace, trace
+from scribe.metrics import registry
+from scribe.replacements import apply_replacements
+from scribe.startup import load_vosk_model
+from scribe.transcribe_file import close_transcribe_file, get_transcribe_file
+from scribe.transcript_archive import archive_transcript
+from scribe.watchdog import watchdog
 
 logger = logging.getLogger(__name__)
 
+FINAL_PASS_DRAIN_SECONDS = 2.0  # On stop, how long utterances still in the final pass may take
+
+AUDIO_BLOCKS = registry.counter('scribe_audio_blocks_total', "Audio blocks queued for recognition")
+AUDIO_SECONDS = registry.counter('scribe_audio_seconds_total', "Seconds of audio decoded")
+AUDIO_OVERFLOWS = registry.counter('scribe_audio_overflows_total', "Input overflows reported by the audio device (audio lost before capture)")
+AUDIO_DROPPED = registry.counter('scribe_audio_blocks_dropped_total', "Captured blocks discarded undecoded when recognition stopped")
+AUDIO_QUEUE_DEPTH = registry.gauge('scribe_audio_queue_depth', "Audio blocks waiting to be decoded")
+RECOGNITION_RUNNING = registry.gauge('scribe_recognition_running', "1 while recognition is running")
+PARTIALS = registry.counter('scribe_results_total', "Recognition results applied", kind='partial')
+FINALS = registry.counter('scribe_results_total', "Recognition results applied", kind='final')
+LOOP_ERRORS = registry.counter('scribe_recognition_errors_total', "Unexpected errors that stopped the recognition loop")
+
 class VoskRecognizer(QObject):
     rms_signal = pyqtSignal(float)  # RMS level of the audio signal (0..1)
     recognition_state_changed = pyqtSignal(bool, str)  # running, mode
@@ -25,6 +42,7 @@ class VoskRecognizer(QObject):
     def __init__(
         self,
         model_path,
+        model=None,
         sample_rate=16000,
         blocksize=4000,
         partial_interval=0.5,
@@ -35,72 +53,83 @@ class VoskRecognizer(QObject):
         final_handler=None,
         partial_handler=None,
         need_resample=False,
-        input_sample_rate=None
+        input_sample_rate=None,
+        final_model=None,
+        final_sample_rate=None,
+        inserter=None,
+        stream_factory=None,
+        clock=None
     ):
         super().__init__()
         """
         model_path: path to the unpacked Vosk model
+        model: already loaded vosk.Model for model_path (loaded here if None)
         sample_rate: usually 16000
         blocksize: audio block size, for example 4000 (~0.25 s at 16kHz)
         partial_interval: minimum interval (sec) between partial applications
-        inserter_type: type of text inserter ('clipboard' or 'winapi')
+        inserter_type: type of text inserter ('clipboard', 'keyboard' or 'recording')
+        final_model: optional larger vosk.Model for two-pass decoding; model then only drives
+            the live partials and ends utterances, and final_model decodes each utterance again
+        final_sample_rate: sample rate of final_model (defaults to sample_rate)
+        inserter: ready TextInserter to use instead of one built from inserter_type
+        stream_factory: replaces sounddevice.RawInputStream (same keyword arguments; device is
+            the device name), e.g. replay.WavStream
+        clock: replaces time.time for the partial throttle, e.g. the replayed audio position
         """
         logger.info(f"[VoskRecognizer] __init__ called. Model path: {model_path}, Sample rate: {sample_rate}, Device name: {device_name}")
         self.device_name = device_name
 
-        # On Windows, loading models from paths with non-ASCII characters is problematic.
-        # A workaround is to temporarily change the current directory.
-        original_cwd = None
         try:
-            if model_path and sys.platform == 'win32':
-                original_cwd = os.getcwd()
-                os.chdir(os.path.dirname(model_path))
-                # After changing the directory, we load the model using its base name.
-                self.model = vosk.Model(os.path.basename(model_path))
-            else:
-                self.model = vosk.Model(model_path)
+            self.model = model if model is not None else load_vosk_model(model_path)
         except Exception as e:
             logger.error(f"Model loading error: {e}")
             raise
-        finally:
-            # Restore the original working directory immediately.
-            if original_cwd:
-                os.chdir(original_cwd)
+        self.model_path = model_path
         self.sample_rate = sample_rate
         self.blocksize = blocksize
         self.PARTIAL_INTERVAL = partial_interval
         self.need_resample = need_resample
         self.input_sample_rate = input_sample_rate if input_sample_rate else sample_rate
+        self.final_model = final_model
+        self.final_sample_rate = final_sample_rate or sample_rate
+        self.stream_factory = stream_factory
+        self._clock = clock or time.time
 
-        # PCM data queue
+        # PCM data queue of (block, perf_counter stamp taken in the audio callback)
         self.audio_queue = queue.Queue()
 
         # Partial-state
         self.partial_prev = ""       # last inserted partial
         self.partial_buffer = ""     # last received Vosk partial
         self.last_partial_time = 0.0 # time of last partial_prev application
+        # Two-pass: utterances shown with the small model's text until the final pass returns,
+        # oldest first, as [utterance id, shown text, small model text, final pass text or None,
+        # capture stamp of the utterance's last block]
+        self._pending_finals = deque()
+        self._utterance_id = 0
 
         self.running = False
         self.stream = None
         self.recognition_thread = None
+        self._generation = 0  # A recognition loop exits when it is no longer the current one
         self._lock = threading.Lock()
 
+        # Always-open capture: while idle the stream stays open and keeps only the last
+        # pre_roll_seconds of audio, which start() feeds to the decoder first
+        self.pre_roll_seconds = 0.0
+        self._pre_roll = deque(maxlen=0)
+        self._capture_lock = threading.Lock()  # Orders pre-roll blocks before live ones
+
 
         self.settings_manager = settings_manager
         self.mode = mode  # 'transcribe' or 'command'
         self.final_handler = final_handler  # callback for final text
         self.partial_handler = partial_handler  # callback for partial (optional)
-        # Text inserter. Available options: 'clipboard', 'keyboard'
-        if inserter_type == 'clipboard':
-            from scribe.inserters.clipboard_text_inserter import ClipboardTextInserter
-            self.inserter = ClipboardTextInserter(self.settings_manager)
-        elif inserter_type == 'keyboard':
-            from scribe.inserters.keyboard_text_inserter import KeyboardTextInserter
-            self.inserter = KeyboardTextInserter(self.settings_manager)
+        # Text inserter. Available options: 'clipboard', 'keyboard', 'recording'
+        if inserter is not None:
+            self.inserter = inserter
         else:
-            logger.warning(f"Unknown inserter_type '{inserter_type}', using ClipboardTextInserter")
-            from scribe.inserters.clipboard_text_inserter import ClipboardTextInserter
-            self.inserter = ClipboardTextInserter(self.settings_manager)
+            self.inserter = self._create_inserter(inserter_type)
 
         # Load replacements and flags during initialization
         self._load_replacements()
@@ -112,6 +141,7 @@ class VoskRecognizer(QObject):
         When changing mode, resets partial_prev and partial_buffer to avoid text deletion when switching from command mode.
         """
         self.mode = mode
+        recorder.event('mode', mode=mode)
         # Emit signal after mode change
         self.recognition_state_changed.emit(self.running, self.mode)
         # If final_handler is explicitly passed — use it, else:
@@ -139,7 +169,11 @@ class VoskRecognizer(QObject):
     """
     def _load_replacements(self):
         """Loads replacements and flags from settings for the current language (via replacements.py)."""
-        self._replacements, self._replacements_enabled, self._partial_replacements_enabled, self._lang = load_replacements(self.settings_manager)
+        self._text_processor = TextProcessor.from_settings(self.settings_manager)
+        self._replacements = self._text_processor.replacements
+        self._replacements_enabled = self._text_processor.enabled
+        self._partial_replacements_enabled = self._text_processor.partial_enabled
+        self._lang = self._text_processor.lang
 
     def _apply_replacements(self, text):
         """Applies replacements to text only by individual words (via replacements.py)."""
@@ -147,9 +181,21 @@ class VoskRecognizer(QObject):
 
     def _audio_callback(self, indata, frames, time_info, status):
         """Callback for audio input stream. Puts audio data into the queue for recognition. Also calculates RMS and sends it via a signal."""
+        captured = time.perf_counter()
+        watchdog.beat('audio')
         if status:
-            logger.info(f"Stream status: {status}")
-        self.audio_queue.put(bytes(indata))
+            logger.info("Stream status: %s", status)
+            if getattr(status, 'input_overflow', False):
+                AUDIO_OVERFLOWS.inc()
+        data = bytes(indata)
+        with self._capture_lock:
+            if not self.running:
+                # Always-open capture while idle: the oldest block falls out of the pre-roll
+                self._pre_roll.append(data)
+                return
+            self.audio_queue.put((data, captured))
+        AUDIO_BLOCKS.inc()
+        AUDIO_QUEUE_DEPTH.set(self.audio_queue.qsize())
         # Calculate RMS (signal level)
         try:
             import numpy as np
@@ -162,8 +208,87 @@ class VoskRecognizer(QObject):
             pass
 
     def set_device(self, device_name):
-        """Set the device name for the next start."""
+        """Set the device name for the next start (an idle always-open stream is reopened on it)."""
         self.device_name = device_name
+        if self.stream is not None and not self.running:
+            self._close_stream()
+            self._open_stream_safe()
+
+    def set_pre_roll(self, seconds):
+        """Enables always-open capture with a pre-roll of the last seconds of audio (0 disables it).
+
+        The microphone then stays open between recognitions, so speech that begins with the
+        hotkey is not lost while the device opens.
+        """
+        seconds = max(0.0, float(seconds))
+        blocks = math.ceil(seconds * self.sample_rate / self.blocksize) if seconds else 0
+        with self._capture_lock:
+            self.pre_roll_seconds = seconds
+            self._pre_roll = deque(self._pre_roll, maxlen=blocks)
+        if seconds and self.stream is None:
+            logger.info(f"Always-open capture with {seconds * 1000:.0f} ms pre-roll")
+            self._open_stream_safe()
+        elif not seconds and self.stream is not None and not self.running:
+            self._close_stream()
+
+    def shutdown(self):
+        """Stops recognition and closes the microphone, including an always-open stream, and the transcription file."""
+        self.stop()
+        with self._capture_lock:
+            self.pre_roll_seconds = 0.0
+            self._pre_roll = deque(maxlen=0)
+        if self.stream is not None:
+            self._close_stream()
+        close_transcribe_file(self)
+
+    def _take_pre_roll(self):
+        """Returns the buffered pre-roll trimmed to pre_roll_seconds and empties the buffer."""
+        data = b''.join(self._pre_roll)
+        self._pre_roll.clear()
+        keep = int(self.pre_roll_seconds * self.sample_rate) * 2
+        return data[-keep:] if keep else b''
+
+    def _open_stream(self):
+        factory, device_index = self.stream_factory, self.device_name
+        if factory is None:
+            # Imported on first use: PortAudio initialization is not needed until recognition starts
+            import sounddevice as sd
+            factory = sd.RawInputStream
+
+            # If device name is specified, find its index
+            device_index = None
+            if self.device_name:
+                for idx, dev in enumerate(sd.query_devices()):
+                    if dev['name'] == self.device_name and dev['max_input_channels'] > 0:
+                        device_index = idx
+                        break
+                if device_index is None:
+                    logger.warning(f"[self.id][{id(self)}] [WARN] Device with name not found: {self.device_name}, using default")
+        self.stream = factory(
+            samplerate=self.sample_rate,
+            blocksize=self.blocksize,
+            dtype='int16',
+            channels=1,
+            callback=self._audio_callback,
+            device=device_index
+        )
+        self.stream.start()
+
+    def _open_stream_safe(self):
+        try:
+            self._open_stream()
+        except Exception as e:
+            logger.error(f"Failed to open microphone for always-open capture: {e}")
+            self.stream = None
+
+    def _close_stream(self):
+        try:
+            self.stream.callback = None
+            self.stream.stop()
+            self.stream.close()
+        except Exception as e:
+            logger.error(f"Exception while stopping audio stream: {e}")
+        self.stream = None
 
     def start(self):
         """Starts the speech recognition process, microphone stream, and recognition thread. Creates a file for transcription if enabled in settings."""
@@ -174,7 +299,22 @@ class VoskRecognizer(QObject):
             return
         logger.info(f"[self.id][{recognizer_id}] inserter={type(self.inserter).__name__}")
         self.inserter.start()
-        self.running = True
+        # What a replay of a flight recording needs to run the session the same way
+        recorder.start_session(sample_rate=self.sample_rate, model_path=self.model_path, mode=self.mode,
+                               blocksize=self.blocksize, partial_interval=self.PARTIAL_INTERVAL,
+                               two_pass=self.final_model is not None)
+        with self._capture_lock:
+            if self.stream is not None:
+                # Always-open capture: the speech just before the hotkey goes to the decoder first
+                pre_roll = self._take_pre_roll()
+                if pre_roll:
+                    logger.debug(f"[self.id][{recognizer_id}] Feeding {len(pre_roll) // 2 / self.sample_rate:.2f} s of pre-roll")
+                    self.audio_queue.put((pre_roll, time.perf_counter()))
+            self.running = True
+            self._generation += 1
+        self._pending_finals.clear()
+        watchdog.reset()
+        RECOGNITION_RUNNING.set(1)
         # Emit signal after start
         self.recognition_state_changed.emit(self.running, self.mode)
         self.partial_prev = ""
@@ -192,32 +332,17 @@ class VoskRecognizer(QObject):
             get_transcribe_file(self)
 
         # Start recognition in a thread
-        self.recognition_thread = threading.Thread(target=self._recognition_loop, daemon=True)
+        self.recognition_thread = threading.Thread(target=self._recognition_loop, args=(self._generation,), name='scribe-recognition', daemon=True)
         self.recognition_thread.start()
 
-        # Open microphone
+        # Open microphone (already open with always-open capture)
         try:
-            # If device name is specified, find its index
-            device_index = None
-            if self.device_name:
-                for idx, dev in enumerate(sd.query_devices()):
-                    if dev['name'] == self.device_name and dev['max_input_channels'] > 0:
-                        device_index = idx
-                        break
-                if device_index is None:
-                    logger.warning(f"[self.id][{recognizer_id}] [WARN] Device with name not found: {self.device_name}, using default")
-            self.stream = sd.RawInputStream(
-                samplerate=self.sample_rate,
-                blocksize=self.blocksize,
-                dtype='int16',
-                channels=1,
-                callback=self._audio_callback,
-                device=device_index
-            )
-            self.stream.start()
+            if self.stream is None:
+                self._open_stream()
         except Exception as e:
             logger.error(f"[self.id][{recognizer_id}] Failed to open microphone: {e}")
             self.running = False
+            RECOGNITION_RUNNING.set(0)
             return
 
         logger.info(f"[self.id][{recognizer_id}] Recognition started (running={self.running})")
@@ -231,26 +356,36 @@ class VoskRecognizer(QObject):
         # 1. Stop the audio stream immediately to prevent new data from entering the queue.
         # This is critical for a clean shutdown, especially on systems like Windows 7
         # where stream termination might not be instantaneous.
-        if self.stream:
-            try:
-                self.stream.callback = None
-                self.stream.stop()
-                self.stream.close()
-            except Exception as e:
-                logger.error(f"Exception while stopping audio stream: {e}")
-            self.stream = None
+        # With always-open capture the stream stays open and refills the pre-roll instead.
+        if self.stream and not self.pre_roll_seconds:
+            self._close_stream()
 
         # 2. Signal the recognition thread to stop processing.
-        self.running = False
+        with self._capture_lock:
+            self.running = False
+        recorder.event('stop')
 
         # 3. Clear the queue to discard any audio data that was buffered before the stop call.
-        # This prevents the thread from processing stale data.
-        with self.audio_queue.mutex:
-            self.audio_queue.queue.clear()
+        # This prevents the thread from processing stale data. Blocks are marked done so
+        # wait_until_processed() does not wait for them.
+        while True:
+            try:
+                self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.audio_queue.task_done()
+            AUDIO_DROPPED.inc()
+        AUDIO_QUEUE_DEPTH.set(0)
+        RECOGNITION_RUNNING.set(0)
 
         # 4. The recognition thread is a daemon, so we don't need to join it.
         # It will exit automatically when the `self.running` flag is False.
         # Joining it here can cause deadlocks if stop() is called from a worker thread.
+        # With two-pass decoding it is given a bounded time to commit the utterances still in
+        # the final pass, so their text is inserted before the inserter stops.
+        thread = self.recognition_thread
+        if self.final_model is not None and thread is not None and thread is not threading.current_thread():
+            thread.join(FINAL_PASS_DRAIN_SECONDS + 1.0)
         self.recognition_thread = None
 
         # 5. Wait for any pending text insertion operations to complete.
@@ -261,70 +396,220 @@ class VoskRecognizer(QObject):
 
         # 6. Emit the final state change signal after everything is truly stopped.
         self.recognition_state_changed.emit(self.running, self.mode)
+        tracer.log_summary()
 
+    def restart_stream(self):
+        """Closes and reopens the microphone stream; recognition keeps running (see watchdog.py)."""
+        logger.warning(f"[self.id][{id(self)}] Reopening the audio stream")
+        if self.stream is not None:
+            self._close_stream()
+        self._open_stream()
 
-    def _recognition_loop(self):
+    def restart_decoder(self):
+        """Runs a new recognition loop thread on the loaded model (see watchdog.py).
+
+        Also restarts a loop that stopped on an error. A stalled loop is abandoned: once its
+        decoder call returns it exits without touching the text or the pending utterances.
+        Utterances still waiting for its final pass are committed with the small model's text.
+        """
+        logger.warning(f"[self.id][{id(self)}] Restarting the recognition loop")
+        with self._capture_lock:
+            was_running = self.running
+            self.running = True
+            self._generation += 1
+        # After the generation changed, so the abandoned loop no longer touches them
+        if self._pending_finals:
+            logger.warning(f"Final pass abandoned; keeping the live text of {len(self._pending_finals)} utterance(s)")
+            self._commit_pending_as_is()
+        RECOGNITION_RUNNING.set(1)
+        self.recognition_thread = threading.Thread(target=self._recognition_loop, args=(self._generation,), name='scribe-recognition', daemon=True)
+        self.recognition_thread.start()
+        if not was_running:
+            self.recognition_state_changed.emit(self.running, self.mode)
+
+    def _recognition_loop(self, generation=0):
         """Main recognition loop.
 
         Reads audio data from the queue, processes it with Vosk recognizer,
         and applies partial and final results using the appropriate handlers.
         """
-        recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
-        while self.running:
+        decoder = StreamDecoder(self.model, self.sample_rate)
+        final_pass = None
+        if self.final_model is not None:
+            final_pass = FinalPassDecoder(self.final_model, self.final_sample_rate, self.sample_rate)
+        utterance = []  # Two-pass: audio of the current utterance
+        while self.running and generation == self._generation:
+            watchdog.beat('decoder')
             try:
-                data = self.audio_queue.get(timeout=0.2)
-
-                if recognizer.AcceptWaveform(data):
-                    # Final result: process immediately
-                    try:
-                        res = json.loads(recognizer.Result())
-                        final_text = res.get("text", "").strip()
-                    except Exception:
-                        final_text = ""
-                    if final_text:
-                        self._apply_final(final_text)
+                if final_pass is not None:
+                    results = final_pass.poll()
+                    if generation != self._generation:
+                        break
+                    self._commit_final_pass(results)
+                data, captured = self.audio_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            except Exception as e:
+                self._on_loop_error(e, generation)
+                continue
+            try:
+                tracer.record('queue', time.perf_counter() - captured)
+                AUDIO_SECONDS.inc(len(data) / 2 / self.sample_rate)
+                recorder.record_audio(data)
+                if final_pass is not None:
+                    utterance.append(data)
+
+                kind, text = decoder.accept(data)
+                if generation != self._generation:
+                    # Abandoned by restart_decoder() while decoding: the new loop owns the text
+                    break
+                tracer.record('decode', decoder.last_decode_seconds)
+                tracer.record('parse', decoder.last_parse_seconds)
+                if kind == 'final':
+                    if final_pass is not None:
+                        # Shown as is until the large model has decoded the same audio
+                        if text:
+                            self._set_trace('partial', captured)
+                            self._submit_final_pass(final_pass, text, b''.join(utterance), captured)
+                        utterance = []
+                    elif text:
+                        # Final result: process immediately
+                        self._set_trace('final', captured)
+                        self._apply_final(text)
+                        FINALS.inc()
                 else:
                     # Partial result: save to buffer and check time
-                    try:
-                        pres = json.loads(recognizer.PartialResult())
-                        partial = pres.get("partial", "").strip()
-                    except Exception:
-                        partial = ""
-                    if partial != self.partial_buffer:
-                        self.partial_buffer = partial
-                        logger.debug(f"[Partial-buffer] New partial: '{partial}'")
+                    if text != self.partial_buffer:
+                        self.partial_buffer = text
+                        trace(logger, "[Partial-buffer] New partial: '%s'", text)
                     # Apply only if partial_buffer differs from partial_prev and enough time has passed
-                    now = time.time()
+                    now = self._clock()
                     if self.partial_buffer and self.partial_buffer != self.partial_prev and (now - self.last_partial_time >= self.PARTIAL_INTERVAL):
+                        self._set_trace('partial', captured)
                         self._apply_partial(self.partial_buffer)
                         self.last_partial_time = now
+                        PARTIALS.inc()
                     # If Vosk gave an empty partial and there was a previous partial_prev, erase leftovers
-                    if not self.partial_buffer and self.partial_prev:
-                        logger.debug(f"[Partial-buffer] partial is empty, erasing leftovers '{self.partial_prev}'")
-                        with self._lock:
-                            self.inserter.erase_chars(len(self.partial_prev))
-                            self.partial_prev = ""
+                    # (utterances waiting for the final pass stay)
+                    pending = self._pending_text()
+                    if not self.partial_buffer and self.partial_prev != pending:
+                        trace(logger, "[Partial-buffer] partial is empty, erasing leftovers '%s'", self.partial_prev)
+                        self._set_trace('partial', captured)
+                        self.partial_prev = self._apply_diff(self.partial_prev, pending, "Partial")
                         self.last_partial_time = now
-            except queue.Empty:
-                continue
             except Exception as e:
-                logger.error(f"FATAL ERROR in recognition loop: {e}")
-                logger.error(traceback.format_exc())
-                # It's better to stop the loop on unexpected error
-                self.running = False
+                self._on_loop_error(e, generation)
+            finally:
+                self.audio_queue.task_done()
+
+        if generation != self._generation:
+            # Replaced by restart_decoder() or a new start(); the current loop owns the text
+            if final_pass is not None:
+                final_pass.close()
+            return
+
+        if final_pass is not None:
+            self._drain_final_pass(final_pass)
 
         # On finish: clear any remaining partial
         with self._lock:
             if self.partial_prev:
-                logger.debug(f"Clearing remaining partial on finish: '{self.partial_prev}'")
+                trace(logger, "Clearing remaining partial on finish: '%s'", self.partial_prev)
                 self.inserter.erase_chars(len(self.partial_prev))
                 self.partial_prev = ""
 
+    def _on_loop_error(self, e, generation):
+        LOOP_ERRORS.inc()
+        logger.error(f"FATAL ERROR in recognition loop: {e}")
+        logger.error(traceback.format_exc())
+        dump_trace("Recognition loop failed")
+        recorder.event('error', message=f"{type(e).__name__}: {e}")
+        recorder.dump(f"recognition loop failed: {type(e).__name__}: {e}")
+        # It's better to stop the loop on unexpected error (an abandoned loop leaves the current one running)
+        if generation == self._generation:
+            self.running = False
+
+    def wait_until_processed(self, timeout=5.0):
+        """Waits until every queued audio block has been decoded and applied.
+
+        Used by replay.WavStream to feed blocks in lockstep with the recognition loop.
+        Returns False on timeout or if recognition stopped with blocks left.
+        """
+        deadline = time.monotonic() + timeout
+        with self.audio_queue.all_tasks_done:
+            while self.audio_queue.unfinished_tasks and self.running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.audio_queue.all_tasks_done.wait(min(0.1, remaining))
+            return not self.audio_queue.unfinished_tasks
+
+    def _set_trace(self, kind, origin):
+        """Tags the inserter commands queued next with the capture stamp of the audio behind them."""
+        self.inserter.trace_context = {'origin': origin, 'kind': kind}
+
+    def _pending_text(self):
+        """Text shown for utterances waiting for the final pass (empty unless partials are typed)."""
+        if not self._pending_finals or self.mode != 'transcribe' or self.partial_handler:
+            return ""
+        return ''.join(item[1] + " " for item in self._pending_finals)
+
+    def _submit_final_pass(self, final_pass, text, audio, captured):
+        """Keeps the small model's final on screen and sends its audio to the large model."""
+        self._utterance_id += 1
+        self._pending_finals.append([self._utterance_id, self._text_processor.partial(text), text, None, captured])
+        final_pass.submit(self._utterance_id, audio)
+        trace(logger, "[Final pass] utterance %d submitted: '%s'", self._utterance_id, text)
+        self.partial_buffer = ""
+        if self.mode == 'transcribe' and not self.partial_handler:
+            self.partial_prev = self._apply_diff(self.partial_prev, self._pending_text(), "Pending")
+        self.last_partial_time = self._clock()
+
+    def _commit_final_pass(self, results):
+        """Records final pass results and commits finished utterances in the order they were spoken."""
+        for utterance_id, text, seconds in results:
+            for item in self._pending_finals:
+                if item[0] == utterance_id:
+                    # An empty or failed final pass keeps the small model's text
+                    item[3] = text or item[2]
+                    trace(logger, "[Final pass] utterance %d decoded in %.2f s: '%s'", utterance_id, seconds, text)
+            tracer.record('final_pass', seconds)
+        while self._pending_finals and self._pending_finals[0][3] is not None:
+            prefix = self._pending_text()
+            live = self.partial_prev[len(prefix):] if self.partial_prev.startswith(prefix) else ""
+            item = self._pending_finals.popleft()
+            final_text = item[3]
+            self._set_trace('final', item[4])
+            partial_buffer = self.partial_buffer
+            self._apply_final(final_text, tail=self._pending_text() + live)
+            self.partial_buffer = partial_buffer
+            FINALS.inc()
+
+    def _commit_pending_as_is(self):
+        """Commits every utterance waiting for the final pass, with the small model's text where it has no result."""
+        for item in self._pending_finals:
+            if item[3] is None:
+                item[3] = item[2]
+        self._commit_final_pass([])
+
+    def _drain_final_pass(self, final_pass):
+        """Commits the utterances left in the final pass when recognition stops."""
+        deadline = time.monotonic() + FINAL_PASS_DRAIN_SECONDS
+        while self._pending_finals:
+            result = final_pass.wait(max(0.0, deadline - time.monotonic()))
+            if result is None:
+                logger.warning(f"Final pass too slow; keeping the live text of {len(self._pending_finals)} utterance(s)")
+                self._commit_pending_as_is()
+                break
+            self._commit_final_pass([result])
+        final_pass.close()
+
     def _apply_diff(self, old_text: str, new_text: str, context: str):
         """Applies the difference between old_text and new_text using the inserter.
 
         Deletes the differing suffix from old_text and inserts the new suffix from new_text.
         """
+        started = time.perf_counter()
         with self._lock:
             # Calculate common prefix
             common_len = 0
@@ -334,20 +619,18 @@ class VoskRecognizer(QObject):
             to_delete = len(old_text) - common_len
             suffix = new_text[common_len:]
 
-            # Logging
-            logger.debug(f"[{context}->apply] old='{old_text}' new='{new_text}'")
-            logger.debug(f"[{context}->apply] common_len={common_len}, to_delete={to_delete}, suffix='{suffix}'")
+            trace(logger, "[%s->apply] old='%s' new='%s' common_len=%d to_delete=%d suffix='%s'",
+                  context, old_text, new_text, common_len, to_delete, suffix)
 
             # Deletion
             if to_delete > 0:
-                logger.debug(f"[{context}->apply] Deleting {to_delete} characters")
                 self.inserter.erase_chars(to_delete)
 
             # Insertion
             if suffix:
-                logger.debug(f"[{context}->apply] Inserting suffix via buffer: '{suffix}'")
                 self.inserter.insert_text(suffix)
 
+            tracer.record('diff', time.perf_counter() - started)
             return new_text  # Return the updated value
 
     def _apply_partial(self, partial: str):
@@ -357,43 +640,32 @@ class VoskRecognizer(QObject):
         so that text replaced by special commands is not inserted. Otherwise, uses the clean text directly.
         If a user partial_handler is set, calls it. Otherwise, performs standard transcription behavior.
         """
-        from scribe.replacements import parse_replace_string
-        actions = parse_replace_string(partial)
-        partial_clean = ''.join(act['value'] for act in actions if act['type'] == 'text')
-        # If partial replacements are enabled, apply them to the clean text,
-        # but use apply_replacements_actions to avoid inserting text replaced by special commands
-        if self._partial_replacements_enabled:
-            from scribe.replacements import apply_replacements_actions as ara
-            actions2 = ara(partial_clean, self._replacements)
-            # In partial, insert only those text fragments that do not immediately follow a special command
-            partial = ''.join(act['value'] for act in actions2 if act['type'] == 'text')
-        else:
-            partial = partial_clean
+        started = time.perf_counter()
+        partial = self._text_processor.partial(partial)
+        tracer.record('replacements', time.perf_counter() - started)
+        recorder.event('partial', text=partial)
         # If a user partial_handler is set, call it
         if self.partial_handler:
             self.partial_handler(partial)
             return
         # Standard behavior (transcription)
         if self.mode == 'transcribe':
-            self.partial_prev = self._apply_diff(self.partial_prev, partial, "Partial")
+            self.partial_prev = self._apply_diff(self.partial_prev, self._pending_text() + partial, "Partial")
         self.text_recognized.emit(partial)
 
-    def _apply_final(self, final_text: str):
+    def _apply_final(self, final_text: str, tail: str = ""):
         """Applies replacements to the final text if enabled. Handles writing the final result to file if enabled in settings.
 
         Calls the user final_handler if set. Handles text insertion unless in command mode.
+        tail is text that stays on screen after this utterance (two-pass: later utterances
+        and the live partial); partial_prev then continues with it.
         """
-        actions = None
-        if self._replacements_enabled:
-            actions = apply_replacements_actions(final_text, self._replacements)
-            # For file writing and callback, collect a string without special commands
-            final_text_plain = ''.join(
-                act['value'] if act['type'] == 'text' else '' for act in actions
-            )
-            diff_text = final_text_plain
-        else:
-            final_text_plain = final_text
-            diff_text = final_text
+        # For file writing and callback, use a string without special commands
+        started = time.perf_counter()
+        final_text_plain, actions = self._text_processor.final(final_text)
+        tracer.record('replacements', time.perf_counter() - started)
+        recorder.event('final', text=final_text_plain, raw=final_text)
+        diff_text = final_text_plain
 
         # Write the final result to file if enabled in settings
         settings = {}
@@ -405,6 +677,9 @@ class VoskRecognizer(QObject):
         if enabled:
             f = get_transcribe_file(self)
             if f and final_text_plain.strip():
+                # Index the line before writing it, so the background importer never imports it twice
+                if settings.get('archive_transcripts', True):
+                    archive_transcript(f.name, final_text_plain.strip())
                 try:
                     f.write(final_text_plain.strip() + '\n')
                     f.flush()
@@ -418,13 +693,18 @@ class VoskRecognizer(QObject):
 
         # Insert text only if not in command mode
         if self.mode != 'command':
+            started = time.perf_counter()
             has_keys = actions is not None and any(act['type'] == 'key' for act in actions)
             if hasattr(self.inserter, 'insert_actions') and actions is not None and has_keys:
                 # If there are special commands, always delete the entire partial_prev
                 if self.partial_prev:
-                    logger.debug(f"[Final->apply] erase_chars (full) before insert_actions: {len(self.partial_prev)}")
+                    trace(logger, "[Final->apply] erase_chars (full) before insert_actions: %d", len(self.partial_prev))
                     self.inserter.erase_chars(len(self.partial_prev))
                 self.inserter.insert_actions(actions)
+                self.inserter.insert_text(" " + tail)
+            elif tail:
+                # Only the text after the first changed character is retyped
+                self._apply_diff(self.partial_prev, diff_text + " " + tail, "Final")
             else:
                 # diff logic: get what actually needs to be inserted
                 old_text = self.partial_prev
@@ -435,23 +715,39 @@ class VoskRecognizer(QObject):
                     common_len += 1
                 to_delete = len(old_text) - common_len
                 suffix = new_text[common_len:]
-                logger.debug(f"[Final->apply] old='{old_text}' new='{new_text}'")
-                logger.debug(f"[Final->apply] common_len={common_len}, to_delete={to_delete}, suffix='{suffix}'")
+                trace(logger, "[Final->apply] old='%s' new='%s' common_len=%d to_delete=%d suffix='%s'",
+                      old_text, new_text, common_len, to_delete, suffix)
                 if to_delete > 0:
-                    logger.debug(f"[Final->apply] Deleting {to_delete} characters")
                     self.inserter.erase_chars(to_delete)
                 if suffix or not old_text:
-                    logger.debug(f"[Final->apply] Inserting suffix via buffer: '{suffix}'")
                     self.inserter.insert_text(suffix)
-            logger.debug("[Final->apply] Adding space after final")
-            self.inserter.insert_text(" ")
+                # Space after the final
+                self.inserter.insert_text(" ")
+            if not tail:  # With a tail the time is recorded by _apply_diff
+                tracer.record('diff', time.perf_counter() - started)
 
-        self.partial_prev = ""
+        self.partial_prev = tail
         self.partial_buffer = ""
-        self.last_partial_time = time.time()
-        logger.info(f"[✓] {final_text_plain}")
+        self.last_partial_time = self._clock()
+        logger.info("[✓] %s", final_text_plain)
         self.text_recognized.emit(final_text_plain)
 
+    def _create_inserter(self, inserter_type):
+        """Builds the text inserter for inserter_type ('clipboard', 'keyboard' or 'recording')."""
+        if inserter_type == 'clipboard':
+            from scribe.inserters.clipboard_text_inserter import ClipboardTextInserter
+            return ClipboardTextInserter(self.settings_manager)
+        if inserter_type == 'keyboard':
+            from scribe.inserters.keyboard_text_inserter import KeyboardTextInserter
+            return KeyboardTextInserter(self.settings_manager)
+        if inserter_type == 'recording':
+            # In-memory document instead of the focused window (benchmarks/soak.py)
+            from scribe.inserters.recording_text_inserter import RecordingTextInserter
+            return RecordingTextInserter(self.settings_manager)
+        logger.warning(f"Unknown inserter_type '{inserter_type}', using ClipboardTextInserter")
+        from scribe.inserters.clipboard_text_inserter import ClipboardTextInserter
+        return ClipboardTextInserter(self.settings_manager)
+
     def set_inserter_type(self, inserter_type):
         """Allows changing the text insertion method without reloading the model.
 
@@ -460,16 +756,6 @@ class VoskRecognizer(QObject):
         was_running = getattr(self, 'running', False)
         if was_running:
             self.inserter.stop()
-        self.settings_manager = self.settings_manager  # just in case
-        if inserter_type == 'clipboard':
-            from scribe.inserters.clipboard_text_inserter import ClipboardTextInserter
-            self.inserter = ClipboardTextInserter(self.settings_manager)
-        elif inserter_type == 'keyboard':
-            from scribe.inserters.keyboard_text_inserter import KeyboardTextInserter
-            self.inserter = KeyboardTextInserter(self.settings_manager)
-        else:
-            logger.warning(f"Unknown inserter_type '{inserter_type}', using ClipboardTextInserter")
-            from scribe.inserters.clipboard_text_inserter import ClipboardTextInserter
-            self.inserter = ClipboardTextInserter(self.settings_manager)
+        self.inserter = self._create_inserter(inserter_type)
         if was_running:
             self.inserter.start()
@@ -0,0 +1,92 @@
+# warm_cache.py
+"""Warm-start cache: last-known state that lets a relaunch skip slow probing.
+
+Holds the input device table, microphone format checks, parsed translations and rendered
+tray icons in one versioned JSON file in the app data folder. Values are used immediately
+on startup and validated in the background (see Application._validate_warm_state); a version change
+or a corrupt file simply starts with an empty cache.
+"""
+import json
+import logging
+import os
+import threading
+
+from scribe.utils import get_app_data_path
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = 'warm_cache.json'
+CACHE_VERSION = 1  # Bump when the layout of any section changes
+MAX_ICONS = 32  # Rendered icons kept between runs
+
+
+class WarmStartCache:
+    """Sections of key/value pairs persisted as one JSON document."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sections = {}
+        self._dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION and isinstance(data.get('sections'), dict):
+                self._sections = data['sections']
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def get(self, section, key, default=None):
+        with self._lock:
+            return self._sections.get(section, {}).get(key, default)
+
+    def set(self, section, key, value, limit=None):
+        """Stores a value; returns True if it differs from the cached one.
+
+        With limit, the oldest keys of the section are dropped once it grows beyond it.
+        """
+        with self._lock:
+            entries = self._sections.setdefault(section, {})
+            if entries.get(key) == value:
+                return False
+            entries.pop(key, None)
+            entries[key] = value
+            if limit:
+                for old_key in list(entries)[:-limit]:
+                    del entries[old_key]
+            self._dirty = True
+        return True
+
+    def clear(self, section):
+        with self._lock:
+            if self._sections.pop(section, None):
+                self._dirty = True
+
+    def save(self):
+        """Writes the cache atomically if anything changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'version': CACHE_VERSION, 'sections': self._sections}
+            tmp_path = self.path + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Failed to save warm-start cache: {e}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_warm_cache():
+    """Returns the shared warm-start cache (loaded on first use)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = WarmStartCache(os.path.join(get_app_data_path(), CACHE_FILE))
+        return _cache
+
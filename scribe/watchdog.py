@@ -0,0 +1,193 @@
+# watchdog.py
+"""Watchdog: detects stalled recognition components and restarts them in place.
+
+While recognition runs, three components report that they are alive:
+
+    audio     the audio callback, on every block it receives (beat)
+    decoder   the recognition loop, on every iteration, also while waiting for audio (beat)
+    inserter  the inserter worker, around every command it executes (begin/end); waiting
+              for commands is not a stall
+
+A background thread checks them every CHECK_INTERVAL seconds against the thresholds of
+the watchdog settings. A stalled component is restarted without touching the model:
+the audio stream is reopened, the recognition loop gets a new thread (with a fresh
+stream decoder on the loaded model), the inserter gets a new worker on the same queue.
+A recognition loop that stopped on an error is restarted the same way. A wedged thread
+cannot be killed; it is abandoned and exits when it returns.
+
+Every stall writes a flight recording (see flight_recorder.py). A component that
+stalls MAX_RESTARTS times within RESTART_WINDOW seconds is not restarted again:
+recognition is stopped, so the tray shows what is actually happening.
+
+report() and the scribe_watchdog_* metrics give stalls, restarts, give-ups and downtime
+(seconds from the last sign of life to the restart) per component.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+from scribe.flight_recorder import recorder
+from scribe.logging_config import dump_trace
+from scribe.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ('audio', 'decoder', 'inserter')
+CHECK_INTERVAL = 1.0  # Seconds between checks
+DEFAULT_THRESHOLDS = {'audio': 3.0, 'decoder': 5.0, 'inserter': 30.0}  # Seconds without a sign of life
+MAX_RESTARTS = 3
+RESTART_WINDOW = 60.0  # Seconds
+
+
+class Watchdog:
+    """Heartbeats of the recognition components and the thread that supervises them."""
+
+    def __init__(self, thresholds=None, check_interval=CHECK_INTERVAL):
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        self.check_interval = check_interval
+        self.enabled = True
+        self._beats = {}  # component -> monotonic time of the last beat
+        self._busy = {}  # component -> monotonic time the current operation began
+        self._restarts = {name: deque() for name in COMPONENTS}  # Recent restart times
+        self._stats = {name: {'stalls': 0, 'restarts': 0, 'give_ups': 0, 'downtime_seconds': 0.0, 'last_stall': None}
+                       for name in COMPONENTS}
+        self._get_controller = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._metrics = {
+            name: (registry.counter('scribe_watchdog_stalls_total', "Stalls detected by the watchdog", component=name),
+                   registry.counter('scribe_watchdog_restarts_total', "Components restarted by the watchdog", component=name),
+                   registry.counter('scribe_watchdog_downtime_seconds_total', "Seconds from the last sign of life to the restart",
+                                    component=name))
+            for name in COMPONENTS
+        }
+
+    def beat(self, component):
+        """Marks component as alive now. Called from hot paths: a dict store."""
+        self._beats[component] = time.monotonic()
+
+    def begin(self, component):
+        """Marks the start of an operation that must finish within the component's threshold."""
+        self._busy[component] = time.monotonic()
+
+    def end(self, component):
+        self._busy.pop(component, None)
+
+    def reset(self, *components):
+        """Restarts the clocks of components, e.g. when recognition starts."""
+        now = time.monotonic()
+        for component in components or COMPONENTS:
+            self._beats[component] = now
+            self._busy.pop(component, None)
+
+    def configure(self, enabled=None, thresholds=None):
+        if enabled is not None:
+            self.enabled = bool(enabled)
+        if thresholds:
+            self.thresholds.update({name: max(1.0, float(seconds)) for name, seconds in thresholds.items()})
+
+    def start(self, get_controller):
+        """Supervises the controller get_controller() returns (None while there is none)."""
+        self._get_controller = get_controller
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='scribe-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        self._thread = None
+
+    def report(self):
+        """Returns {component: {stalls, restarts, give_ups, downtime_seconds, last_stall, idle_seconds}}."""
+        now = time.monotonic()
+        with self._lock:
+            result = {name: dict(stats) for name, stats in self._stats.items()}
+        for name, stats in result.items():
+            stats['downtime_seconds'] = round(stats['downtime_seconds'], 3)
+            since = self._busy.get(name) if name == 'inserter' else self._beats.get(name)
+            stats['idle_seconds'] = round(now - since, 3) if since is not None else None
+        return result
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            if not self.enabled or self._get_controller is None:
+                continue
+            try:
+                self.check(self._get_controller())
+            except Exception as e:
+                logger.error(f"[watchdog] Check failed: {e}")
+
+    def check(self, controller):
+        """Checks the components of a running controller once and recovers stalled ones."""
+        recognizer = getattr(controller, 'recognizer', None)
+        if recognizer is None or not controller.running:
+            return
+        now = time.monotonic()
+        stalled = []
+        for component in ('audio', 'decoder'):
+            last = self._beats.get(component)
+            if last is not None and now - last > self.thresholds[component]:
+                stalled.append((component, last))
+        busy_since = self._busy.get('inserter')
+        if busy_since is not None and now - busy_since > self.thresholds['inserter']:
+            stalled.append(('inserter', busy_since))
+        for component, since in stalled:
+            self._recover(controller, recognizer, component, now - since)
+
+    def _recover(self, controller, recognizer, component, idle):
+        stalls, restarts, downtime = self._metrics[component]
+        stalls.inc()
+        now = time.monotonic()
+        recent = self._restarts[component]
+        while recent and now - recent[0] > RESTART_WINDOW:
+            recent.popleft()
+        with self._lock:
+            stats = self._stats[component]
+            stats['stalls'] += 1
+            stats['last_stall'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        logger.warning(f"[watchdog] {component} stalled: no sign of life for {idle:.1f} s")
+        dump_trace(f"Watchdog: {component} stalled")
+        recorder.event('watchdog', component=component, idle=round(idle, 3))
+        recorder.dump(f"watchdog: {component} stalled for {idle:.1f} s")
+
+        if len(recent) >= MAX_RESTARTS:
+            logger.error(f"[watchdog] {component} stalled {len(recent) + 1} times within {RESTART_WINDOW:.0f} s; stopping recognition")
+            with self._lock:
+                self._stats[component]['give_ups'] += 1
+                self._stats[component]['downtime_seconds'] += idle
+            downtime.inc(idle)
+            recent.clear()
+            self.reset()
+            controller.stop()
+            return
+
+        # A failed restart counts too: the component stalls again and is given up on
+        recent.append(now)
+        self.reset(component)
+        try:
+            if component == 'audio':
+                recognizer.restart_stream()
+            elif component == 'decoder':
+                recognizer.restart_decoder()
+            elif hasattr(recognizer.inserter, 'restart'):
+                recognizer.inserter.restart()
+        except Exception as e:
+            logger.error(f"[watchdog] Restarting {component} failed: {e}")
+            return
+        elapsed = idle + time.monotonic() - now
+        restarts.inc()
+        downtime.inc(elapsed)
+        with self._lock:
+            self._stats[component]['restarts'] += 1
+            self._stats[component]['downtime_seconds'] += elapsed
+        logger.info(f"[watchdog] {component} restarted after {elapsed:.1f} s")
+
+
+watchdog = Watchdog()